@@ -0,0 +1,36 @@
+"""Wykonywanie niezaleznych zadan w puli procesow z wynikami w stalej kolejnosci.
+
+Zadania musza byc krotkami danych (bez obiektow generatora), a funkcja - funkcja modulu,
+zeby dalo sie je przekazac do procesow roboczych. Wyniki zwracane sa w kolejnosci zadan,
+wiec ich laczenie (np. akumulatorow) nie zalezy od liczby procesow.
+"""
+from __future__ import annotations
+import os
+from typing import Callable, Iterator
+
+
+def wykonaj_strumieniowo(funkcja: Callable, zadania: list, procesy: int | None = None) -> Iterator:
+    """Wyniki funkcja(zadanie) w kolejnosci zadan, zwracane na biezaco, gdy tylko sa gotowe.
+
+    procesy=1 (albo jedno zadanie) liczy wszystko lokalnie, None oznacza liczbe rdzeni.
+    """
+    if procesy == 1 or len(zadania) <= 1:
+        yield from map(funkcja, zadania)
+        return
+    # pula procesow (multiprocessing) ladowana dopiero, gdy jest potrzebna
+    from concurrent.futures import ProcessPoolExecutor
+    robotnicy = procesy or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=robotnicy) as pula:
+        yield from pula.map(funkcja, zadania, chunksize=max(1, len(zadania) // (8 * robotnicy)))
+
+
+def wykonaj(funkcja: Callable, zadania: list, procesy: int | None = None) -> list:
+    """Lista wynikow funkcja(zadanie) w kolejnosci zadan (patrz wykonaj_strumieniowo)."""
+    return list(wykonaj_strumieniowo(funkcja, zadania, procesy))
+
+
+def polacz_wyniki(funkcja: Callable, zadania: list, akumulator, procesy: int | None = None):
+    """Dolacz wyniki kolejnych zadan do akumulatora metoda polacz() (w kolejnosci zadan)."""
+    for wynik in wykonaj_strumieniowo(funkcja, zadania, procesy):
+        akumulator.polacz(wynik)
+    return akumulator
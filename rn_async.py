@@ -0,0 +1,221 @@
+"""Buforowane pobieranie wartosci losowych RNGenerator z kodu asyncio.
+
+RNGProducer trzyma dla kazdego rozkladu (metoda, parametry, opcje) bufor cykliczny, ktory
+watek w tle uzupelnia paczkami do pelna, gdy zapelnienie spadnie ponizej progu. Obsluga
+zadania wywoluje 'await producent.take(n, ...)' i tylko kopiuje gotowe wartosci, wiec czas
+pobrania nie zalezy od kosztu algorytmu losowania; gdy bufor jest pusty, take czeka
+na uzupelnienie (przeciwcisnienie), a pelne bufory wstrzymuja watek produkujacy.
+"""
+from __future__ import annotations
+import array
+import asyncio
+import threading
+from rn_generator_20251120 import RNGenerator, ROZMIAR_PACZKI
+
+
+class _BuforCykliczny:
+    """Bufor cykliczny wartosci jednego rozkladu (operacje wykonywane pod blokada producenta)."""
+
+    __slots__ = ('losuj', 'typ', 'dane', 'pojemnosc', 'prog', 'poczatek', 'dlugosc', 'uzupelnianie',
+                 'zdarzenie', 'kolejka', 'wygenerowane', 'pobrane', 'oczekiwania')
+
+    def __init__(self, losuj, typ: str, pojemnosc: int, prog: int) -> None:
+        self.losuj = losuj
+        self.typ = typ
+        self.dane = array.array(typ, bytes(pojemnosc * array.array(typ).itemsize))
+        self.pojemnosc = pojemnosc
+        self.prog = prog
+        self.poczatek = 0
+        self.dlugosc = 0
+        # bufor spadl ponizej progu i jest uzupelniany do pelna
+        self.uzupelnianie = True
+        # tworzone w petli zdarzen przy pierwszym take
+        self.zdarzenie = None
+        self.kolejka = None
+        self.wygenerowane = 0
+        self.pobrane = 0
+        self.oczekiwania = 0
+
+    def dopisz(self, wartosci: array.array) -> None:
+        m = len(wartosci)
+        koniec = (self.poczatek + self.dlugosc) % self.pojemnosc
+        pierwsza = min(m, self.pojemnosc - koniec)
+        self.dane[koniec:koniec + pierwsza] = wartosci[:pierwsza]
+        self.dane[:m - pierwsza] = wartosci[pierwsza:]
+        self.dlugosc += m
+        self.wygenerowane += m
+        if self.dlugosc == self.pojemnosc:
+            self.uzupelnianie = False
+
+    def pobierz(self, k: int, wynik: array.array) -> None:
+        k = min(k, self.dlugosc)
+        p = self.poczatek
+        pierwsza = min(k, self.pojemnosc - p)
+        wynik.extend(self.dane[p:p + pierwsza])
+        wynik.extend(self.dane[:k - pierwsza])
+        self.poczatek = (p + k) % self.pojemnosc
+        self.dlugosc -= k
+        self.pobrane += k
+        if self.dlugosc < self.prog:
+            self.uzupelnianie = True
+
+
+class RNGProducer:
+    """
+    Klasa RNGProducer.
+    Asynchroniczny producent wartości losowych z buforami cyklicznymi uzupełnianymi w tle.
+    Każdy rozkład dostaje własny generator potomny (RNGenerator.spawn, w kolejności rejestracji),
+    więc ciąg wartości danego rozkładu nie zależy od chwil uzupełniania buforów.
+    Losowanie w wątku współdzieli GIL z pętlą zdarzeń, ale odbywa się paczkami poza blokadą,
+    a take() tylko kopiuje gotowe wartości.
+    """
+
+    def __init__(self, gen=None, pojemnosc=4 * ROZMIAR_PACZKI, prog=0.5, paczka=ROZMIAR_PACZKI):
+        """
+        @param gen Generator-korzeń (RNGenerator) albo ziarno dla nowego RNGenerator.
+        @param pojemnosc Pojemność bufora każdego rozkładu.
+        @param prog Ułamek pojemności, poniżej którego bufor jest uzupełniany.
+        @param paczka Największa liczba wartości losowana w wątku naraz.
+        """
+        if pojemnosc < 1 or not 0.0 < prog <= 1.0 or paczka < 1:
+            raise ValueError('pojemnosc i paczka muszą być dodatnie, a prog w przedziale (0, 1]')
+        self._gen = gen if isinstance(gen, RNGenerator) else RNGenerator(gen)
+        self.pojemnosc = pojemnosc
+        self.prog = max(1, int(prog * pojemnosc))
+        self.paczka = paczka
+        self._bufory = {}
+        self._warunek = threading.Condition()
+        self._watek = None
+        self._petla = None
+        self._stop = False
+        self._blad = None
+
+    # ======================================================================
+    # Rejestracja rozkładów i wątek produkujący
+
+    def register(self, rozklad, *parametry, **opcje):
+        """
+        Rejestruje rozkład (np. register('normal', 0.0, 1.0)) i zleca wypełnienie jego bufora.
+        Wywołanie nie jest konieczne - take() rejestruje rozkład przy pierwszym użyciu -
+        ale pozwala wypełnić bufory przed nadejściem ruchu.
+        @return Zwraca klucz bufora.
+        """
+        klucz = (rozklad, parametry, tuple(sorted(opcje.items())))
+        with self._warunek:
+            if klucz in self._bufory:
+                return klucz
+            metoda = getattr(self._gen.spawn(1)[0], rozklad)
+            # size=0 sprawdza parametr metoda= i ustala typ wartości bez zużycia liczb losowych
+            typ = metoda(*parametry, size=0, **opcje).typecode
+            self._bufory[klucz] = _BuforCykliczny(lambda m: metoda(*parametry, size=m, **opcje),
+                                                  typ, self.pojemnosc, self.prog)
+            self._warunek.notify()
+        self.start()
+        return klucz
+
+    def start(self):
+        """
+        Uruchamia wątek produkujący (jeżeli jeszcze nie działa).
+        """
+        if self._watek is None:
+            self._stop = False
+            self._watek = threading.Thread(target=self._produkuj, name='RNGProducer', daemon=True)
+            self._watek.start()
+
+    def close(self):
+        """
+        Zatrzymuje wątek produkujący (kończy on bieżącą paczkę); bufory pozostają dostępne.
+        """
+        with self._warunek:
+            self._stop = True
+            self._warunek.notify()
+        if self._watek is not None:
+            self._watek.join()
+            self._watek = None
+
+    def _produkuj(self):
+        warunek = self._warunek
+        try:
+            while True:
+                with warunek:
+                    while not self._stop:
+                        do_uzupelnienia = [b for b in self._bufory.values() if b.uzupelnianie]
+                        if do_uzupelnienia:
+                            break
+                        warunek.wait()
+                    if self._stop:
+                        return
+                for bufor in do_uzupelnienia:
+                    # wolne miejsce może tylko rosnąć (zapełnienie zwiększa wyłącznie ten wątek)
+                    m = min(self.paczka, bufor.pojemnosc - bufor.dlugosc)
+                    wartosci = bufor.losuj(m)
+                    with warunek:
+                        bufor.dopisz(wartosci)
+                    self._obudz(bufor)
+        except BaseException as e:
+            self._blad = e
+            for bufor in list(self._bufory.values()):
+                self._obudz(bufor)
+            raise
+
+    def _obudz(self, bufor):
+        petla = self._petla
+        if petla is not None and bufor.zdarzenie is not None:
+            try:
+                petla.call_soon_threadsafe(bufor.zdarzenie.set)
+            except RuntimeError:
+                # pętla zdarzeń została już zamknięta
+                pass
+
+    # ======================================================================
+    # Pobieranie wartości
+
+    async def take(self, n, rozklad, *parametry, **opcje):
+        """
+        Pobiera n kolejnych wartości z bufora rozkładu; czeka, jeżeli bufor jest pusty.
+        Równoczesne wywołania dla jednego rozkładu obsługiwane są w kolejności nadejścia.
+        @param n Liczba wartości (może przekraczać pojemność bufora).
+        @return Zwraca array.array z n wartościami (typ jak w metodzie RNGenerator).
+        """
+        klucz = (rozklad, parametry, tuple(sorted(opcje.items())))
+        bufor = self._bufory.get(klucz)
+        if bufor is None:
+            bufor = self._bufory[self.register(rozklad, *parametry, **opcje)]
+        if bufor.zdarzenie is None:
+            self._petla = asyncio.get_running_loop()
+            bufor.zdarzenie = asyncio.Event()
+            bufor.kolejka = asyncio.Lock()
+        wynik = array.array(bufor.typ)
+        async with bufor.kolejka:
+            while True:
+                bufor.zdarzenie.clear()
+                with self._warunek:
+                    bufor.pobierz(n - len(wynik), wynik)
+                    if bufor.uzupelnianie:
+                        self._warunek.notify()
+                if len(wynik) == n:
+                    return wynik
+                if self._blad is not None:
+                    raise RuntimeError('wątek produkujący zakończył się błędem') from self._blad
+                if self._watek is None:
+                    raise RuntimeError('producent został zatrzymany (close), a bufor jest pusty')
+                bufor.oczekiwania += 1
+                await bufor.zdarzenie.wait()
+
+    def bufferStats(self):
+        """
+         Zwraca statystyki buforów.
+         @return Słownik klucz -> {'zapelnienie', 'pojemnosc', 'wygenerowane', 'pobrane', 'oczekiwania'},
+                 gdzie 'oczekiwania' to liczba sytuacji, w których take() musiało czekać na uzupełnienie.
+        """
+        with self._warunek:
+            return {klucz: {'zapelnienie': b.dlugosc, 'pojemnosc': b.pojemnosc, 'wygenerowane': b.wygenerowane,
+                            'pobrane': b.pobrane, 'oczekiwania': b.oczekiwania}
+                    for klucz, b in self._bufory.items()}
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
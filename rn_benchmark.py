@@ -0,0 +1,183 @@
+"""Pomiary przepustowosci generatorow RNGenerator oraz estymatorow z zadanie_1.
+
+Dla kazdego przypadku mierzony jest najlepszy z kilku czasow (jak w timeit) i podawany
+jako ns/wartosc oraz wartosci/s. Przypadki pochodza ze wspolnego z rn_testy_zgodnosci
+katalogu rn_przypadki.PRZYPADKI i obejmuja kazda galaz algorytmow (np. gamma dla k<1,
+k=1 i k>1; Poisson dla a<12 i a>=12; dwumianowy dla n<25, malej sredniej i metody
+odrzucania) oraz kazdy wariant parametru metoda=.
+Osobno mierzony jest czas uruchomienia nowego interpretera (import modulow i pierwsze
+losowanie, SCENARIUSZE_STARTU). Wyniki zapisywane sa jako JSON; po podaniu pliku bazowego (--porownaj) przypadki
+wolniejsze o wiecej niz --prog sa oznaczane jako regresje, a program konczy sie kodem 1.
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Callable
+from rn_generator_20251120 import RNGenerator
+from rn_przypadki import PRZYPADKI
+import zadanie_1
+
+
+# Funkcja calkowana w pomiarach estymatorow z zadanie_1
+WYRAZENIE_POMIAROW = 'x*log(x)'
+
+# Kod wykonywany przez 'python -c' w pomiarach czasu uruchomienia
+SCENARIUSZE_STARTU = {
+    'python -c pass': 'pass',
+    'import rn_generator': 'import rn_generator_20251120',
+    'skalarne losowanie': 'from rn_generator_20251120 import RNGenerator; RNGenerator(1).normal(0.0, 1.0)',
+    'import zadanie_1': 'import zadanie_1',
+    'import zadanie_2': 'import zadanie_2',
+    'zadanie_2 --n 1000': "import zadanie_2; zadanie_2.main(['--n', '1000', '--ziarno', '1'])",
+}
+
+
+def _najlepszy_czas(funkcja: Callable[[], object], powtorzenia: int) -> float:
+    """Najkrotszy z 'powtorzenia' czasow wykonania funkcji (w sekundach)."""
+    najlepszy = float('inf')
+    for _ in range(powtorzenia):
+        start = time.perf_counter()
+        funkcja()
+        najlepszy = min(najlepszy, time.perf_counter() - start)
+    return najlepszy
+
+
+def _wynik(nazwa: str, galaz: str, tryb: str, n: int, czas: float) -> dict:
+    return {'nazwa': nazwa, 'galaz': galaz, 'tryb': tryb, 'n': n, 'czas_s': czas,
+            'ns_na_wartosc': 1e9 * czas / n, 'wartosci_na_s': n / czas if czas > 0.0 else float('inf')}
+
+
+def zmierz_generatory(n: int = 100_000, powtorzenia: int = 3, ziarno: int = 0, tryby: tuple[str, ...] = ('paczka', 'pojedynczo'),
+                      metody: list[str] | None = None, backend: str | None = None) -> list[dict]:
+    """Zmierz przepustowosc wszystkich przypadkow z PRZYPADKI.
+
+    Tryb 'paczka' to jedno wywolanie z size=n, tryb 'pojedynczo' to n wywolan skalarnych.
+    Ustawienia rozkladow (tablice, stale) sa budowane przed pomiarem.
+    """
+    wyniki = []
+    for przypadek in PRZYPADKI:
+        if metody is not None and przypadek.metoda not in metody:
+            continue
+        gen = RNGenerator(ziarno, backend=backend)
+        losuj = getattr(gen, przypadek.metoda)
+        args, opcje = przypadek.parametry, przypadek.opcje
+        losuj(*args, size=16, **opcje)
+        for tryb in tryby:
+            if tryb == 'paczka':
+                czas = _najlepszy_czas(lambda: losuj(*args, size=n, **opcje), powtorzenia)
+            else:
+                czas = _najlepszy_czas(lambda: [losuj(*args, **opcje) for _ in range(n)], powtorzenia)
+            wyniki.append(_wynik(przypadek.nazwa, przypadek.galaz, tryb, n, czas))
+    return wyniki
+
+
+def zmierz_estymatory(ns: tuple[int, ...] = (1_000, 10_000, 100_000), powtorzenia: int = 3, ziarno: int = 0) -> list[dict]:
+    """Zmierz szacuj_mc_prostokaty i calka_numeryczna z zadanie_1 dla rosnacych n."""
+    f = zadanie_1.konstrukcja_f_expr(WYRAZENIE_POMIAROW)
+    wyniki = []
+    for n in ns:
+        czas = _najlepszy_czas(lambda: zadanie_1.szacuj_mc_prostokaty(n, f, ziarenko=ziarno), powtorzenia)
+        wyniki.append(_wynik('szacuj_mc_prostokaty', WYRAZENIE_POMIAROW, 'estymator', n, czas))
+        czas = _najlepszy_czas(lambda: zadanie_1.calka_numeryczna(f, kroki=n), powtorzenia)
+        wyniki.append(_wynik('calka_numeryczna', WYRAZENIE_POMIAROW, 'estymator', n, czas))
+    return wyniki
+
+
+def zmierz_uruchomienie(powtorzenia: int = 10) -> list[dict]:
+    """Zmierz czas uruchomienia nowego interpretera dla kazdego scenariusza z SCENARIUSZE_STARTU.
+
+    Pierwsze, niemierzone uruchomienie tworzy pliki .pyc (o ile ich zapis nie jest
+    wylaczony), wiec mierzony jest typowy start krotko zyjacego procesu.
+    """
+    katalog = os.path.dirname(os.path.abspath(__file__))
+    srodowisko = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, (katalog, os.environ.get('PYTHONPATH')))))
+    wyniki = []
+    for nazwa, kod in SCENARIUSZE_STARTU.items():
+        polecenie = [sys.executable, '-c', kod]
+        uruchom = lambda: subprocess.run(polecenie, cwd=katalog, env=srodowisko, stdout=subprocess.DEVNULL, check=True)
+        uruchom()
+        wyniki.append(_wynik(nazwa, '', 'start', 1, _najlepszy_czas(uruchom, powtorzenia)))
+    return wyniki
+
+
+def _klucz(wynik: dict) -> tuple:
+    return wynik['nazwa'], wynik['tryb'], wynik['n']
+
+
+def porownaj(wyniki: list[dict], bazowe: list[dict], prog: float = 0.2) -> list[dict]:
+    """Dopisz do wynikow iloraz czasu wzgledem pomiaru bazowego i flage regresji.
+
+    Regresja to czas na wartosc dluzszy o wiecej niz 'prog' (ulamek) od bazowego.
+    Przypadki bez odpowiednika w pomiarze bazowym maja iloraz None.
+    """
+    baza = {_klucz(w): w for w in bazowe}
+    for w in wyniki:
+        b = baza.get(_klucz(w))
+        w['iloraz'] = w['ns_na_wartosc'] / b['ns_na_wartosc'] if b else None
+        w['regresja'] = w['iloraz'] is not None and w['iloraz'] > 1.0 + prog
+    return wyniki
+
+
+def _metadane(args: argparse.Namespace) -> dict:
+    return {'data': datetime.now().isoformat(timespec='seconds'), 'python': platform.python_version(),
+            'implementacja': platform.python_implementation(), 'platforma': platform.platform(),
+            'n': args.n, 'powtorzenia': args.powtorzenia, 'ziarno': args.ziarno, 'backend': args.backend}
+
+
+def _argumenty(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Pomiary przepustowosci RNGenerator i estymatorow zadanie_1.')
+    parser.add_argument('--n', type=int, default=100_000, help='liczba wartosci na pomiar generatora')
+    parser.add_argument('--n-estymatorow', type=int, nargs='+', default=[1_000, 10_000, 100_000],
+                        help='liczby punktow dla estymatorow zadanie_1')
+    parser.add_argument('--powtorzenia', type=int, default=3, help='liczba powtorzen (brany jest najlepszy czas)')
+    parser.add_argument('--ziarno', type=int, default=0)
+    parser.add_argument('--metody', nargs='+', default=None, help='tylko wybrane metody RNGenerator')
+    parser.add_argument('--tryby', nargs='+', choices=('paczka', 'pojedynczo'), default=['paczka', 'pojedynczo'])
+    parser.add_argument('--backend', default=None, help="zrodlo bitow ('mt' albo 'philox')")
+    parser.add_argument('--bez-estymatorow', action='store_true', help='pomin pomiary zadanie_1')
+    parser.add_argument('--bez-startu', action='store_true', help='pomin pomiary czasu uruchomienia')
+    parser.add_argument('--powtorzenia-startu', type=int, default=10, help='liczba uruchomien na scenariusz startu')
+    parser.add_argument('--zapisz', default=None, help='plik JSON na wyniki (domyslnie stdout)')
+    parser.add_argument('--porownaj', default=None, help='plik JSON z pomiarem bazowym')
+    parser.add_argument('--prog', type=float, default=0.2, help='dopuszczalne spowolnienie (ulamek) przed zgloszeniem regresji')
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Uruchom pomiary z konsoli. Zwraca 1, jesli wykryto regresje wzgledem pomiaru bazowego."""
+    args = _argumenty(argv)
+    wyniki = zmierz_generatory(args.n, args.powtorzenia, args.ziarno, tuple(args.tryby), args.metody, args.backend)
+    if not args.bez_estymatorow:
+        wyniki += zmierz_estymatory(tuple(args.n_estymatorow), args.powtorzenia, args.ziarno)
+    if not args.bez_startu:
+        wyniki += zmierz_uruchomienie(args.powtorzenia_startu)
+    regresje = []
+    if args.porownaj:
+        with open(args.porownaj, encoding='utf-8') as plik:
+            porownaj(wyniki, json.load(plik)['wyniki'], args.prog)
+        regresje = [w for w in wyniki if w['regresja']]
+
+    raport = json.dumps({'metadane': _metadane(args), 'wyniki': wyniki}, indent=1)
+    if args.zapisz:
+        with open(args.zapisz, 'w', encoding='utf-8') as plik:
+            plik.write(raport + '\n')
+    else:
+        print(raport)
+
+    for w in wyniki:
+        porownanie = '' if w.get('iloraz') is None else f"  x{w['iloraz']:.2f}{'  REGRESJA' if w['regresja'] else ''}"
+        print(f"{w['nazwa']:<38} {w['galaz']:<13} {w['tryb']:<10} n={w['n']:<8} "
+              f"{w['ns_na_wartosc']:>10.1f} ns/wartosc{porownanie}", file=sys.stderr)
+    if regresje:
+        print(f'\nRegresje (> {args.prog:.0%}): {len(regresje)}', file=sys.stderr)
+    return 1 if regresje else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
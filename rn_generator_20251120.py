@@ -1,8 +1,87 @@
+import array
+import marshal
+import os
+import struct
 import time
+from collections import OrderedDict
 import math
 import random
 import sys
-from datetime import datetime
+
+
+# Liczba wartości losowanych w jednej paczce przy generowaniu wsadowym
+ROZMIAR_PACZKI = 65536
+
+# Dostępne warianty algorytmów (parametr metoda=)
+METODY = ('klasyczna', 'szybka', 'tablica', 'odwracanie', 'ziggurat')
+# Największa dopuszczalna liczba wartości w tablicy aliasów
+ROZMIAR_TABLICY_MAX = 1 << 20
+# Tablice aliasów o co najmniej tylu wartościach są zapisywane na dysku (rn_tablice)
+TABLICA_NA_DYSKU = 1024
+
+# Binarny zapis stanu (RNGenerator.stateBytes): nagłówek stałej długości, po nim sekcje
+# wyrównane do 8 bajtów - stan źródła bitów, ziarno, liczniki akceptacji, pamięć podręczna
+STAN_SYGNATURA = b'RNGSTAN\0'
+STAN_WERSJA = 1
+# sygnatura, wersja, flagi, nazwa źródła bitów, gauss_next, długości czterech sekcji
+_STAN_NAGLOWEK = struct.Struct('<8sHH4x16sdQQQQ')
+# stan Mersenne Twistera: 624 słowa i pozycja
+_STAN_MT = struct.Struct('<624IQ')
+# flaga: zapamiętana druga wartość random.Random.gauss
+_STAN_GAUSS = 1
+
+
+def _tablice_zigguratu(n, r, v, f, f_odwr):
+    """
+     Wylicza tablice algorytmu ziggurat (Marsaglia-Tsang, wariant zmiennoprzecinkowy Doornika).
+     @param n Liczba warstw.
+     @param r Początek ogona (prawa krawędź najniższej warstwy).
+     @param v Pole pojedynczej warstwy.
+     @param f Nieunormowana gęstość, f_odwr - funkcja do niej odwrotna.
+     @return Zwraca (x, ratio): krawędzie warstw x[0..n] oraz ilorazy x[i+1]/x[i].
+    """
+    x = [0.0] * (n + 1)
+    x[0] = v / f(r)
+    x[1] = r
+    for i in range(2, n):
+        x[i] = f_odwr(v / x[i - 1] + f(x[i - 1]))
+    x[n] = 0.0
+    ratio = [x[i + 1] / x[i] for i in range(n)]
+    return x, ratio
+
+
+ZIG_NORM_R = 3.442619855899
+ZIG_EXP_R = 7.69711747013104972
+
+
+def _zigguraty():
+    """
+     Wylicza tablice zigguratu dla N(0, 1) (128 warstw) i Exp(1) (256 warstw).
+    """
+    normalny = _tablice_zigguratu(
+        128, ZIG_NORM_R, 9.91256303526217e-3,
+        lambda x: math.exp(-0.5 * x * x), lambda y: math.sqrt(-2.0 * math.log(y)))
+    wykladniczy = _tablice_zigguratu(
+        256, ZIG_EXP_R, 3.949659822581572e-3,
+        lambda x: math.exp(-x), lambda y: -math.log(y))
+    return normalny, wykladniczy
+
+
+(_ZIG_NORM_X, _ZIG_NORM_RATIO), (_ZIG_EXP_X, _ZIG_EXP_RATIO) = _zigguraty()
+
+# tablica ln(k!) z rn_specjalne, importowanego dopiero przy pierwszym losowaniu, które jej potrzebuje
+_LOG_SILNIA = None
+
+
+def _log_silnia():
+    """
+     Zwraca tablicę ln(k!) dla k < len(tablicy) (rn_specjalne.LOG_SILNIA).
+    """
+    global _LOG_SILNIA
+    if _LOG_SILNIA is None:
+        from rn_specjalne import LOG_SILNIA
+        _LOG_SILNIA = LOG_SILNIA
+    return _LOG_SILNIA
 
 
 class RNGSeeds:
@@ -21,10 +100,384 @@ class RNGSeeds:
         if d is None:
             # ms od 1.1.1970
             return int(time.time() * 1000)
+        from datetime import datetime
         if isinstance(d, datetime):
             return int(d.timestamp() * 1000)
         raise TypeError("ClockSeed oczekuje obiektu datetime lub None")
 
+    @staticmethod
+    def EntropySeed(bity=128):
+        """
+        Zwraca ziarno z systemowego źródła entropii (os.urandom).
+        W odróżnieniu od ClockSeed procesy uruchomione w tej samej
+        milisekundzie otrzymują różne ziarna.
+        """
+        return int.from_bytes(os.urandom(bity // 8), 'little')
+
+
+class RNGSeedSequence:
+    """
+    Klasa RNGSeedSequence.
+    Drzewo ziaren w stylu numpy.random.SeedSequence: ziarno potomka to skrót SHA-256
+    z entropii korzenia i ścieżki (klucza) potomka. Potomkowie tworzeni z jednego
+    korzenia dają niezależne strumienie, powtarzalne dla danej entropii i klucza.
+    """
+
+    def __init__(self, entropia=None, klucz=()):
+        """
+        Tworzy węzeł drzewa ziaren.
+        Jeżeli entropia jest None, pobierana jest z RNGSeeds.EntropySeed().
+        Napisy i bajty są zamieniane na liczbę całkowitą przez SHA-512.
+        """
+        if entropia is None:
+            entropia = RNGSeeds.EntropySeed()
+        elif isinstance(entropia, str):
+            entropia = entropia.encode('utf-8')
+        if isinstance(entropia, (bytes, bytearray)):
+            # hashlib ładowany przy pierwszym użyciu (ziarna całkowite go nie potrzebują)
+            import hashlib
+            entropia = int.from_bytes(hashlib.sha512(entropia).digest(), 'big')
+        if entropia < 0:
+            entropia = -entropia
+        self.entropia = int(entropia)
+        self.klucz = tuple(int(k) for k in klucz)
+        self.n_potomkow = 0
+
+    def __repr__(self):
+        return f'RNGSeedSequence(entropia={self.entropia}, klucz={self.klucz})'
+
+    def generateSeed(self, bity=256):
+        """
+        Zwraca ziarno (liczbę całkowitą o podanej liczbie bitów) dla tego węzła.
+        """
+        import hashlib
+        h = hashlib.sha256()
+        dl = (self.entropia.bit_length() + 7) // 8 or 1
+        h.update(dl.to_bytes(8, 'little'))
+        h.update(self.entropia.to_bytes(dl, 'little'))
+        for k in self.klucz:
+            h.update(k.to_bytes(8, 'little'))
+        wynik = b''
+        licznik = 0
+        while len(wynik) * 8 < bity:
+            hh = h.copy()
+            hh.update(licznik.to_bytes(4, 'little'))
+            wynik += hh.digest()
+            licznik += 1
+        return int.from_bytes(wynik, 'little') >> (len(wynik) * 8 - bity)
+
+    def spawn(self, n):
+        """
+        Tworzy n kolejnych potomków. Kolejne wywołania dają nowych, nienakładających się potomków.
+        """
+        potomkowie = [RNGSeedSequence(self.entropia, self.klucz + (self.n_potomkow + i,))
+                      for i in range(n)]
+        self.n_potomkow += n
+        return potomkowie
+
+
+class BitGenerator:
+    """
+    Klasa BitGenerator.
+    Interfejs źródła bitów, które może zastąpić Mersenne Twistera w RNGenerator.
+    Implementacja musi dostarczyć random(), getrandbits(k), getstate() i setstate().
+    """
+
+    # nazwa używana w RNGenerator(backend=...) i przy zapisie stanu
+    nazwa = None
+
+    @classmethod
+    def fromSeedSequence(cls, ziarna):
+        """
+        Tworzy źródło bitów z węzła RNGSeedSequence.
+        """
+        raise NotImplementedError
+
+    def random(self):
+        raise NotImplementedError
+
+    def getrandbits(self, k):
+        raise NotImplementedError
+
+    def getstate(self):
+        raise NotImplementedError
+
+    def setstate(self, stan):
+        raise NotImplementedError
+
+    def fill(self, n):
+        """
+        Zwraca listę n kolejnych liczb z random(); implementacje mogą ją przyspieszyć.
+        """
+        rnd = self.random
+        return [rnd() for _ in range(n)]
+
+
+_PHILOX_M0 = 0xD2511F53
+_PHILOX_M1 = 0xCD9E8D57
+_PHILOX_W0 = 0x9E3779B9
+_PHILOX_W1 = 0xBB67AE85
+_MASKA32 = 0xFFFFFFFF
+
+
+def _klucze_rund(klucz, rundy=10):
+    """
+     Zwraca listę par (k0, k1) kluczy kolejnych rund Philox4x32 dla 64-bitowego klucza.
+    """
+    k0 = klucz & _MASKA32
+    k1 = (klucz >> 32) & _MASKA32
+    wynik = []
+    for _ in range(rundy):
+        wynik.append((k0, k1))
+        k0 = (k0 + _PHILOX_W0) & _MASKA32
+        k1 = (k1 + _PHILOX_W1) & _MASKA32
+    return wynik
+
+
+def philox4x32(licznik, klucz, rundy=10, klucze=None):
+    """
+     Funkcja Philox4x32 (Salmon i in., Random123): przekształca 128-bitowy licznik
+     i 64-bitowy klucz w cztery 32-bitowe słowa losowe.
+     @param klucze Opcjonalnie klucze rund wyliczone wcześniej przez _klucze_rund(klucz, rundy).
+    """
+    c0 = licznik & _MASKA32
+    c1 = (licznik >> 32) & _MASKA32
+    c2 = (licznik >> 64) & _MASKA32
+    c3 = (licznik >> 96) & _MASKA32
+    for k0, k1 in klucze or _klucze_rund(klucz, rundy):
+        p0 = _PHILOX_M0 * c0
+        p1 = _PHILOX_M1 * c2
+        c0, c1, c2, c3 = ((p1 >> 32) ^ c1 ^ k0, p1 & _MASKA32,
+                          (p0 >> 32) ^ c3 ^ k1, p0 & _MASKA32)
+    return c0, c1, c2, c3
+
+
+class Philox(BitGenerator):
+    """
+    Klasa Philox.
+    Generator licznikowy Philox4x32-10: i-te 32-bitowe słowo strumienia zależy tylko od
+    klucza i numeru i, więc można je policzyć bezpośrednio (dostęp swobodny, przeskok
+    o dowolną liczbę kroków w O(1), stan = dwie liczby całkowite).
+    Liczba z random() powstaje z dwóch kolejnych słów, jak w random.Random.
+    """
+
+    nazwa = 'philox'
+
+    def __init__(self, klucz=0, pozycja=0):
+        """
+        @param klucz 64-bitowy klucz (różne klucze dają niezależne strumienie).
+        @param pozycja Numer następnego 32-bitowego słowa strumienia.
+        """
+        self.klucz = klucz & 0xFFFFFFFFFFFFFFFF
+        self.pozycja = pozycja
+        self._klucze = _klucze_rund(self.klucz)
+        self._nr_bloku = -1
+        self._blok = None
+
+    @classmethod
+    def fromSeedSequence(cls, ziarna):
+        return cls(ziarna.generateSeed(64))
+
+    def _slowa(self, nr):
+        if nr != self._nr_bloku:
+            self._blok = philox4x32(nr, self.klucz, klucze=self._klucze)
+            self._nr_bloku = nr
+        return self._blok
+
+    def _slowo(self, w):
+        return self._slowa(w >> 2)[w & 3]
+
+    def random(self):
+        """
+         Zwraca kolejną liczbę z przedziału [0, 1) o 53 bitach precyzji.
+        """
+        w = self.pozycja
+        self.pozycja = w + 2
+        j = w & 3
+        if j < 3:
+            blok = self._slowa(w >> 2)
+            a = blok[j]
+            b = blok[j + 1]
+        else:
+            a = self._slowo(w)
+            b = self._slowo(w + 1)
+        return ((a >> 5) * 67108864.0 + (b >> 6)) * (1.0 / 9007199254740992.0)
+
+    def randomAt(self, i):
+        """
+         Zwraca i-tą liczbę strumienia random() (licząc od pozycji 0), bez zmiany stanu.
+        """
+        a = self._slowo(2 * i)
+        b = self._slowo(2 * i + 1)
+        return ((a >> 5) * 67108864.0 + (b >> 6)) * (1.0 / 9007199254740992.0)
+
+    def fill(self, n):
+        """
+         Zwraca listę n kolejnych liczb z random(), licząc całe bloki naraz.
+        """
+        if self.pozycja & 1:
+            return super().fill(n)
+        wynik = []
+        dodaj = wynik.append
+        w = self.pozycja
+        koniec = w + 2 * n
+        skala = 1.0 / 9007199254740992.0
+        if w & 3:
+            dodaj(self.random())
+            w += 2
+        klucze = self._klucze
+        m0 = _PHILOX_M0
+        m1 = _PHILOX_M1
+        maska = _MASKA32
+        while w + 4 <= koniec:
+            nr = w >> 2
+            c0 = nr & maska
+            c1 = (nr >> 32) & maska
+            c2 = (nr >> 64) & maska
+            c3 = nr >> 96
+            for k0, k1 in klucze:
+                p0 = m0 * c0
+                p1 = m1 * c2
+                c0, c1, c2, c3 = (p1 >> 32) ^ c1 ^ k0, p1 & maska, (p0 >> 32) ^ c3 ^ k1, p0 & maska
+            dodaj(((c0 >> 5) * 67108864.0 + (c1 >> 6)) * skala)
+            dodaj(((c2 >> 5) * 67108864.0 + (c3 >> 6)) * skala)
+            w += 4
+        self.pozycja = w
+        if w < koniec:
+            dodaj(self.random())
+        return wynik
+
+    def getrandbits(self, k):
+        """
+         Zwraca liczbę całkowitą z k losowymi bitami (kolejne słowa, najmłodsze pierwsze).
+        """
+        if k < 0:
+            raise ValueError('liczba bitów musi być nieujemna')
+        wynik = 0
+        przes = 0
+        while k > 0:
+            w = self._slowo(self.pozycja)
+            self.pozycja += 1
+            if k < 32:
+                w >>= 32 - k
+            wynik |= w << przes
+            przes += 32
+            k -= 32
+        return wynik
+
+    def advance(self, n):
+        """
+         Przesuwa strumień o n liczb random() w czasie O(1).
+        """
+        self.pozycja += 2 * n
+
+    def getstate(self):
+        return (self.klucz, self.pozycja)
+
+    def setstate(self, stan):
+        self.klucz, self.pozycja = stan
+        self._klucze = _klucze_rund(self.klucz)
+        self._nr_bloku = -1
+
+
+# Dostępne źródła bitów: None oznacza wbudowanego Mersenne Twistera
+BACKENDY = {'mt': None, 'philox': Philox}
+
+
+class TablicaAliasow:
+    """
+    Klasa TablicaAliasow.
+    Tablica Walkera (konstrukcja Vose'a) pozwalająca losować wartość dyskretną
+    w czasie O(1) za pomocą jednej liczby jednostajnej.
+    """
+
+    __slots__ = ('k', 'prob', 'alias', 'przesuniecie')
+
+    def __init__(self, wagi, przesuniecie=0):
+        """
+         Buduje tablicę z nieujemnych wag (niekoniecznie znormalizowanych).
+         @param przesuniecie Wartość odpowiadająca pierwszej wadze; i-ta waga odpowiada wartości i + przesuniecie.
+        """
+        k = len(wagi)
+        suma = math.fsum(wagi)
+        skal = [w * k / suma for w in wagi]
+        prob = [1.0] * k
+        alias = list(range(k))
+        male = [i for i, x in enumerate(skal) if x < 1.0]
+        duze = [i for i, x in enumerate(skal) if x >= 1.0]
+        while male and duze:
+            l = male.pop()
+            g = duze.pop()
+            prob[l] = skal[l]
+            alias[l] = g
+            skal[g] = (skal[g] + skal[l]) - 1.0
+            if skal[g] < 1.0:
+                male.append(g)
+            else:
+                duze.append(g)
+        # pozostałe wpisy (błędy zaokrągleń) mają prawdopodobieństwo 1
+        self.k = k
+        self.prob = prob
+        self.alias = [i + przesuniecie for i in alias]
+        self.przesuniecie = przesuniecie
+
+    @classmethod
+    def odtworz(cls, prob, alias, przesuniecie):
+        """
+         Odtwarza tablicę z gotowych list prob i alias (np. z zapisu stanu), bez ponownej konstrukcji.
+        """
+        tablica = cls.__new__(cls)
+        tablica.k = len(prob)
+        tablica.prob = list(prob)
+        tablica.alias = list(alias)
+        tablica.przesuniecie = przesuniecie
+        return tablica
+
+    def losuj(self, rnd):
+        """
+         Losuje jedną wartość, zużywając jedną liczbę z rnd().
+        """
+        u = rnd() * self.k
+        i = int(u)
+        if u - i < self.prob[i]:
+            return i + self.przesuniecie
+        return self.alias[i]
+
+    def paczka(self, rnd, m):
+        """
+         Losuje listę m wartości, po jednej liczbie z rnd() na wartość.
+        """
+        k = self.k
+        prob = self.prob
+        alias = self.alias
+        off = self.przesuniecie
+        return [i + off if (u := rnd() * k) - (i := int(u)) < prob[i] else alias[i]
+                for _ in range(m)]
+
+
+def _tablica_aliasow(nazwa, wagi, lo, hi, *parametry):
+    """
+     Buduje TablicaAliasow z wag wagi() wartości lo..hi. Tablice o co najmniej TABLICA_NA_DYSKU
+     wartościach zapisywane są na dysku (rn_tablice) pod nazwą rozkładu i parametrami.
+    """
+    k = hi - lo + 1
+    if k < TABLICA_NA_DYSKU:
+        return TablicaAliasow(wagi(), lo)
+    from rn_tablice import tablica
+
+    def buduj(*parametry):
+        zbudowana = TablicaAliasow(wagi(), lo)
+        return zbudowana.prob, zbudowana.alias
+
+    def poprawna(wartosc):
+        # zawartość pliku z dysku: (prob, alias) o k wpisach, alias w zakresie lo..hi
+        return (type(wartosc) is tuple and len(wartosc) == 2
+                and all(type(t) is list and len(t) == k for t in wartosc)
+                and all(type(x) is float and x <= 1.0 for x in wartosc[0])
+                and all(type(i) is int and lo <= i <= hi for i in wartosc[1]))
+
+    return TablicaAliasow.odtworz(*tablica(f'alias_{nazwa}', buduj, poprawna, *parametry), lo)
+
 
 class RNGenerator(random.Random):
     """
@@ -32,16 +485,257 @@ class RNGenerator(random.Random):
     Dziedziczy po random.Random i dodaje generowanie z wielu rozkładów.
     """
 
-    cof = [76.18009173, -86.50532033, 24.01409822,
-           -1.231739516, 0.120858003e-2, -0.536382e-5]
     PI = math.pi
+    # maksymalna liczba zestawów parametrów trzymanych w pamięci podręcznej ustawień
+    ROZMIAR_CACHE = 128
 
-    def __init__(self, seed=None):
+    def __init__(self, seed=None, backend=None):
         """
         Konstruktor generatora liczb losowych.
-        Jeżeli seed jest None, użyte zostanie domyślne ziarno random.Random.
+        Jeżeli seed jest None, ziarno pobierane jest z systemowego źródła entropii.
+        Ziarnem może być też węzeł RNGSeedSequence (np. z metody spawn).
+        @param backend Źródło bitów: None lub 'mt' (Mersenne Twister z random.Random),
+               'philox' albo gotowy obiekt BitGenerator.
         """
+        self._backend = None
+        # liczniki instrumentacji (None = wyłączona), patrz enableInstrumentation
+        self._instr = None
         super().__init__(seed)
+        if backend is not None and backend != 'mt':
+            if isinstance(backend, str):
+                if backend not in BACKENDY:
+                    raise ValueError(f"nieznany backend '{backend}', dostępne: {tuple(BACKENDY)}")
+                backend = BACKENDY[backend].fromSeedSequence(self._ziarna)
+            self._ustaw_backend(backend)
+        # liczniki [propozycje, akceptacje] silnika odrzucania blokowego, klucz (nazwa, parametry)
+        self._akceptacje = OrderedDict()
+        # pamięć podręczna (LRU) stałych wyliczanych z parametrów rozkładów
+        self._cache = OrderedDict()
+        self._cache_trafienia = 0
+        self._cache_chybienia = 0
+        # ostatnia krotka wag discrete() i jej tablica aliasów (skrót bez haszowania wag)
+        self._ostatnie_wagi = (None, None)
+
+    def seed(self, a=None, version=2):
+        """
+        Ustawia ziarno generatora i zapamiętuje węzeł RNGSeedSequence służący do tworzenia potomków.
+        Dla ziaren całkowitych strumień jest taki sam jak w random.Random.
+        """
+        if isinstance(a, RNGSeedSequence):
+            ziarna = a
+            a = ziarna.generateSeed()
+        elif a is None or isinstance(a, (int, str, bytes, bytearray)):
+            ziarna = RNGSeedSequence(a)
+            if a is None:
+                a = ziarna.generateSeed()
+        else:
+            ziarna = RNGSeedSequence(hash(a))
+        super().seed(a, version)
+        self._ziarna = ziarna
+        if self._backend is not None:
+            self._ustaw_backend(type(self._backend).fromSeedSequence(ziarna))
+
+    def _ustaw_backend(self, backend):
+        """
+        Podpina źródło bitów: atrybuty instancji random i getrandbits przesłaniają
+        metody Mersenne Twistera, więc wszystkie rozkłady (oraz metody random.Random)
+        korzystają z nowego źródła bez zmian w ich kodzie i bez kosztu dla domyślnego MT.
+        """
+        self._backend = backend
+        self.random = backend.random if self._instr is None else self._liczace_random(backend.random)
+        self.getrandbits = backend.getrandbits
+
+    @property
+    def backend(self):
+        """
+        Podpięte źródło bitów (BitGenerator) albo None dla Mersenne Twistera.
+        """
+        return self._backend
+
+    def getstate(self):
+        if self._backend is not None:
+            return (self._backend.nazwa, self._backend.getstate())
+        return super().getstate()
+
+    def setstate(self, state):
+        if self._backend is not None:
+            self._backend.setstate(state[1])
+        else:
+            super().setstate(state)
+
+    def __getstate__(self):
+        return self.stateBytes()
+
+    def __setstate__(self, state):
+        self.setStateBytes(state)
+
+    def __reduce__(self):
+        """
+        Kopiowanie (copy, pickle) zachowuje źródło bitów: random.Random.__reduce__ odtwarza
+        generator z Mersenne Twisterem, który nie przyjmie stanu innego źródła. Nowy generator
+        dostaje świeży obiekt źródła tego samego typu, a stan odtwarzany jest przez setStateBytes.
+        """
+        backend = None if self._backend is None else type(self._backend).fromSeedSequence(self._ziarna)
+        return type(self), (0, backend), self.__getstate__()
+
+    def advance(self, n):
+        """
+        Przesuwa strumień o n liczb random() (tylko dla źródeł licznikowych, np. Philox).
+        """
+        if self._backend is None or not hasattr(self._backend, 'advance'):
+            raise NotImplementedError('advance wymaga licznikowego źródła bitów (backend=\'philox\')')
+        self._backend.advance(n)
+
+    def spawn(self, n):
+        """
+        Tworzy n niezależnych generatorów potomnych (np. dla procesów roboczych).
+        Potomkowie zależą wyłącznie od ziarna korzenia i numeru potomka, więc podział
+        obliczeń między procesy jest powtarzalny niezależnie od liczby procesów.
+        Kolejne wywołania spawn dają kolejnych, różnych potomków.
+        """
+        backend = self._backend.nazwa if self._backend is not None else None
+        return [type(self)(ziarna, backend=backend) for ziarna in self._ziarna.spawn(n)]
+
+    @property
+    def seedSequence(self):
+        """
+        Węzeł RNGSeedSequence, z którego wywodzi się ten generator.
+        """
+        return self._ziarna
+
+    # ======================================================================
+    # Zapis i odtwarzanie stanu (punkty kontrolne długich symulacji)
+
+    def stateBytes(self):
+        """
+         Zwraca zwarty binarny zapis stanu: źródło bitów, węzeł ziarna (dla spawn), liczniki
+         akceptacji silnika odrzucania (acceptanceStats) i wpisy pamięci podręcznej ustawień,
+         które są danymi (stałe, tablice aliasów).
+         Funkcje paczka(m) z pamięci podręcznej nie są zapisywane - po odtworzeniu budowane
+         są ponownie, bez zużywania liczb losowych, więc strumień wartości się nie zmienia.
+         Stan Mersenne Twistera zapisywany jest przez struct jako 624 słowa od stałego
+         przesunięcia, sekcje są wyrównane do 8 bajtów (plik można odwzorować przez mmap).
+         @return Zwraca obiekt bytes dla setStateBytes() albo loadState().
+        """
+        if self._backend is None:
+            _, slowa, _ = super().getstate()
+            bity = _STAN_MT.pack(*slowa)
+            nazwa = 'mt'
+        else:
+            bity = marshal.dumps(self._backend.getstate())
+            nazwa = self._backend.nazwa
+        z = self._ziarna
+        ziarna = marshal.dumps((z.entropia, z.klucz, z.n_potomkow))
+        akceptacje = marshal.dumps(dict(self._akceptacje))
+        wpisy = []
+        for klucz, wartosc in self._cache.items():
+            if isinstance(wartosc, TablicaAliasow):
+                wartosc = (array.array('d', wartosc.prob).tobytes(),
+                           array.array('q', wartosc.alias).tobytes(), wartosc.przesuniecie)
+            elif not isinstance(wartosc, tuple):
+                continue
+            try:
+                wpisy.append(marshal.dumps((klucz, wartosc)))
+            except ValueError:
+                # klucz lub stałe spoza typów wbudowanych (np. skalary NumPy) - wpis zostanie odbudowany
+                continue
+        cache = marshal.dumps(wpisy)
+        gauss = self.gauss_next
+        sekcje = (bity, ziarna, akceptacje, cache)
+        czesci = [_STAN_NAGLOWEK.pack(STAN_SYGNATURA, STAN_WERSJA, _STAN_GAUSS if gauss is not None else 0,
+                                      nazwa.encode('ascii'), gauss or 0.0, *(len(x) for x in sekcje))]
+        for sekcja in sekcje:
+            czesci.append(sekcja)
+            czesci.append(bytes(-len(sekcja) % 8))
+        return b''.join(czesci)
+
+    @staticmethod
+    def _czytaj_stan(dane):
+        """
+         Dzieli zapis stanu na nagłówek i sekcje.
+         @return Zwraca (nazwa źródła bitów, flagi, gauss_next, [sekcje jako memoryview]).
+        """
+        dane = memoryview(dane).cast('B')
+        if len(dane) < _STAN_NAGLOWEK.size:
+            raise ValueError('zapis stanu jest za krótki')
+        sygnatura, wersja, flagi, nazwa, gauss, *dlugosci = _STAN_NAGLOWEK.unpack_from(dane)
+        if sygnatura != STAN_SYGNATURA:
+            raise ValueError('to nie jest zapis stanu RNGenerator')
+        if wersja != STAN_WERSJA:
+            raise ValueError(f'nieobsługiwana wersja zapisu stanu: {wersja}')
+        sekcje = []
+        pozycja = _STAN_NAGLOWEK.size
+        for dl in dlugosci:
+            if pozycja + dl > len(dane):
+                raise ValueError('zapis stanu jest niekompletny')
+            sekcje.append(dane[pozycja:pozycja + dl])
+            pozycja += dl + (-dl % 8)
+        return nazwa.rstrip(b'\0').decode('ascii'), flagi, gauss, sekcje
+
+    def setStateBytes(self, dane):
+        """
+         Odtwarza stan zapisany przez stateBytes(); kolejne wartości są takie same jak
+         w generatorze w chwili zapisu. Wymaga tego samego źródła bitów (patrz loadState).
+         @param dane Obiekt bytes, bytearray, memoryview lub mmap.
+        """
+        nazwa, flagi, gauss, (bity, ziarna, akceptacje, cache) = self._czytaj_stan(dane)
+        obecna = 'mt' if self._backend is None else self._backend.nazwa
+        if nazwa != obecna:
+            raise ValueError(f"zapis stanu dotyczy źródła bitów '{nazwa}', a generator używa '{obecna}'")
+        gauss = gauss if flagi & _STAN_GAUSS else None
+        if self._backend is None:
+            if len(bity) != _STAN_MT.size:
+                raise ValueError('niepoprawny stan Mersenne Twistera')
+            super().setstate((3, _STAN_MT.unpack(bity), gauss))
+        else:
+            self._backend.setstate(marshal.loads(bity))
+        self.gauss_next = gauss
+        entropia, klucz, n_potomkow = marshal.loads(ziarna)
+        self._ziarna = RNGSeedSequence(entropia, klucz)
+        self._ziarna.n_potomkow = n_potomkow
+        self._akceptacje = OrderedDict((k, list(v)) for k, v in marshal.loads(akceptacje).items())
+        self._cache.clear()
+        for wpis in marshal.loads(cache):
+            klucz, wartosc = marshal.loads(wpis)
+            if isinstance(wartosc[0], bytes):
+                prob, alias, przesuniecie = wartosc
+                wartosc = TablicaAliasow.odtworz(array.array('d', prob), array.array('q', alias), przesuniecie)
+            self._cache[klucz] = wartosc
+
+    def saveState(self, sciezka, fsync=True):
+        """
+         Zapisuje stateBytes() do pliku atomowo: przez plik tymczasowy i os.replace,
+         więc przerwany zapis nie niszczy poprzedniego punktu kontrolnego.
+         @param fsync Czy wymusić zapis na dysk przed podmianą pliku.
+        """
+        from rn_pliki import zapis_atomowy
+        dane = self.stateBytes()
+        with zapis_atomowy(sciezka, fsync) as plik:
+            plik.write(dane)
+
+    def restoreState(self, sciezka):
+        """
+         Odtwarza stan tego generatora z pliku zapisanego przez saveState().
+        """
+        with open(sciezka, 'rb') as plik:
+            self.setStateBytes(plik.read())
+
+    @classmethod
+    def loadState(cls, sciezka):
+        """
+         Tworzy generator ze źródłem bitów zapisanym w pliku i odtwarza jego stan
+         (np. przy wznawianiu symulacji w nowym procesie).
+         @return Zwraca nowy generator.
+        """
+        with open(sciezka, 'rb') as plik:
+            dane = plik.read()
+        nazwa = cls._czytaj_stan(dane)[0]
+        if nazwa != 'mt' and nazwa not in BACKENDY:
+            raise ValueError(f"nieznane źródło bitów '{nazwa}' - odtwórz stan metodą restoreState "
+                             "generatora z tym źródłem")
+        gen = cls(0, backend=nazwa)
+        gen.setStateBytes(dane)
+        return gen
 
     # ======================================================================
     @staticmethod
@@ -52,22 +746,488 @@ class RNGenerator(random.Random):
         """
         return RNGSeeds.ClockSeed()
 
+    # ======================================================================
+    # Generowanie wsadowe (size= / out=)
+
+    @staticmethod
+    def _dlugosc(size, out):
+        """
+         Ustala liczbę wartości do wygenerowania na podstawie size i out.
+         @return Zwraca liczbę całkowitą nieujemną lub None dla wywołania skalarnego.
+        """
+        if out is None:
+            if size is None:
+                return None
+            if size < 0:
+                raise ValueError("size musi być nieujemne")
+            return int(size)
+        if size is not None and size != len(out):
+            raise ValueError("size różne od długości bufora out")
+        return len(out)
+
+    @staticmethod
+    def _wypelnij(n, out, typ, paczka):
+        """
+         Wypełnia bufor wynikowy kolejnymi paczkami wartości.
+         @param n Liczba wartości do wygenerowania.
+         @param out Bufor docelowy (array.array, tablica NumPy, lista, memoryview) lub None.
+         @param typ Kod typu array.array dla nowo tworzonego bufora ('d', 'q', 'B').
+         @param paczka Funkcja paczka(m) zwracająca listę m kolejnych wartości.
+         @return Zwraca out albo nowy array.array z n wartościami.
+        """
+        if out is None:
+            wynik = array.array(typ)
+            while n > 0:
+                m = n if n < ROZMIAR_PACZKI else ROZMIAR_PACZKI
+                wynik.fromlist(paczka(m))
+                n -= m
+            return wynik
+        if isinstance(out, array.array):
+            rodzaj = out.typecode
+        elif isinstance(out, memoryview):
+            rodzaj = out.format
+        else:
+            rodzaj = None
+        i = 0
+        while i < n:
+            m = n - i if n - i < ROZMIAR_PACZKI else ROZMIAR_PACZKI
+            wartosci = paczka(m)
+            out[i:i + m] = wartosci if rodzaj is None else array.array(rodzaj, wartosci)
+            i += m
+        return out
+
+    @classmethod
+    def _wynik_bledu(cls, wartosc, size, out, typ):
+        """
+         Zwraca wartość błędu (np. -1.0) dla wywołania skalarnego albo bufor nią wypełniony.
+        """
+        n = cls._dlugosc(size, out)
+        if n is None:
+            return wartosc
+        return cls._wypelnij(n, out, typ, lambda m: [wartosc] * m)
+
+    # ======================================================================
+    # Pamięć podręczna ustawień rozkładów
+
+    def _ustawienia(self, klucz, buduj, *args):
+        """
+         Zwraca stałe zapamiętane pod kluczem albo wylicza je przez buduj(*args).
+         Najdawniej używane wpisy są usuwane po przekroczeniu ROZMIAR_CACHE.
+        """
+        cache = self._cache
+        try:
+            wartosc = cache[klucz]
+        except KeyError:
+            self._cache_chybienia += 1
+            wartosc = cache[klucz] = buduj(*args)
+            if len(cache) > self.ROZMIAR_CACHE:
+                cache.popitem(last=False)
+            return wartosc
+        self._cache_trafienia += 1
+        cache.move_to_end(klucz)
+        return wartosc
+
+    def cacheStats(self):
+        """
+         Zwraca statystyki pamięci podręcznej ustawień.
+         @return Słownik z kluczami 'trafienia', 'chybienia', 'rozmiar', 'pojemnosc'.
+        """
+        return {'trafienia': self._cache_trafienia,
+                'chybienia': self._cache_chybienia,
+                'rozmiar': len(self._cache),
+                'pojemnosc': self.ROZMIAR_CACHE}
+
+    def clearCache(self):
+        """
+         Czyści pamięć podręczną ustawień i zeruje jej statystyki.
+        """
+        self._cache.clear()
+        self._cache_trafienia = 0
+        self._cache_chybienia = 0
+        self._ostatnie_wagi = (None, None)
+
+    def preparePoisson(self, a, metoda='klasyczna'):
+        """
+         Przygotowuje generator rozkładu Poissona o stałym parametrze a.
+         Stałe są wyliczane raz, a zwrócona funkcja losuj(size=None, out=None)
+         pomija sprawdzanie parametrów i pamięć podręczną przy każdym losowaniu.
+        """
+        return self._przygotowany(*self._przygotuj_poissona(a, metoda), 'q')
+
+    def _przygotuj_poissona(self, a, metoda):
+        """
+         Zwraca parę funkcji (jeden(), paczka(m)) losujących z rozkładu Poissona o parametrze a.
+        """
+        self._sprawdz_metode(metoda)
+        if metoda == 'tablica':
+            return self._funkcje_tablicy(self._tablica_poissona(a))
+        if metoda == 'szybka' and a >= 10.0:
+            return self._poisson_szybka(a)
+        if metoda == 'odwracanie':
+            return self._odwracanie('poisson', a)
+        ust = self._ustawienia_poissona(a)
+        algorytm = self._poisson
+        return lambda: algorytm(a, ust), lambda m: [algorytm(a, ust) for _ in range(m)]
+
+    def prepareBinomial(self, p, n, metoda='klasyczna'):
+        """
+         Przygotowuje generator rozkładu dwumianowego o stałych parametrach p i n.
+         Zwraca funkcję losuj(size=None, out=None); parametry sprawdzane są tylko raz.
+        """
+        if (p <= 0.0) or (p >= 1.0):
+            raise ValueError("RNGenerator.prepareBinomial: p must be from range (0,1)")
+        return self._przygotowany(*self._przygotuj_dwumianowy(p, n, metoda), 'q')
+
+    def _przygotuj_dwumianowy(self, p, n, metoda):
+        """
+         Zwraca parę funkcji (jeden(), paczka(m)) losujących z rozkładu dwumianowego (p z przedziału (0,1)).
+        """
+        self._sprawdz_metode(metoda)
+        if metoda == 'tablica':
+            return self._funkcje_tablicy(self._tablica_dwumianowego(p, n))
+        if metoda == 'szybka' and n * min(p, 1.0 - p) >= 10.0:
+            return self._binomial_szybka(p, n)
+        if metoda == 'odwracanie':
+            return self._odwracanie('binomial', p, n)
+        ust = self._ustawienia_dwumianowego(p, n)
+        algorytm = self._binomial
+        return lambda: algorytm(p, n, ust), lambda m: [algorytm(p, n, ust) for _ in range(m)]
+
+    def prepareDiscrete(self, weights):
+        """
+         Przygotowuje generator rozkładu dyskretnego o podanych wagach (tablica aliasów).
+         Zwraca funkcję losuj(size=None, out=None) zwracającą indeksy wag.
+        """
+        if not self._poprawne_wagi(weights):
+            raise ValueError("RNGenerator.prepareDiscrete: weights must be >=0 with positive sum")
+        return self._przygotowana_tablica(TablicaAliasow(list(weights)))
+
+    def _przygotowana_tablica(self, tablica):
+        return self._przygotowany(*self._funkcje_tablicy(tablica), 'q')
+
+    def _funkcje_tablicy(self, tablica):
+        return lambda: tablica.losuj(self.random), lambda m: tablica.paczka(self.random, m)
+
+    def _przygotowany(self, jeden, paczka, typ):
+        dlugosc = self._dlugosc
+        wypelnij = self._wypelnij
+
+        def losuj(size=None, out=None):
+            ile = dlugosc(size, out)
+            if ile is None:
+                return jeden()
+            return wypelnij(ile, out, typ, paczka)
+
+        return losuj
+
+    # ======================================================================
+    # Silnik odrzucania blokowego
+
+    def _odrzucanie_blokowe(self, klucz, n, propozycje):
+        """
+         Losuje n wartości metodą odrzucania, proponując kandydatów całymi paczkami.
+         Kolejna paczka ma dokładnie tyle kandydatów, ile brakuje wartości, więc nie powstają
+         wartości nadmiarowe, a liczba zużytych liczb jednostajnych zależy wyłącznie od stanu
+         generatora (nie od wcześniejszych wywołań ani od liczników akceptacji).
+         @param klucz Klucz licznika akceptacji: (nazwa rozkładu, parametry), np. ('gamma', 2.5).
+         @param n Liczba wartości do wygenerowania.
+         @param propozycje Funkcja propozycje(m) sprawdzająca m kandydatów i zwracająca listę zaakceptowanych.
+         @return Zwraca listę n wartości.
+        """
+        akceptacje = self._akceptacje
+        licznik = akceptacje.get(klucz)
+        if licznik is None:
+            licznik = akceptacje[klucz] = [0, 0]
+            # liczniki są tylko statystyką - trzymane dla ROZMIAR_CACHE ostatnio używanych kluczy
+            if len(akceptacje) > self.ROZMIAR_CACHE:
+                akceptacje.popitem(last=False)
+        else:
+            akceptacje.move_to_end(klucz)
+        wynik = []
+        brak = n
+        while brak > 0:
+            przyjete = propozycje(brak)
+            if self._instr is not None:
+                self._instr_licznik[1] += brak - len(przyjete)
+            licznik[0] += brak
+            licznik[1] += len(przyjete)
+            wynik.extend(przyjete)
+            brak = n - len(wynik)
+        return wynik
+
+    def acceptanceStats(self):
+        """
+         Zwraca statystyki silnika odrzucania blokowego (losowanie wsadowe) dla każdego rozkładu
+         i zestawu parametrów; odrzucenia w wywołaniach skalarnych zlicza instrumentacja.
+         @return Słownik (nazwa, parametry...) -> {'propozycje', 'akceptacje', 'wspolczynnik'}.
+        """
+        return {klucz: {'propozycje': prop, 'akceptacje': akc,
+                        'wspolczynnik': akc / prop if prop else 0.0}
+                for klucz, (prop, akc) in self._akceptacje.items()}
+
+    def resetAcceptanceStats(self):
+        """
+         Zeruje liczniki akceptacji silnika odrzucania blokowego.
+        """
+        self._akceptacje.clear()
+
+    # ======================================================================
+    # Instrumentacja
+
+    # metody publiczne, dla których zbierane są liczniki instrumentacji
+    METODY_INSTRUMENTOWANE = ('uniform', 'exponential', 'gamma', 'normal', 'chisquare', 'student',
+                              'lognormal', 'fdistribution', 'poisson', 'binomial', 'probability', 'discrete')
+
+    def enableInstrumentation(self):
+        """
+         Włącza liczniki dla metod z METODY_INSTRUMENTOWANE: wywołania, wygenerowane wartości,
+         zużyte liczby jednostajne, odrzucenia i łączny czas.
+         Liczniki działają przez atrybuty instancji przesłaniające random() i metody rozkładów
+         (jak źródło bitów w _ustaw_backend), więc wyłączona instrumentacja nie zmienia
+         wykonywanego kodu; odrzucenia liczone są wyłącznie w gałęziach odrzucenia.
+         Wywołania zagnieżdżone (np. normal wewnątrz lognormal) liczone są w metodzie zewnętrznej.
+        """
+        if self._instr is not None:
+            return
+        self._instr = {}
+        # [liczby jednostajne, odrzucenia, głębokość wywołań]
+        self._instr_licznik = [0, 0, 0]
+        self.random = self._liczace_random(self.random)
+        for nazwa in self.METODY_INSTRUMENTOWANE:
+            setattr(self, nazwa, self._instrumentowana(nazwa, getattr(self, nazwa)))
+
+    def disableInstrumentation(self):
+        """
+         Wyłącza instrumentację i przywraca oryginalne metody; zebrane liczniki są porzucane.
+        """
+        if self._instr is None:
+            return
+        for nazwa in self.METODY_INSTRUMENTOWANE:
+            del self.__dict__[nazwa]
+        if self._backend is not None:
+            self.random = self._backend.random
+        else:
+            del self.__dict__['random']
+        self._instr = None
+
+    def instrumentationStats(self):
+        """
+         Zwraca migawkę liczników instrumentacji (pusty słownik, gdy jest wyłączona).
+         @return Słownik nazwa -> {'wywolania', 'wartosci', 'jednostajne', 'odrzucenia', 'czas_s',
+                 'jednostajne_na_wartosc', 'ns_na_wartosc'} z liczbami gotowymi do eksportu.
+        """
+        if self._instr is None:
+            return {}
+        wynik = {}
+        for nazwa, (wywolania, wartosci, jednostajne, odrzucenia, czas) in self._instr.items():
+            wynik[nazwa] = {'wywolania': wywolania, 'wartosci': wartosci,
+                            'jednostajne': jednostajne, 'odrzucenia': odrzucenia, 'czas_s': czas,
+                            'jednostajne_na_wartosc': jednostajne / wartosci if wartosci else 0.0,
+                            'ns_na_wartosc': 1e9 * czas / wartosci if wartosci else 0.0}
+        return wynik
+
+    def resetInstrumentationStats(self):
+        """
+         Zeruje liczniki instrumentacji (instrumentacja pozostaje włączona).
+        """
+        if self._instr is not None:
+            self._instr.clear()
+
+    def _liczace_random(self, zrodlo):
+        licznik = self._instr_licznik
+
+        def random():
+            licznik[0] += 1
+            return zrodlo()
+
+        return random
+
+    def _instrumentowana(self, nazwa, metoda):
+        licznik = self._instr_licznik
+        statystyki = self._instr
+        zegar = time.perf_counter
+
+        def wywolaj(*args, **kwargs):
+            if licznik[2]:
+                return metoda(*args, **kwargs)
+            licznik[2] = 1
+            jednostajne, odrzucenia = licznik[0], licznik[1]
+            wynik = None
+            start = zegar()
+            try:
+                wynik = metoda(*args, **kwargs)
+                return wynik
+            finally:
+                czas = zegar() - start
+                licznik[2] = 0
+                try:
+                    wartosci = len(wynik)
+                except TypeError:
+                    wartosci = 1
+                wpis = statystyki.get(nazwa)
+                if wpis is None:
+                    wpis = statystyki[nazwa] = [0, 0, 0, 0, 0.0]
+                wpis[0] += 1
+                wpis[1] += wartosci
+                wpis[2] += licznik[0] - jednostajne
+                wpis[3] += licznik[1] - odrzucenia
+                wpis[4] += czas
+
+        wywolaj.__doc__ = metoda.__doc__
+        return wywolaj
+
+    @staticmethod
+    def _sprawdz_metode(metoda, dostepne=METODY):
+        if metoda not in dostepne:
+            raise ValueError(f"nieznana metoda '{metoda}', dostępne: {dostepne}")
+
+    # ======================================================================
+    # Algorytm ziggurat (rozkład normalny i wykładniczy)
+
+    def _normalna(self):
+        """
+         Zwraca jedną wartość z rozkładu N(0, 1) metodą ziggurat.
+         Jedna liczba jednostajna wyznacza zarówno warstwę, jak i położenie w niej.
+        """
+        rnd = self.random
+        while True:
+            v = rnd() * 128.0
+            i = int(v)
+            u = 2.0 * (v - i) - 1.0
+            if abs(u) < _ZIG_NORM_RATIO[i]:
+                return u * _ZIG_NORM_X[i]
+            z = self._normalna_wolna(i, u)
+            if z is not None:
+                return z
+
+    def _normalne_paczka(self, m):
+        """
+         Zwraca listę m wartości z rozkładu N(0, 1) metodą ziggurat.
+        """
+        rnd = self.random
+        x = _ZIG_NORM_X
+        ratio = _ZIG_NORM_RATIO
+        wolna = self._normalna_wolna
+        wynik = []
+        dodaj = wynik.append
+        for _ in range(m):
+            while True:
+                v = rnd() * 128.0
+                i = int(v)
+                u = 2.0 * (v - i) - 1.0
+                if abs(u) < ratio[i]:
+                    dodaj(u * x[i])
+                    break
+                z = wolna(i, u)
+                if z is not None:
+                    dodaj(z)
+                    break
+        return wynik
+
+    def _normalna_wolna(self, i, u):
+        """
+         Obsługa rzadkiego przypadku zigguratu normalnego: ogon (i == 0) albo klin warstwy i.
+         @return Zwraca wartość albo None, jeśli punkt został odrzucony.
+        """
+        rnd = self.random
+        if i == 0:
+            while True:
+                xx = -math.log(1.0 - rnd()) / ZIG_NORM_R
+                yy = -math.log(1.0 - rnd())
+                if yy + yy > xx * xx:
+                    break
+                if self._instr is not None:
+                    self._instr_licznik[1] += 1
+            return ZIG_NORM_R + xx if u > 0.0 else -(ZIG_NORM_R + xx)
+        x = _ZIG_NORM_X
+        z = u * x[i]
+        f0 = math.exp(-0.5 * (x[i] * x[i] - z * z))
+        f1 = math.exp(-0.5 * (x[i + 1] * x[i + 1] - z * z))
+        if f1 + rnd() * (f0 - f1) < 1.0:
+            return z
+        if self._instr is not None:
+            self._instr_licznik[1] += 1
+        return None
+
+    def _wykladnicza(self):
+        """
+         Zwraca jedną wartość z rozkładu Exp(1) metodą ziggurat.
+         Jedna liczba jednostajna wyznacza zarówno warstwę, jak i położenie w niej.
+        """
+        rnd = self.random
+        while True:
+            v = rnd() * 256.0
+            i = int(v)
+            u = v - i
+            if u < _ZIG_EXP_RATIO[i]:
+                return u * _ZIG_EXP_X[i]
+            z = self._wykladnicza_wolna(i, u)
+            if z is not None:
+                return z
+
+    def _wykladnicze_paczka(self, m, c=1.0):
+        """
+         Zwraca listę m wartości z rozkładu Exp(1) metodą ziggurat, pomnożonych przez c.
+        """
+        rnd = self.random
+        x = _ZIG_EXP_X
+        ratio = _ZIG_EXP_RATIO
+        wolna = self._wykladnicza_wolna
+        wykladnicza = self._wykladnicza
+
+        def dokoncz(i, u):
+            # punkt poza prostokątem warstwy: klin albo ogon, po odrzuceniu losowanie od nowa
+            z = wolna(i, u)
+            return wykladnicza() if z is None else z
+
+        return [c * (u * x[i] if (u := (v := rnd() * 256.0) - (i := int(v))) < ratio[i] else dokoncz(i, u))
+                for _ in range(m)]
+
+    def _wykladnicza_wolna(self, i, u):
+        """
+         Obsługa rzadkiego przypadku zigguratu wykładniczego: ogon (i == 0) albo klin warstwy i.
+         @return Zwraca wartość albo None, jeśli punkt został odrzucony.
+        """
+        rnd = self.random
+        if i == 0:
+            return ZIG_EXP_R - math.log(1.0 - rnd())
+        x = _ZIG_EXP_X
+        z = u * x[i]
+        f0 = math.exp(z - x[i])
+        f1 = math.exp(z - x[i + 1])
+        if f1 + rnd() * (f0 - f1) < 1.0:
+            return z
+        if self._instr is not None:
+            self._instr_licznik[1] += 1
+        return None
+
     # ======================================================================
     '''
     
     '''
 
-    def uniform(self, a, b):
+    def uniform(self, a, b, size=None, out=None):
         """
          Metoda generująca wartość pseudolosową jako realizację rozkładu 'jednostajnego' (inaczej: jednorodny, równomierny, prostokątny albo płaski).
          @param a Najmniejsza wartość generowanej zmiennej. Poprawny zakres wartości: liczby rzeczywiste, z warunkiem: a<b.
          @param b Największa wartość generowanej zmiennej. Poprawny zakres wartości: liczby rzeczywiste, z warunkiem: a<b.
-         @return Zwraca liczbę rzeczywistą w przedziale [a, b)
+         @param size Liczba wartości do wygenerowania wsadowo (opcjonalnie).
+         @param out Bufor do wypełnienia wartościami (opcjonalnie).
+         @return Zwraca liczbę rzeczywistą w przedziale [a, b) albo bufor takich liczb.
         """
         if b < a:
             print("RNGenerator.uniform: give b>a", file=sys.stderr)
-            return -1.0
-        return self.random() * (b - a) + a
+            return self._wynik_bledu(-1.0, size, out, 'd')
+        n = self._dlugosc(size, out)
+        if n is None:
+            return self.random() * (b - a) + a
+        d = b - a
+        # przy włączonej instrumentacji liczby pobierane są przez (liczące) random()
+        if self._backend is not None and self._instr is None:
+            fill = self._backend.fill
+            return self._wypelnij(n, out, 'd', lambda m: [u * d + a for u in fill(m)])
+        rnd = self.random
+        return self._wypelnij(n, out, 'd', lambda m: [rnd() * d + a for _ in range(m)])
 
     # Rozkład jednostajny (całkowity)
     def uniformInt(self, a, b=None):
@@ -81,17 +1241,34 @@ class RNGenerator(random.Random):
     # ======================================================================
     # Rozkład wykładniczy
 
-    def exponential(self, lam):
+    def exponential(self, lam, size=None, out=None, metoda='klasyczna'):
         """
          Metoda generująca wartość pseudolosową jako realizację rozkładu 'wykładniczy'.
          @param lambda Parametr skali. Poprawny zakres wartości: liczba rzeczywista, większa od 0.
-         @return Zwraca liczbę rzeczywistą w przedziale [0 ; ∞).
+         @param size Liczba wartości do wygenerowania wsadowo (opcjonalnie).
+         @param out Bufor do wypełnienia wartościami (opcjonalnie).
+         @param metoda 'klasyczna' (odwracanie dystrybuanty) albo 'ziggurat'. W CPython odwracanie
+                       (jedno wywołanie math.log) jest szybsze od zigguratu.
+         @return Zwraca liczbę rzeczywistą w przedziale [0 ; ∞) albo bufor takich liczb.
         """
+        self._sprawdz_metode(metoda, ('klasyczna', 'ziggurat'))
         if lam < 0:
             print("RNGenerator.exponential: a must be >0", file=sys.stderr)
-            return -1.0
-        u = self.random()
-        return (1.0 / lam) * (-math.log(1.0 - u))
+            return self._wynik_bledu(-1.0, size, out, 'd')
+        n = self._dlugosc(size, out)
+        if metoda == 'ziggurat':
+            c = 1.0 / lam
+            if n is None:
+                return c * self._wykladnicza()
+            wykladnicze = self._wykladnicze_paczka
+            return self._wypelnij(n, out, 'd', lambda m: wykladnicze(m, c))
+        if n is None:
+            u = self.random()
+            return (1.0 / lam) * (-math.log(1.0 - u))
+        rnd = self.random
+        log = math.log
+        c = 1.0 / lam
+        return self._wypelnij(n, out, 'd', lambda m: [c * (-log(1.0 - rnd())) for _ in range(m)])
 
     # ======================================================================
     # Rozkład Erlanga
@@ -108,16 +1285,113 @@ class RNGenerator(random.Random):
     # ======================================================================
     # Rozkład gamma
 
-    def gamma(self, k, b):
+    def gamma(self, k, b, size=None, out=None, metoda='klasyczna'):
         """
          Metoda generująca wartość pseudolosową jako realizację rozkładu 'gamma'.
          @param k Parametr kształtu. Poprawny zakres wartości: liczba całkowita, większa od 0.
          @param b Parametr zakresu. Poprawny zakres wartości: liczba rzeczywista, większa od 0.
-         @return Zwraca liczbę rzeczywistą w przedziale [0 ; ∞).
+         @param size Liczba wartości do wygenerowania wsadowo (opcjonalnie).
+         @param out Bufor do wypełnienia wartościami (opcjonalnie).
+         @param metoda 'klasyczna', 'szybka' (Marsaglia-Tsang z odrzucaniem blokowym; pojedyncze
+                wartości są szybsze od 'klasyczna' tylko dla k > 1)
+                albo 'odwracanie' (odwracanie dystrybuanty, wolne, ale monotoniczne względem U).
+         @return Zwraca liczbę rzeczywistą w przedziale [0 ; ∞) albo bufor takich liczb.
         """
+        self._sprawdz_metode(metoda, ('klasyczna', 'szybka', 'odwracanie'))
         if (k < 0.0) or (b < 0.0):
             print("RNGenerator.gamma: k and b be >0 and k<=1", file=sys.stderr)
+        n = self._dlugosc(size, out)
+        if metoda == 'szybka':
+            if n is None:
+                return self._gamma_mt(k, b, *self._stale_gamma(k))
+            jeden, paczka = self._ustawienia(('gamma-szybka', k, b), self._gamma_szybka, k, b)
+        elif metoda == 'odwracanie':
+            jeden, paczka = self._ustawienia(('gamma-odwracanie', k, b), self._odwracanie, 'gamma', k, b)
+        else:
+            algorytm = self._gamma
+            if n is None:
+                return algorytm(k, b)
+            paczka = lambda m: [algorytm(k, b) for _ in range(m)]
+        if n is None:
+            return jeden()
+        return self._wypelnij(n, out, 'd', paczka)
+
+    @staticmethod
+    def _stale_gamma(k):
+        """
+         Wylicza stałe (d, c) metody Marsaglii-Tsanga dla kształtu k (dla k < 1 - dla k + 1).
+        """
+        d = (k + 1.0 if k < 1.0 else k) - 1.0 / 3.0
+        return d, 1.0 / math.sqrt(9.0 * d)
+
+    def _gamma_szybka(self, k, b):
+        """
+         Zwraca parę funkcji (jeden(), paczka(m)) losujących z rozkładu gamma metodą Marsaglii-Tsanga:
+         jeden() odrzuca kandydatów pojedynczo (_gamma_mt), paczka(m) korzysta z silnika odrzucania blokowego.
+         Dla k < 1 korzysta z zależności Gamma(k) = Gamma(k+1) * U^(1/k).
+        """
+        log = math.log
+        d, c = self._stale_gamma(k)
+        normalne = self._normalne_paczka
+        algorytm = self._gamma_mt
+
+        def propozycje(m):
+            rnd = self.random
+            przyjete = []
+            for x in normalne(m):
+                v = 1.0 + c * x
+                if v <= 0.0:
+                    continue
+                v = v * v * v
+                u = 1.0 - rnd()
+                x2 = x * x
+                if u < 1.0 - 0.0331 * x2 * x2 or log(u) < 0.5 * x2 + d * (1.0 - v + log(v)):
+                    przyjete.append(d * v / b)
+            return przyjete
+
+        silnik = self._odrzucanie_blokowe
+        klucz = ('gamma', k)
+        jeden = lambda: algorytm(k, b, d, c)
+        if k < 1.0:
+            wyk = 1.0 / k
+            return jeden, lambda m: [g * self.random() ** wyk for g in silnik(klucz, m, propozycje)]
+        return jeden, lambda m: silnik(klucz, m, propozycje)
+
+    def _gamma_mt(self, k, b, d, c):
+        """
+         Losuje jedną wartość z rozkładu gamma metodą Marsaglii-Tsanga, odrzucając kandydatów pojedynczo.
+         @param d, c Stałe wyliczone przez _stale_gamma(k).
+        """
+        rnd = self.random
+        log = math.log
+        while True:
+            # ziggurat normalny jak w _normalna, z szybka sciezka bez wywolania metody
+            x = rnd() * 128.0
+            i = int(x)
+            u = 2.0 * (x - i) - 1.0
+            if abs(u) < _ZIG_NORM_RATIO[i]:
+                x = u * _ZIG_NORM_X[i]
+            else:
+                x = self._normalna_wolna(i, u)
+                if x is None:
+                    continue
+            v = 1.0 + c * x
+            if v > 0.0:
+                v = v * v * v
+                u = 1.0 - rnd()
+                x2 = x * x
+                if u < 1.0 - 0.0331 * x2 * x2 or log(u) < 0.5 * x2 + d * (1.0 - v + log(v)):
+                    break
+            if self._instr is not None:
+                self._instr_licznik[1] += 1
+        if k < 1.0:
+            return d * v / b * self.random() ** (1.0 / k)
+        return d * v / b
 
+    def _gamma(self, k, b):
+        """
+         Właściwy algorytm losowania z rozkładu gamma (bez sprawdzania parametrów).
+        """
         # k < 1
         if k < 1.0:
             while True:
@@ -125,13 +1399,15 @@ class RNGenerator(random.Random):
                 yy = self.random() ** (1.0 / (1.0 - k))
                 if xx + yy <= 1.0:
                     break
+                if self._instr is not None:
+                    self._instr_licznik[1] += 1
             xx = xx / (xx + yy)
-            yy = self.exponential(1.0)
+            yy = -math.log(1.0 - self.random())
             return xx * yy / b
 
         # k == 1
         if k == 1.0:
-            return self.exponential(1.0) / b
+            return -math.log(1.0 - self.random()) / b
 
         # k > 1: metoda odrzucania
         while True:
@@ -141,39 +1417,72 @@ class RNGenerator(random.Random):
                     v2 = 2.0 * self.random() - 1.0
                     if v1 * v1 + v2 * v2 <= 1.0:
                         break
+                    if self._instr is not None:
+                        self._instr_licznik[1] += 1
                 yy = v2 / v1
                 am = k - 1.0
                 s = math.sqrt(2.0 * am + 1.0)
                 avg = s * yy + am
                 if avg > 0.0:
                     break
+                if self._instr is not None:
+                    self._instr_licznik[1] += 1
             e = (1.0 + yy * yy) * math.exp(am * math.log(avg / am) - s * yy)
             if self.random() <= e:
                 break
+            if self._instr is not None:
+                self._instr_licznik[1] += 1
         return avg / b
 
     # ======================================================================
     # Rozkład normalny
 
-    def normal(self, a, b):
+    def normal(self, a, b, size=None, out=None):
         """
-         Metoda generująca wartość pseudolosową jako realizację rozkładu 'normalny'.
+         Metoda generująca wartość pseudolosową jako realizację rozkładu 'normalny' (algorytm ziggurat).
          @param a Parametr położenia. Poprawny zakres wartości: liczba rzeczywista.
          @param b Parametr skali. Poprawny zakres wartości: liczba rzeczywista, różna od 0.
-         @return Zwraca liczbę rzeczywistą w przedziale (-∞ ; ∞).
+         @param size Liczba wartości do wygenerowania wsadowo (opcjonalnie).
+         @param out Bufor do wypełnienia wartościami (opcjonalnie).
+         @return Zwraca liczbę rzeczywistą w przedziale (-∞ ; ∞) albo bufor takich liczb.
         """
-        raise Exception('Not implemented.')
+        if b == 0.0:
+            print("RNGenerator.normal: b must be !=0", file=sys.stderr)
+            return self._wynik_bledu(-1.0, size, out, 'd')
+        n = self._dlugosc(size, out)
+        if n is None:
+            return a + b * self._normalna()
+        normalne = self._normalne_paczka
+        return self._wypelnij(n, out, 'd', lambda m: [a + b * z for z in normalne(m)])
 
     # ======================================================================
     # Rozkład chi-kwadrat
 
-    def chisquare(self, k):
+    def chisquare(self, k, size=None, out=None):
         """
          Metoda generująca wartość pseudolosową jako realizację rozkładu 'Chi kwadrat'.
+         Korzysta z zależności chi2(k) = Gamma(k/2, 1/2) (Marsaglia-Tsang na zigguracie).
          @param k Parametr swobody. Poprawny zakres wartości: liczba całkowita, większa od 0.
-         @return Zwraca liczbę rzeczywistą w przedziale [0 ; ∞).
+         @param size Liczba wartości do wygenerowania wsadowo (opcjonalnie).
+         @param out Bufor do wypełnienia wartościami (opcjonalnie).
+         @return Zwraca liczbę rzeczywistą w przedziale [0 ; ∞) albo bufor takich liczb.
         """
-        raise Exception('Not implemented.')
+        if k <= 0:
+            print("RNGenerator.chisquare: k must be >0", file=sys.stderr)
+            return self._wynik_bledu(-1.0, size, out, 'd')
+        n = self._dlugosc(size, out)
+        if n is None:
+            return self._chi2(k)
+        return self._wypelnij(n, out, 'd', self._chi2_paczka(k))
+
+    def _chi2(self, k):
+        """
+         Losuje jedną wartość z rozkładu chi2(k) = Gamma(k/2, 1/2), odrzucając kandydatów pojedynczo.
+        """
+        return self._gamma_mt(0.5 * k, 0.5, *self._stale_gamma(0.5 * k))
+
+    def _chi2_paczka(self, k):
+        return self._ustawienia(('gamma-szybka', 0.5 * k, 0.5), self._gamma_szybka, 0.5 * k, 0.5)[1]
 
     # ======================================================================
     # Rozkład beta
@@ -190,41 +1499,74 @@ class RNGenerator(random.Random):
     # ======================================================================
     # Rozkład studenta
 
-    def student(self, n):
+    def student(self, n, size=None, out=None):
         """
          Metoda generująca wartość pseudolosową jako realizację rozkładu 'studenta'. Wartość oczekiwana równa jest 0 dla n>1, w przeciwnym wypadku wartość jest nieznana.
+         Wartość liczona jest jako Z / sqrt(chi2(n) / n).
          @param n Parametr swobody. Poprawny zakres wartości: liczba całkowita, większa od 0.
-         @return Zwraca liczbę rzeczywistą w przedziale (-∞ ; ∞).
+         @param size Liczba wartości do wygenerowania wsadowo (opcjonalnie).
+         @param out Bufor do wypełnienia wartościami (opcjonalnie).
+         @return Zwraca liczbę rzeczywistą w przedziale (-∞ ; ∞) albo bufor takich liczb.
         """
-        raise Exception('Not implemented.')
+        if n <= 0:
+            print("RNGenerator.student: n must be >0", file=sys.stderr)
+            return self._wynik_bledu(-1.0, size, out, 'd')
+        ile = self._dlugosc(size, out)
+        if ile is None:
+            z = self._normalna()
+            return z / math.sqrt(self._chi2(n) / n)
+        chi2 = self._chi2_paczka(n)
+        normalne = self._normalne_paczka
+        sqrt = math.sqrt
+        paczka = lambda m: [z / sqrt(c / n) for z, c in zip(normalne(m), chi2(m))]
+        return self._wypelnij(ile, out, 'd', paczka)
 
     # ======================================================================
     # Rozkład lognormalny
 
-    def lognormal(self, average, std_dev):
+    def lognormal(self, average, std_dev, size=None, out=None):
         """
          Metoda generująca wartość pseudolosową jako realizację rozkładu 'lognormal'.
          @param average Wartość oczekiwana. Poprawny zakres wartości: liczba rzeczywista, większa od 0.
          @param stdDev Odchylenie standardowe. Poprawny zakres wartości: liczba rzeczywista, większa od 0.
-         @return Zwraca liczbę rzeczywistą w przedziale (0 ; ∞).
+         @param size Liczba wartości do wygenerowania wsadowo (opcjonalnie).
+         @param out Bufor do wypełnienia wartościami (opcjonalnie).
+         @return Zwraca liczbę rzeczywistą w przedziale (0 ; ∞) albo bufor takich liczb.
         """
         if std_dev <= 0.0:
             print("RNGenerator:lognormal: b must be >0", file=sys.stderr)
-            return -1.0
-        return math.exp(self.normal(average, std_dev))
+            return self._wynik_bledu(-1.0, size, out, 'd')
+        n = self._dlugosc(size, out)
+        if n is None:
+            return math.exp(self.normal(average, std_dev))
+        normalne = self._normalne_paczka
+        exp = math.exp
+        return self._wypelnij(n, out, 'd',
+                              lambda m: [exp(average + std_dev * z) for z in normalne(m)])
 
     # ======================================================================
     # Rozkład F-Snedecora
 
-    def fdistribution(self, n, m):
+    def fdistribution(self, n, m, size=None, out=None):
         """
          Metoda generująca wartość pseudolosową jako realizację rozkładu 'F Snedecora'.
          @param n Parametr stopnia swobody. Poprawny zakres wartości: liczba całkowita, większa od 0.
          @param m Parametr stopnia swobody. Poprawny zakres wartości: liczba całkowita, większa od 0.
-         @return Zwraca liczbę rzeczywistą w przedziale (0 ; ∞).
+         @param size Liczba wartości do wygenerowania wsadowo (opcjonalnie).
+         @param out Bufor do wypełnienia wartościami (opcjonalnie).
+         @return Zwraca liczbę rzeczywistą w przedziale (0 ; ∞) albo bufor takich liczb.
         """
-
-        raise Exception('Not implemented.')
+        if n <= 0 or m <= 0:
+            print("RNGenerator.fdistribution: n and m must be >0", file=sys.stderr)
+            return self._wynik_bledu(-1.0, size, out, 'd')
+        ile = self._dlugosc(size, out)
+        if ile is None:
+            x = self._chi2(n)
+            return (x / n) / (self._chi2(m) / m)
+        chi2_n = self._chi2_paczka(n)
+        chi2_m = self._chi2_paczka(m)
+        paczka = lambda ile: [(x / n) / (y / m) for x, y in zip(chi2_n(ile), chi2_m(ile))]
+        return self._wypelnij(ile, out, 'd', paczka)
 
     # ======================================================================
     # Rozkład Weibulla
@@ -241,21 +1583,130 @@ class RNGenerator(random.Random):
     # ======================================================================
     # Rozkład Poissona
 
-    def poisson(self, a):
+    def poisson(self, a, size=None, out=None, metoda='klasyczna'):
         """
          Metoda generująca wartość pseudolosową jako realizację rozkładu 'poissona'.
          @param a Parametr oczekiwanej liczby zdarzeń w danym przedziale czasu. Poprawny zakres wartości: liczba rzeczywista, większa od 0.
-         @return Zwraca liczbę całkowitą nieujemną.
+         @param size Liczba wartości do wygenerowania wsadowo (opcjonalnie).
+         @param out Bufor do wypełnienia wartościami (opcjonalnie).
+         @param metoda 'klasyczna', 'szybka' (PTRS z odrzucaniem blokowym dla a >= 10),
+                'tablica' (tablica aliasów, jedna liczba jednostajna na wartość)
+                albo 'odwracanie' (odwracanie dystrybuanty, jedna liczba jednostajna na wartość).
+         @return Zwraca liczbę całkowitą nieujemną albo bufor takich liczb.
+        """
+        self._sprawdz_metode(metoda)
+        n = self._dlugosc(size, out)
+        if metoda == 'tablica':
+            tablica = self._ustawienia(('poisson-tablica', a), self._tablica_poissona, a)
+            if n is None:
+                return tablica.losuj(self.random)
+            paczka = lambda m: tablica.paczka(self.random, m)
+        elif metoda == 'szybka' and a >= 10.0:
+            jeden, paczka = self._ustawienia(('poisson-szybka', a), self._poisson_szybka, a)
+            if n is None:
+                return jeden()
+        elif metoda == 'odwracanie':
+            jeden, paczka = self._ustawienia(('poisson-odwracanie', a), self._odwracanie, 'poisson', a)
+            if n is None:
+                return jeden()
+        else:
+            ust = self._ustawienia_poissona(a)
+            algorytm = self._poisson
+            if n is None:
+                return algorytm(a, ust)
+            paczka = lambda m: [algorytm(a, ust) for _ in range(m)]
+        return self._wypelnij(n, out, 'q', paczka)
+
+    @staticmethod
+    def _tablica_poissona(a):
+        """
+         Buduje tablicę aliasów z funkcji prawdopodobieństwa Poissona obciętej do a ± (10*sqrt(a) + 10).
+        """
+        sd = math.sqrt(a)
+        lo = max(0, int(a - 10.0 * sd - 10.0))
+        hi = int(a + 10.0 * sd + 10.0)
+        if hi - lo + 1 > ROZMIAR_TABLICY_MAX:
+            raise ValueError("RNGenerator.poisson: a too large for metoda='tablica'")
+        loga = math.log(a)
+        lgamma = math.lgamma
+        wagi = lambda: [math.exp(k * loga - a - lgamma(k + 1.0)) for k in range(lo, hi + 1)]
+        return _tablica_aliasow('poisson', wagi, lo, hi, a)
+
+    def _poisson_szybka(self, a):
+        """
+         Zwraca parę funkcji (jeden(), paczka(m)) losujących z rozkładu Poissona metodą PTRS
+         (transformed rejection with squeeze, Hörmann 1993). Wymaga a >= 10.
+        """
+        log = math.log
+        lgamma = math.lgamma
+        lf = _LOG_SILNIA or _log_silnia()
+        nlf = len(lf)
+        floor = math.floor
+        smu = math.sqrt(a)
+        bb = 0.931 + 2.53 * smu
+        aa = -0.059 + 0.02483 * bb
+        log_alfa = math.log(1.1239 + 1.1328 / (bb - 3.4))
+        vr = 0.9277 - 3.6224 / (bb - 2.0)
+        loga = math.log(a)
+        klucz = ('poisson', a)
+
+        def propozycje(m):
+            rnd = self.random
+            przyjete = []
+            for _ in range(m):
+                u = rnd() - 0.5
+                v = rnd()
+                us = 0.5 - abs(u)
+                k = floor((2.0 * aa / us + bb) * u + a + 0.43)
+                if us >= 0.07 and v <= vr:
+                    przyjete.append(k)
+                    continue
+                if k < 0 or (us < 0.013 and v > us) or v == 0.0:
+                    continue
+                lk = lf[k] if k < nlf else lgamma(k + 1.0)
+                if log(v) + log_alfa - log(aa / (us * us) + bb) <= -a + k * loga - lk:
+                    przyjete.append(k)
+            return przyjete
+
+        def jeden():
+            rnd = self.random
+            while True:
+                u = rnd() - 0.5
+                v = rnd()
+                us = 0.5 - abs(u)
+                k = floor((2.0 * aa / us + bb) * u + a + 0.43)
+                if us >= 0.07 and v <= vr:
+                    return k
+                if not (k < 0 or (us < 0.013 and v > us) or v == 0.0):
+                    lk = lf[k] if k < nlf else lgamma(k + 1.0)
+                    if log(v) + log_alfa - log(aa / (us * us) + bb) <= -a + k * loga - lk:
+                        return k
+                if self._instr is not None:
+                    self._instr_licznik[1] += 1
+
+        silnik = self._odrzucanie_blokowe
+        return jeden, lambda m: silnik(klucz, m, propozycje)
+
+    def _ustawienia_poissona(self, a):
+        return self._ustawienia(('poisson', a), self._stale_poissona, a)
+
+    @classmethod
+    def _stale_poissona(cls, a):
+        """
+         Wylicza stałe algorytmu Poissona: (g,) dla a < 12 lub (sq, alxm, g) dla a >= 12.
         """
-        sq = -1.0
-        alxm = -1.0
-        g = -1.0
-        oldm = -1.0
+        if a < 12.0:
+            return (math.exp(-a),)
+        alxm = math.log(a)
+        return (math.sqrt(2.0 * a), alxm, a * alxm - math.lgamma(a + 1.0))
 
+    def _poisson(self, a, ust):
+        """
+         Właściwy algorytm losowania z rozkładu Poissona.
+         @param ust Stałe wyliczone przez _stale_poissona(a).
+        """
         if a < 12.0:
-            if a != oldm:
-                oldm = a
-                g = math.exp(-a)
+            g = ust[0]
             em = -1.0
             t = 1.0
             while True:
@@ -264,23 +1715,23 @@ class RNGenerator(random.Random):
                 if t <= g:
                     break
         else:
-            if a != oldm:
-                oldm = a
-                sq = math.sqrt(2.0 * a)
-                alxm = math.log(a)
-                g = a * alxm - self._lngamma(a + 1.0)
+            sq, alxm, g = ust
+            lf = _LOG_SILNIA or _log_silnia()
             while True:
                 while True:
                     yy = math.tan(self.PI * self.random())
                     em = sq * yy + a
                     if em >= 0.0:
                         break
+                    if self._instr is not None:
+                        self._instr_licznik[1] += 1
                 em = math.floor(em)
-                t = 0.9 * (1.0 + yy * yy) * math.exp(
-                    em * alxm - self._lngamma(em + 1.0) - g
-                )
+                lem = lf[em] if em < len(lf) else math.lgamma(em + 1.0)
+                t = 0.9 * (1.0 + yy * yy) * math.exp(em * alxm - lem - g)
                 if self.random() <= t:
                     break
+                if self._instr is not None:
+                    self._instr_licznik[1] += 1
         return int(em)
 
     # ======================================================================
@@ -297,28 +1748,158 @@ class RNGenerator(random.Random):
     # ======================================================================
     # Rozkład dwumianowy
 
-    def binomial(self, p, n):
+    def binomial(self, p, n, size=None, out=None, metoda='klasyczna'):
         """
 	 Metoda generująca wartość pseudolosową jako realizację rozkładu 'dwumianowy'.
 	 @param p Parametr prawdopodobieństwa sukcesu. Poprawny zakres wartości: liczba rzeczywista z przedziału [0;1].
 	 @param n Parametr liczby prób. Poprawny zakres wartości: liczba całkowita nieujemna.
-	 @return Zwraca liczbę całkowitą nieujemną ze zbioru liczb {0,...,n}
+	 @param size Liczba wartości do wygenerowania wsadowo (opcjonalnie).
+	 @param out Bufor do wypełnienia wartościami (opcjonalnie).
+	 @param metoda 'klasyczna', 'szybka' (BTRS z odrzucaniem blokowym dla n*min(p,1-p) >= 10),
+	        'tablica' (tablica aliasów, jedna liczba jednostajna na wartość)
+	        albo 'odwracanie' (odwracanie dystrybuanty, jedna liczba jednostajna na wartość).
+	 @return Zwraca liczbę całkowitą nieujemną ze zbioru liczb {0,...,n} albo bufor takich liczb.
         """
+        self._sprawdz_metode(metoda)
         if (p <= 0.0) or (p >= 1.0):
             print("RNGenerator.binomial: p must be from range (0,1)",
                   file=sys.stderr)
-            return -1
+            return self._wynik_bledu(-1, size, out, 'q')
+        ile = self._dlugosc(size, out)
+        if metoda == 'tablica':
+            tablica = self._ustawienia(('binomial-tablica', p, n), self._tablica_dwumianowego, p, n)
+            if ile is None:
+                return tablica.losuj(self.random)
+            paczka = lambda m: tablica.paczka(self.random, m)
+        elif metoda == 'szybka' and n * min(p, 1.0 - p) >= 10.0:
+            jeden, paczka = self._ustawienia(('binomial-szybka', p, n), self._binomial_szybka, p, n)
+            if ile is None:
+                return jeden()
+        elif metoda == 'odwracanie':
+            jeden, paczka = self._ustawienia(('binomial-odwracanie', p, n), self._odwracanie, 'binomial', p, n)
+            if ile is None:
+                return jeden()
+        else:
+            ust = self._ustawienia_dwumianowego(p, n)
+            algorytm = self._binomial
+            if ile is None:
+                return algorytm(p, n, ust)
+            paczka = lambda m: [algorytm(p, n, ust) for _ in range(m)]
+        return self._wypelnij(ile, out, 'q', paczka)
 
-        nold = -1
-        pold = -1.0
-        pc = 0.0
-        en = 0.0
-        oldg = 0.0
-        plog = 0.0
-        pclog = 0.0
+    @staticmethod
+    def _tablica_dwumianowego(p, n):
+        """
+         Buduje tablicę aliasów z funkcji prawdopodobieństwa dwumianowego,
+         dla dużych n obciętej do n*p ± (10*sqrt(n*p*(1-p)) + 10).
+        """
+        am = n * p
+        sd = math.sqrt(am * (1.0 - p))
+        lo = max(0, int(am - 10.0 * sd - 10.0))
+        hi = min(n, int(am + 10.0 * sd + 10.0))
+        if hi - lo + 1 > ROZMIAR_TABLICY_MAX:
+            raise ValueError("RNGenerator.binomial: n too large for metoda='tablica'")
+        lgamma = math.lgamma
+        stala = lgamma(n + 1.0)
+        plog = math.log(p)
+        pclog = math.log(1.0 - p)
+        wagi = lambda: [math.exp(stala - lgamma(k + 1.0) - lgamma(n - k + 1.0) + k * plog + (n - k) * pclog)
+                        for k in range(lo, hi + 1)]
+        return _tablica_aliasow('binomial', wagi, lo, hi, p, n)
 
+    def _binomial_szybka(self, p, n):
+        """
+         Zwraca parę funkcji (jeden(), paczka(m)) losujących z rozkładu dwumianowego metodą BTRS
+         (transformed rejection with squeeze, Hörmann 1993). Wymaga n*min(p,1-p) >= 10.
+        """
+        log = math.log
+        lgamma = math.lgamma
+        lf = _LOG_SILNIA or _log_silnia()
+        nlf = len(lf)
+        floor = math.floor
+        prob = p if p <= 0.5 else 1.0 - p
+        odwroc = prob != p
+        q = 1.0 - prob
+        spq = math.sqrt(n * prob * q)
+        bb = 1.15 + 2.53 * spq
+        aa = -0.0873 + 0.0248 * bb + 0.01 * prob
+        c = n * prob + 0.5
+        vr = 0.92 - 4.2 / bb
+        alfa = (2.83 + 5.1 / bb) * spq
+        lpq = math.log(prob / q)
+        mm = math.floor((n + 1) * prob)
+        h = lgamma(mm + 1.0) + lgamma(n - mm + 1.0)
+        klucz = ('binomial', p, n)
+
+        def propozycje(m):
+            rnd = self.random
+            przyjete = []
+            for _ in range(m):
+                u = rnd() - 0.5
+                v = rnd()
+                us = 0.5 - abs(u)
+                k = floor((2.0 * aa / us + bb) * u + c)
+                if k < 0 or k > n:
+                    continue
+                if us >= 0.07 and v <= vr:
+                    przyjete.append(n - k if odwroc else k)
+                    continue
+                v = v * alfa / (aa / (us * us) + bb)
+                if v <= 0.0:
+                    continue
+                lk = lf[k] if k < nlf else lgamma(k + 1.0)
+                lnk = lf[n - k] if n - k < nlf else lgamma(n - k + 1.0)
+                if log(v) <= h - lk - lnk + (k - mm) * lpq:
+                    przyjete.append(n - k if odwroc else k)
+            return przyjete
+
+        def jeden():
+            rnd = self.random
+            while True:
+                u = rnd() - 0.5
+                v = rnd()
+                us = 0.5 - abs(u)
+                k = floor((2.0 * aa / us + bb) * u + c)
+                if 0 <= k <= n:
+                    if us >= 0.07 and v <= vr:
+                        return n - k if odwroc else k
+                    v = v * alfa / (aa / (us * us) + bb)
+                    if v > 0.0:
+                        lk = lf[k] if k < nlf else lgamma(k + 1.0)
+                        lnk = lf[n - k] if n - k < nlf else lgamma(n - k + 1.0)
+                        if log(v) <= h - lk - lnk + (k - mm) * lpq:
+                            return n - k if odwroc else k
+                if self._instr is not None:
+                    self._instr_licznik[1] += 1
+
+        silnik = self._odrzucanie_blokowe
+        return jeden, lambda m: silnik(klucz, m, propozycje)
+
+    def _ustawienia_dwumianowego(self, p, n):
+        return self._ustawienia(('binomial', p, n), self._stale_dwumianowego, p, n)
+
+    @classmethod
+    def _stale_dwumianowego(cls, p, n):
+        """
+         Wylicza stałe algorytmu dwumianowego: (prob, am, (1-prob)^n) dla metod prostych
+         lub (prob, am, en, oldg, pc, plog, pclog, sq) dla metody odrzucania.
+        """
         prob = p if p <= 0.5 else 1.0 - p
         am = n * prob
+        if n < 25 or am < 10.0:
+            return (prob, am, (1.0 - prob) ** n)
+        en = float(n)
+        pc = 1.0 - prob
+        return (prob, am, en, math.lgamma(en + 1.0), pc,
+                math.log(prob), math.log(pc), math.sqrt(2.0 * am * pc))
+
+    def _binomial(self, p, n, ust):
+        """
+         Właściwy algorytm losowania z rozkładu dwumianowego (bez sprawdzania p).
+         @param ust Stałe wyliczone przez _stale_dwumianowego(p, n).
+        """
+        prob = ust[0]
+        am = ust[1]
 
         # prosta metoda dla małego n
         if n < 25:
@@ -327,28 +1908,29 @@ class RNGenerator(random.Random):
                 if self.random() < prob:
                     bnl += 1.0
 
-        # metoda Poissona dla małej wartości oczekiwanej
+        # odwracanie dystrybuanty (BINV) dla małej wartości oczekiwanej
         elif am < 10.0:
-            g = math.exp(-am)
-            t = 1.0
-            for j in range(0, n + 1):
-                t *= self.random()
-                if t < g:
+            r0 = ust[2]
+            s = prob / (1.0 - prob)
+            aa = (n + 1) * s
+            while True:
+                u = self.random()
+                r = r0
+                bnl = 0.0
+                while u > r and bnl <= n:
+                    u -= r
+                    bnl += 1.0
+                    r *= aa / bnl - s
+                if bnl <= n:
                     break
-            bnl = float(j if j <= n else n)
+                if self._instr is not None:
+                    self._instr_licznik[1] += 1
 
         # metoda odrzucania
         else:
-            if n != nold:
-                en = float(n)
-                oldg = self._lngamma(en + 1.0)
-                nold = n
-            if prob != pold:
-                pc = 1.0 - prob
-                plog = math.log(prob)
-                pclog = math.log(pc)
-                pold = prob
-            sq = math.sqrt(2.0 * am * pc)
+            en, oldg, pc, plog, pclog, sq = ust[2:]
+            lf = _LOG_SILNIA or _log_silnia()
+            nlf = len(lf)
             while True:
                 while True:
                     angle = self.PI * self.random()
@@ -356,15 +1938,20 @@ class RNGenerator(random.Random):
                     em = sq * yy + am
                     if 0.0 <= em < (en + 1.0):
                         break
+                    if self._instr is not None:
+                        self._instr_licznik[1] += 1
                 em = math.floor(em)
+                lem = lf[em] if em < nlf else math.lgamma(em + 1.0)
+                lnem = lf[n - em] if n - em < nlf else math.lgamma(n - em + 1.0)
                 t = 1.2 * sq * (1.0 + yy * yy) * math.exp(
-                    oldg - self._lngamma(em + 1.0)
-                    - self._lngamma(en - em + 1.0)
+                    oldg - lem - lnem
                     + em * plog
                     + (en - em) * pclog
                 )
                 if self.random() <= t:
                     break
+                if self._instr is not None:
+                    self._instr_licznik[1] += 1
             bnl = em
 
         if prob != p:
@@ -385,28 +1972,80 @@ class RNGenerator(random.Random):
     # ======================================================================
     # Prawdopodobieństwo p
 
-    def probability(self, p):
+    def probability(self, p, size=None, out=None):
         """
          Metoda generująca wartość pseudolosową jako realizację rozkładu 'prawdopodobieństwo p'.
          @param a Parametr prawdopodobieństwa. Poprawny zakres wartości: liczba rzeczywista z przedziału (0;1).
-         @return Zwraca TRUE lub FALSE.
+         @param size Liczba wartości do wygenerowania wsadowo (opcjonalnie).
+         @param out Bufor do wypełnienia wartościami (opcjonalnie).
+         @return Zwraca TRUE lub FALSE albo bufor wartości 1/0 (typ 'B').
         """
         if (p < 0.0) or (p > 1.0):
             print("RNGenerator.propability: p must be from range (0,1)",
                   file=sys.stderr)
-            return False
-        return p >= self.random()
+            return self._wynik_bledu(False, size, out, 'B')
+        n = self._dlugosc(size, out)
+        if n is None:
+            return p >= self.random()
+        rnd = self.random
+        return self._wypelnij(n, out, 'B', lambda m: [p >= rnd() for _ in range(m)])
 
     # ======================================================================
-    # Prywatna implementacja funckji pomocniczej
+    # Rozkład dyskretny o zadanych wagach
+
+    def discrete(self, weights, size=None, out=None):
+        """
+         Metoda generująca wartość pseudolosową jako realizację rozkładu dyskretnego o zadanych wagach.
+         Korzysta z tablicy aliasów Walkera: jedna liczba jednostajna na wartość, czas O(1) na wartość.
+         Tablica jest zapamiętywana według zawartości wag, więc każde wywołanie kopiuje i haszuje
+         wagi w czasie O(len(weights)); wyjątkiem jest ta sama krotka podana ponownie (rozpoznawana
+         po tożsamości obiektu). Do wielu pojedynczych losowań z tymi samymi wagami służy prepareDiscrete.
+         @param weights Wagi kolejnych wartości 0..len(weights)-1. Poprawny zakres wartości: liczby nieujemne o dodatniej sumie.
+         @param size Liczba wartości do wygenerowania wsadowo (opcjonalnie).
+         @param out Bufor do wypełnienia wartościami (opcjonalnie).
+         @return Zwraca indeks wylosowanej wagi albo bufor takich indeksów.
+        """
+        ostatnie, tablica = self._ostatnie_wagi
+        if weights is not ostatnie:
+            wagi = tuple(weights)
+            try:
+                # wagi sprawdzane są tylko przy budowie tablicy, nie przy trafieniu w pamięć podręczną
+                tablica = self._ustawienia(('discrete', wagi), self._tablica_dyskretna, wagi)
+            except ValueError:
+                print("RNGenerator.discrete: weights must be >=0 with positive sum", file=sys.stderr)
+                return self._wynik_bledu(-1, size, out, 'q')
+            if type(weights) is tuple:
+                # krotka jest niezmienna, więc przy kolejnym wywołaniu wystarczy porównać tożsamość
+                self._ostatnie_wagi = (weights, tablica)
+        n = self._dlugosc(size, out)
+        if n is None:
+            return tablica.losuj(self.random)
+        return self._wypelnij(n, out, 'q', lambda m: tablica.paczka(self.random, m))
 
     @classmethod
-    def _lngamma(cls, xx):
-        x = xx - 1.0
-        tmp = x + 5.5
-        tmp -= (x + 0.5) * math.log(tmp)
-        ser = 1.0
-        for j in range(6):
-            x += 1.0
-            ser += cls.cof[j] / x
-        return -tmp + math.log(2.50662827465 * ser)
+    def _tablica_dyskretna(cls, wagi):
+        if not cls._poprawne_wagi(wagi):
+            raise ValueError('niepoprawne wagi')
+        return TablicaAliasow(wagi)
+
+    @staticmethod
+    def _poprawne_wagi(weights):
+        return len(weights) > 0 and min(weights) >= 0.0 and sum(weights) > 0.0
+
+    # ======================================================================
+    # Prywatna implementacja funckji pomocniczej
+
+    def _odwracanie(self, rozklad, *parametry):
+        """
+         Zwraca parę funkcji (jeden(), paczka(m)) losujących metodą odwracania dystrybuanty:
+         jedna liczba jednostajna na wartość, przekształcana kwantylem z rn_specjalne.
+         Wynik jest monotoniczną funkcją liczby jednostajnej (np. dla wspólnych liczb losowych).
+        """
+        from rn_specjalne import funkcja_rozkladu
+        odwrotna = funkcja_rozkladu(rozklad, 'ppf', *parametry)
+
+        def paczka(m):
+            rnd = self.random
+            return [odwrotna(rnd()) for _ in range(m)]
+
+        return lambda: odwrotna(self.random()), paczka
@@ -0,0 +1,32 @@
+"""Atomowy zapis plikow wspolny dla RNGenerator.saveState, rn_strumien i rn_tablice.
+
+Plik zapisywany jest pod nazwa tymczasowa w tym samym katalogu i podmieniany przez
+os.replace dopiero po udanym zapisie, wiec przerwany zapis nie niszczy poprzedniej wersji.
+"""
+from __future__ import annotations
+import os
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator
+
+
+@contextmanager
+def zapis_atomowy(sciezka: str, fsync: bool = False) -> Iterator[BinaryIO]:
+    """Plik binarny do zapisu, ktory po wyjsciu z bloku with zastepuje plik 'sciezka'.
+
+    fsync=True wymusza zapis danych na dysk przed podmiana. Wyjatek w bloku with (albo
+    przy podmianie) usuwa plik tymczasowy i jest przekazywany dalej.
+    """
+    tymczasowy = f'{sciezka}.{os.getpid()}.tmp'
+    try:
+        with open(tymczasowy, 'wb') as plik:
+            yield plik
+            if fsync:
+                plik.flush()
+                os.fsync(plik.fileno())
+        os.replace(tymczasowy, sciezka)
+    except BaseException:
+        try:
+            os.remove(tymczasowy)
+        except OSError:
+            pass
+        raise
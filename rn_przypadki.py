@@ -0,0 +1,104 @@
+"""Wspolny katalog przypadkow testowych RNGenerator (rn_testy_zgodnosci i rn_benchmark).
+
+Kazdy przypadek to metoda RNGenerator z parametrami, wariantem metoda=, opisem galezi
+algorytmu i momentami teoretycznymi. Katalog obejmuje kazda zaimplementowana metode,
+kazdy wariant algorytmu i parametry z obu stron progow przelaczania algorytmow.
+"""
+from __future__ import annotations
+import math
+from typing import NamedTuple
+
+
+class Przypadek(NamedTuple):
+    """Metoda RNGenerator z parametrami, mierzona galezia algorytmu i momentami teoretycznymi.
+
+    Dystrybuanta (rozklady ciagle) i funkcja prawdopodobienstwa (dyskretne) pochodza z rn_specjalne.
+    """
+    metoda: str
+    parametry: tuple
+    opcje: dict
+    srednia: float | None
+    wariancja: float | None
+    # galaz algorytmu wybierana przez parametry (pusta, gdy algorytm jest jeden)
+    galaz: str = ''
+    # czy skonczony jest czwarty moment (warunek testu wariancji)
+    kurtoza_skonczona: bool = True
+    # rozklady dyskretne: zakres komorek [lo, hi] testu chi-kwadrat (None dla ciaglych)
+    nosnik: tuple[int, int] | None = None
+
+    @property
+    def nazwa(self) -> str:
+        argumenty = ', '.join(repr(p) for p in self.parametry)
+        wariant = ''.join(f' {k}={v}' for k, v in self.opcje.items())
+        return f'{self.metoda}({argumenty}){wariant}'
+
+
+def _warianty(metody: tuple[str, ...], *args, **kwargs) -> list[Przypadek]:
+    return [Przypadek(*args[:2], {'metoda': m}, *args[2:], **kwargs) for m in metody]
+
+
+def _przypadek_dyskretny(wagi: tuple[float, ...]) -> Przypadek:
+    suma = math.fsum(wagi)
+    p = [w / suma for w in wagi]
+    srednia = math.fsum([k * pk for k, pk in enumerate(p)])
+    wariancja = math.fsum([(k - srednia) ** 2 * pk for k, pk in enumerate(p)])
+    return Przypadek('discrete', (wagi,), {}, srednia, wariancja, nosnik=(0, len(wagi) - 1))
+
+
+def _poissona(a: float) -> list[Przypadek]:
+    sd = math.sqrt(a)
+    return _warianty(('klasyczna', 'szybka', 'tablica', 'odwracanie'), 'poisson', (a,), a, a,
+                     galaz='a<12' if a < 12.0 else 'a>=12',
+                     nosnik=(max(0, int(a - 8.0 * sd)), int(a + 8.0 * sd + 8.0)))
+
+
+def _dwumianowe(p: float, n: int) -> list[Przypadek]:
+    # progi jak w RNGenerator._binomial
+    am = n * min(p, 1.0 - p)
+    galaz = 'n<25' if n < 25 else 'mala srednia' if am < 10.0 else 'odrzucanie'
+    return _warianty(('klasyczna', 'szybka', 'tablica', 'odwracanie'), 'binomial', (p, n),
+                     n * p, n * p * (1.0 - p), galaz=galaz, nosnik=(0, n))
+
+
+def _gamma(k: float, b: float) -> list[Przypadek]:
+    galaz = 'k<1' if k < 1.0 else 'k=1' if k == 1.0 else 'k>1'
+    return _warianty(('klasyczna', 'szybka', 'odwracanie'), 'gamma', (k, b), k / b, k / (b * b), galaz=galaz)
+
+
+def _studenta(n: int) -> Przypadek:
+    return Przypadek('student', (n,), {}, 0.0 if n > 1 else None, n / (n - 2.0) if n > 2 else None,
+                     kurtoza_skonczona=n > 4)
+
+
+def _fishera(n: int, m: int) -> Przypadek:
+    srednia = m / (m - 2.0) if m > 2 else None
+    wariancja = 2.0 * m * m * (n + m - 2.0) / (n * (m - 2.0) ** 2 * (m - 4.0)) if m > 4 else None
+    return Przypadek('fdistribution', (n, m), {}, srednia, wariancja, kurtoza_skonczona=m > 8)
+
+
+def _lognormalny(mu: float, s: float) -> Przypadek:
+    return Przypadek('lognormal', (mu, s), {}, math.exp(mu + 0.5 * s * s),
+                     math.expm1(s * s) * math.exp(2.0 * mu + s * s))
+
+
+PRZYPADKI = [
+    Przypadek('uniform', (-1.0, 3.0), {}, 1.0, 16.0 / 12.0),
+    *_warianty(('klasyczna', 'ziggurat'), 'exponential', (2.0,), 0.5, 0.25),
+    *_gamma(0.5, 2.0),
+    *_gamma(1.0, 1.0),
+    *_gamma(3.5, 1.5),
+    Przypadek('normal', (2.5, 1.7), {}, 2.5, 1.7 ** 2),
+    Przypadek('chisquare', (3,), {}, 3.0, 6.0),
+    _studenta(3),
+    _studenta(10),
+    _lognormalny(0.2, 0.5),
+    _fishera(5, 12),
+    *_poissona(4.0),
+    *_poissona(50.0),
+    *_dwumianowe(0.3, 20),
+    *_dwumianowe(0.05, 100),
+    *_dwumianowe(0.4, 200),
+    *_dwumianowe(0.9, 100),
+    Przypadek('probability', (0.3,), {}, 0.3, 0.21, nosnik=(0, 1)),
+    _przypadek_dyskretny((1.0, 2.0, 3.0, 4.0, 0.5)),
+]
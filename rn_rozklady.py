@@ -0,0 +1,268 @@
+"""Niezmienne obiekty rozkladow zwiazane z generatorem RNGenerator.
+
+Parametry sprawdzane sa raz, w konstruktorze (ValueError zamiast komunikatu na stderr
+i wartosci -1 przy kazdym losowaniu), a stale algorytmow wyliczane sa od razu. Obiekty
+udostepniaja sample(), sample_n(n) i fill(buffer); ciagi wartosci sa takie same jak
+z odpowiednich metod RNGenerator dla tego samego stanu generatora.
+"""
+from __future__ import annotations
+import math
+from rn_generator_20251120 import RNGenerator, TablicaAliasow
+
+
+class Rozklad:
+    """
+    Klasa Rozklad.
+    Wspólna część obiektów rozkładów. Atrybut sample to funkcja losująca przygotowana
+    w konstruktorze (zapisana w slocie, więc jej wywołanie nie przechodzi przez metodę),
+    a paczka(m) służy do generowania wsadowego. Obiekty są niezmienne.
+    Obiekt nie kopiuje stanu generatora gen - losowanie z obiektu przesuwa stan gen.
+    Uniform, Probability, Discrete i klasyczny Exponential wiążą gen.random w konstruktorze,
+    więc zmiany wprowadzone później (np. enableInstrumentation) ich nie obejmują; pozostałe
+    rozkłady wywołują algorytmy generatora, które odczytują gen.random przy każdym losowaniu.
+    """
+
+    __slots__ = ('gen', 'sample', '_paczka')
+    # kod typu array.array wyników wsadowych
+    typ = 'd'
+    # nazwy parametrów pokazywane przez repr
+    _pola = ()
+
+    def __init__(self, gen, jeden, paczka):
+        _ustaw = object.__setattr__
+        _ustaw(self, 'gen', gen)
+        _ustaw(self, 'sample', jeden)
+        _ustaw(self, '_paczka', paczka)
+
+    def sample_n(self, n):
+        """
+         Losuje n wartości.
+         @return Zwraca array.array z n wartościami.
+        """
+        if n < 0:
+            raise ValueError('n musi być nieujemne')
+        return RNGenerator._wypelnij(n, None, self.typ, self._paczka)
+
+    def fill(self, buffer):
+        """
+         Wypełnia bufor (array.array, memoryview, lista, tablica NumPy) kolejnymi wartościami.
+         @return Zwraca buffer.
+        """
+        return RNGenerator._wypelnij(len(buffer), buffer, self.typ, self._paczka)
+
+    def __setattr__(self, nazwa, wartosc):
+        raise AttributeError(f'{type(self).__name__} jest niezmienny')
+
+    def __delattr__(self, nazwa):
+        raise AttributeError(f'{type(self).__name__} jest niezmienny')
+
+    def __repr__(self):
+        pola = ', '.join(f'{p}={getattr(self, p)!r}' for p in self._pola)
+        return f'{type(self).__name__}({pola})'
+
+
+def _generator(gen):
+    return RNGenerator() if gen is None else gen
+
+
+class Uniform(Rozklad):
+    """
+    Rozkład jednostajny na przedziale [a, b).
+    """
+
+    __slots__ = ('a', 'b')
+    _pola = ('a', 'b')
+
+    def __init__(self, a, b, gen=None):
+        """
+         @param a, b Krańce przedziału, a < b.
+         @param gen Generator (RNGenerator); domyślnie nowy, z ziarnem z systemowego źródła entropii.
+        """
+        if not a < b:
+            raise ValueError('Uniform: wymagane a < b')
+        gen = _generator(gen)
+        rnd = gen.random
+        d = b - a
+        object.__setattr__(self, 'a', a)
+        object.__setattr__(self, 'b', b)
+        super().__init__(gen, lambda: rnd() * d + a, lambda m: [rnd() * d + a for _ in range(m)])
+
+
+class Exponential(Rozklad):
+    """
+    Rozkład wykładniczy o parametrze lam.
+    """
+
+    __slots__ = ('lam', 'metoda')
+    _pola = ('lam', 'metoda')
+
+    def __init__(self, lam, gen=None, metoda='klasyczna'):
+        """
+         @param lam Parametr rozkładu, lam > 0.
+         @param metoda 'klasyczna' (odwracanie dystrybuanty) albo 'ziggurat'.
+        """
+        RNGenerator._sprawdz_metode(metoda, ('klasyczna', 'ziggurat'))
+        if not lam > 0.0:
+            raise ValueError('Exponential: wymagane lam > 0')
+        gen = _generator(gen)
+        c = 1.0 / lam
+        if metoda == 'ziggurat':
+            wykladnicze = gen._wykladnicze_paczka
+            wykladnicza = gen._wykladnicza
+            paczka = lambda m: wykladnicze(m, c)
+            jeden = lambda: c * wykladnicza()
+        else:
+            rnd = gen.random
+            log = math.log
+            jeden = lambda: c * (-log(1.0 - rnd()))
+            paczka = lambda m: [c * (-log(1.0 - rnd())) for _ in range(m)]
+        object.__setattr__(self, 'lam', lam)
+        object.__setattr__(self, 'metoda', metoda)
+        super().__init__(gen, jeden, paczka)
+
+
+class Gamma(Rozklad):
+    """
+    Rozkład gamma o kształcie k i parametrze tempa b.
+    """
+
+    __slots__ = ('k', 'b', 'metoda')
+    _pola = ('k', 'b', 'metoda')
+
+    def __init__(self, k, b, gen=None, metoda='klasyczna'):
+        """
+         @param k Parametr kształtu, k > 0.
+         @param b Parametr tempa, b > 0.
+         @param metoda 'klasyczna', 'szybka' (Marsaglia-Tsang) albo 'odwracanie'.
+        """
+        RNGenerator._sprawdz_metode(metoda, ('klasyczna', 'szybka', 'odwracanie'))
+        if not (k > 0.0 and b > 0.0):
+            raise ValueError('Gamma: wymagane k > 0 i b > 0')
+        gen = _generator(gen)
+        if metoda == 'klasyczna':
+            algorytm = gen._gamma
+            jeden = lambda: algorytm(k, b)
+            paczka = lambda m: [algorytm(k, b) for _ in range(m)]
+        else:
+            jeden, paczka = gen._gamma_szybka(k, b) if metoda == 'szybka' else gen._odwracanie('gamma', k, b)
+        object.__setattr__(self, 'k', k)
+        object.__setattr__(self, 'b', b)
+        object.__setattr__(self, 'metoda', metoda)
+        super().__init__(gen, jeden, paczka)
+
+
+class Normal(Rozklad):
+    """
+    Rozkład normalny N(a, b^2) (ziggurat).
+    """
+
+    __slots__ = ('a', 'b')
+    _pola = ('a', 'b')
+
+    def __init__(self, a, b, gen=None):
+        """
+         @param a Średnia.
+         @param b Odchylenie standardowe, b > 0.
+        """
+        if not b > 0.0:
+            raise ValueError('Normal: wymagane b > 0')
+        gen = _generator(gen)
+        normalna = gen._normalna
+        normalne = gen._normalne_paczka
+        object.__setattr__(self, 'a', a)
+        object.__setattr__(self, 'b', b)
+        super().__init__(gen, lambda: a + b * normalna(), lambda m: [a + b * z for z in normalne(m)])
+
+
+class Poisson(Rozklad):
+    """
+    Rozkład Poissona o średniej a.
+    """
+
+    __slots__ = ('a', 'metoda')
+    _pola = ('a', 'metoda')
+    typ = 'q'
+
+    def __init__(self, a, gen=None, metoda='klasyczna'):
+        """
+         @param a Średnia, a > 0.
+         @param metoda 'klasyczna', 'szybka' (PTRS dla a >= 10), 'tablica' albo 'odwracanie'.
+        """
+        if not a > 0.0:
+            raise ValueError('Poisson: wymagane a > 0')
+        gen = _generator(gen)
+        jeden, paczka = gen._przygotuj_poissona(a, metoda)
+        object.__setattr__(self, 'a', a)
+        object.__setattr__(self, 'metoda', metoda)
+        super().__init__(gen, jeden, paczka)
+
+
+class Binomial(Rozklad):
+    """
+    Rozkład dwumianowy: liczba sukcesów w n próbach o prawdopodobieństwie p.
+    """
+
+    __slots__ = ('p', 'n', 'metoda')
+    _pola = ('p', 'n', 'metoda')
+    typ = 'q'
+
+    def __init__(self, p, n, gen=None, metoda='klasyczna'):
+        """
+         @param p Prawdopodobieństwo sukcesu, 0 < p < 1.
+         @param n Liczba prób, liczba całkowita nieujemna.
+         @param metoda 'klasyczna', 'szybka' (BTRS dla n*min(p,1-p) >= 10), 'tablica' albo 'odwracanie'.
+        """
+        if not 0.0 < p < 1.0:
+            raise ValueError('Binomial: wymagane 0 < p < 1')
+        if isinstance(n, bool) or not isinstance(n, int) or n < 0:
+            raise ValueError('Binomial: n musi być liczbą całkowitą nieujemną')
+        gen = _generator(gen)
+        jeden, paczka = gen._przygotuj_dwumianowy(p, n, metoda)
+        object.__setattr__(self, 'p', p)
+        object.__setattr__(self, 'n', n)
+        object.__setattr__(self, 'metoda', metoda)
+        super().__init__(gen, jeden, paczka)
+
+
+class Probability(Rozklad):
+    """
+    Zdarzenie o prawdopodobieństwie p (wartości True/False, wsadowo 1/0 typu 'B').
+    """
+
+    __slots__ = ('p',)
+    _pola = ('p',)
+    typ = 'B'
+
+    def __init__(self, p, gen=None):
+        """
+         @param p Prawdopodobieństwo, 0 <= p <= 1.
+        """
+        if not 0.0 <= p <= 1.0:
+            raise ValueError('Probability: wymagane 0 <= p <= 1')
+        gen = _generator(gen)
+        rnd = gen.random
+        object.__setattr__(self, 'p', p)
+        super().__init__(gen, lambda: p >= rnd(), lambda m: [p >= rnd() for _ in range(m)])
+
+
+class Discrete(Rozklad):
+    """
+    Rozkład dyskretny na {0, ..., len(weights)-1} o zadanych wagach (tablica aliasów).
+    """
+
+    __slots__ = ('weights',)
+    _pola = ('weights',)
+    typ = 'q'
+
+    def __init__(self, weights, gen=None):
+        """
+         @param weights Nieujemne wagi o dodatniej sumie.
+        """
+        wagi = tuple(weights)
+        if not RNGenerator._poprawne_wagi(wagi):
+            raise ValueError('Discrete: wagi muszą być nieujemne, o dodatniej sumie')
+        gen = _generator(gen)
+        tablica = TablicaAliasow(wagi)
+        rnd = gen.random
+        object.__setattr__(self, 'weights', wagi)
+        super().__init__(gen, lambda: tablica.losuj(rnd), lambda m: tablica.paczka(rnd, m))
@@ -0,0 +1,559 @@
+"""Funkcje specjalne oraz gestosc, dystrybuanta i kwantyle rozkladow RNGenerator.
+
+Parametry rozkladow sa takie same jak w metodach RNGenerator (np. gamma(k, b) z b jako
+parametrem tempa, binomial(p, n)). Funkcje przyjmuja pojedyncza wartosc albo ciag
+wartosci (lista, array.array, ...) i wtedy zwracaja liste wynikow.
+"""
+from __future__ import annotations
+import bisect
+import functools
+import math
+from collections.abc import Callable
+
+# Liczba wartosci ln(k!) trzymanych w tablicy
+ROZMIAR_TABLICY_SILNI = 4096
+
+# ln(k!) dla k = 0 .. ROZMIAR_TABLICY_SILNI-1
+LOG_SILNIA = list(map(math.lgamma, range(1, ROZMIAR_TABLICY_SILNI + 1)))
+
+_TINY = 1e-300
+_EPS = 1e-16
+_MAX_ITERACJI = 10000
+
+
+def _wektorowo(f: Callable) -> Callable:
+    """Rozszerza funkcje skalarna f(x, *args) na ciagi wartosci x."""
+    @functools.wraps(f)
+    def wywolaj(x, *args):
+        if isinstance(x, (int, float)):
+            return f(x, *args)
+        return [f(v, *args) for v in x]
+    return wywolaj
+
+
+# ======================================================================
+# Funkcje specjalne
+
+@_wektorowo
+def lgamma(x: float) -> float:
+    """Logarytm funkcji gamma ln|Gamma(x)|."""
+    return math.lgamma(x)
+
+
+@_wektorowo
+def log_silnia(k: int) -> float:
+    """ln(k!) dla calkowitego k >= 0 (z tablicy dla malych k)."""
+    return LOG_SILNIA[k] if k < ROZMIAR_TABLICY_SILNI else math.lgamma(k + 1.0)
+
+
+def _gamma_pq(a: float, x: float) -> tuple[float, float]:
+    """Regularyzowane niepelne funkcje gamma (P(a, x), Q(a, x)): szereg albo ulamek lancuchowy."""
+    if x <= 0.0:
+        return 0.0, 1.0
+    if math.isinf(x):
+        return 1.0, 0.0
+    ln_przod = a * math.log(x) - x - math.lgamma(a)
+    if x < a + 1.0:
+        ap, suma = a, 1.0 / a
+        wyraz = suma
+        for _ in range(_MAX_ITERACJI):
+            ap += 1.0
+            wyraz *= x / ap
+            suma += wyraz
+            if abs(wyraz) < abs(suma) * _EPS:
+                break
+        p = suma * math.exp(ln_przod)
+        return p, 1.0 - p
+    # ulamek lancuchowy (zmodyfikowana metoda Lentza)
+    b = x + 1.0 - a
+    c = 1.0 / _TINY
+    d = 1.0 / b
+    h = d
+    for i in range(1, _MAX_ITERACJI):
+        an = -i * (i - a)
+        b += 2.0
+        d = an * d + b
+        d = _TINY if abs(d) < _TINY else d
+        c = b + an / c
+        c = _TINY if abs(c) < _TINY else c
+        d = 1.0 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1.0) < _EPS:
+            break
+    q = math.exp(ln_przod) * h
+    return 1.0 - q, q
+
+
+@_wektorowo
+def gamma_p(x: float, a: float) -> float:
+    """Regularyzowana dolna niepelna funkcja gamma P(a, x)."""
+    return _gamma_pq(a, x)[0]
+
+
+@_wektorowo
+def gamma_q(x: float, a: float) -> float:
+    """Regularyzowana gorna niepelna funkcja gamma Q(a, x) = 1 - P(a, x)."""
+    return _gamma_pq(a, x)[1]
+
+
+def _beta_cf(a: float, b: float, x: float) -> float:
+    """Ulamek lancuchowy regularyzowanej niepelnej funkcji beta (metoda Lentza)."""
+    qab, qap, qam = a + b, a + 1.0, a - 1.0
+    c = 1.0
+    d = 1.0 - qab * x / qap
+    d = _TINY if abs(d) < _TINY else d
+    d = 1.0 / d
+    h = d
+    for m in range(1, _MAX_ITERACJI):
+        m2 = 2 * m
+        aa = m * (b - m) * x / ((qam + m2) * (a + m2))
+        d = 1.0 + aa * d
+        d = _TINY if abs(d) < _TINY else d
+        c = 1.0 + aa / c
+        c = _TINY if abs(c) < _TINY else c
+        d = 1.0 / d
+        h *= d * c
+        aa = -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))
+        d = 1.0 + aa * d
+        d = _TINY if abs(d) < _TINY else d
+        c = 1.0 + aa / c
+        c = _TINY if abs(c) < _TINY else c
+        d = 1.0 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1.0) < _EPS:
+            break
+    return h
+
+
+def _beta_i(a: float, b: float, x: float) -> float:
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    ln_przod = (math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b)
+                + a * math.log(x) + b * math.log1p(-x))
+    if x < (a + 1.0) / (a + b + 2.0):
+        return math.exp(ln_przod) * _beta_cf(a, b, x) / a
+    return 1.0 - math.exp(ln_przod) * _beta_cf(b, a, 1.0 - x) / b
+
+
+@_wektorowo
+def beta_i(x: float, a: float, b: float) -> float:
+    """Regularyzowana niepelna funkcja beta I_x(a, b)."""
+    return _beta_i(a, b, x)
+
+
+# Wspolczynniki przyblizenia odwrotnosci dystrybuanty N(0, 1) (P. J. Acklam)
+_ACKLAM_A = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+             1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+_ACKLAM_B = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+             6.680131188771972e+01, -1.328068155288572e+01)
+_ACKLAM_C = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+             -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+_ACKLAM_D = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00,
+             3.754408661907416e+00)
+_SQRT2 = math.sqrt(2.0)
+_SQRT2PI = math.sqrt(2.0 * math.pi)
+
+
+def _ndtri(q: float) -> float:
+    """Kwantyl rozkladu N(0, 1): przyblizenie Acklama poprawione krokiem Halleya."""
+    if q <= 0.0:
+        return -math.inf
+    if q >= 1.0:
+        return math.inf
+    a, b, c, d = _ACKLAM_A, _ACKLAM_B, _ACKLAM_C, _ACKLAM_D
+    if q < 0.02425 or q > 0.97575:
+        t = math.sqrt(-2.0 * math.log(q if q < 0.5 else 1.0 - q))
+        x = ((((((c[0] * t + c[1]) * t + c[2]) * t + c[3]) * t + c[4]) * t + c[5])
+             / ((((d[0] * t + d[1]) * t + d[2]) * t + d[3]) * t + 1.0))
+        x = x if q < 0.5 else -x
+    else:
+        t = q - 0.5
+        r = t * t
+        x = ((((((a[0] * r + a[1]) * r + a[2]) * r + a[3]) * r + a[4]) * r + a[5]) * t
+             / (((((b[0] * r + b[1]) * r + b[2]) * r + b[3]) * r + b[4]) * r + 1.0))
+    if abs(x) > 37.0:
+        # q ponizej ~1e-300: exp(x*x/2) przekroczylby zakres, a przyblizenie wystarcza
+        return x
+    e = 0.5 * math.erfc(-x / _SQRT2) - q
+    u = e * _SQRT2PI * math.exp(0.5 * x * x)
+    return x - u / (1.0 + 0.5 * x * u)
+
+
+def _odwroc(cdf: Callable[[float], float], pdf: Callable[[float], float], q: float,
+            x: float, lo: float, hi: float = math.inf) -> float:
+    """Rozwiaz cdf(x) = q metoda Newtona zabezpieczona bisekcja na przedziale [lo, hi]."""
+    for _ in range(200):
+        f = cdf(x) - q
+        if f < 0.0:
+            lo = x
+        else:
+            hi = x
+        d = pdf(x)
+        nowy = x - f / d if d > 0.0 else math.nan
+        if not lo < nowy < hi:
+            nowy = 0.5 * (lo + hi) if hi < math.inf else max(2.0 * x, x + 1.0)
+        if abs(nowy - x) <= 4.0 * _EPS * abs(nowy) or (hi < math.inf and hi - lo <= 4.0 * _EPS * hi):
+            return nowy
+        x = nowy
+    return x
+
+
+# ======================================================================
+# Rozklady ciagle (skalarnie)
+
+def _uniform_pdf(x, a, b):
+    return 1.0 / (b - a) if a <= x <= b else 0.0
+
+
+def _uniform_cdf(x, a, b):
+    return min(1.0, max(0.0, (x - a) / (b - a)))
+
+
+def _uniform_ppf(q, a, b):
+    return a + q * (b - a)
+
+
+def _exponential_pdf(x, lam):
+    return lam * math.exp(-lam * x) if x >= 0.0 else 0.0
+
+
+def _exponential_cdf(x, lam):
+    return -math.expm1(-lam * x) if x > 0.0 else 0.0
+
+
+def _exponential_ppf(q, lam):
+    return -math.log1p(-q) / lam if q < 1.0 else math.inf
+
+
+def _gamma_pdf(x, k, b):
+    if x < 0.0:
+        return 0.0
+    if x == 0.0:
+        return math.inf if k < 1.0 else (b if k == 1.0 else 0.0)
+    return math.exp(k * math.log(b) + (k - 1.0) * math.log(x) - b * x - math.lgamma(k))
+
+
+def _gamma_cdf(x, k, b):
+    return _gamma_pq(k, b * x)[0]
+
+
+def _gamma_ppf(q, k, b):
+    if q <= 0.0:
+        return 0.0
+    if q >= 1.0:
+        return math.inf
+    # punkt startowy: przyblizenie Wilsona-Hilferty'ego, dla malych wartosci szereg P(k, x) ~ x^k / Gamma(k+1)
+    c = 1.0 / (9.0 * k)
+    x = k * (1.0 - c + _ndtri(q) * math.sqrt(c)) ** 3
+    if x <= 0.0 or k < 1.0:
+        x = math.exp((math.log(q) + math.lgamma(k + 1.0)) / k)
+    return _odwroc(lambda y: _gamma_pq(k, y)[0], lambda y: _gamma_pdf(y, k, 1.0), q, x, 0.0) / b
+
+
+def _normal_pdf(x, a, b):
+    z = (x - a) / b
+    return math.exp(-0.5 * z * z) / (abs(b) * _SQRT2PI)
+
+
+def _normal_cdf(x, a, b):
+    return 0.5 * math.erfc(-(x - a) / (abs(b) * _SQRT2))
+
+
+def _normal_ppf(q, a, b):
+    return a + abs(b) * _ndtri(q)
+
+
+def _chisquare_pdf(x, k):
+    return _gamma_pdf(x, 0.5 * k, 0.5)
+
+
+def _chisquare_cdf(x, k):
+    return _gamma_cdf(x, 0.5 * k, 0.5)
+
+
+def _chisquare_ppf(q, k):
+    return _gamma_ppf(q, 0.5 * k, 0.5)
+
+
+def _student_pdf(t, n):
+    return math.exp(math.lgamma(0.5 * (n + 1.0)) - math.lgamma(0.5 * n) - 0.5 * math.log(n * math.pi)
+                    - 0.5 * (n + 1.0) * math.log1p(t * t / n))
+
+
+def _student_cdf(t, n):
+    ogon = _student_ogon(abs(t), n)
+    return 1.0 - ogon if t > 0.0 else ogon
+
+
+def _student_ogon(t, n):
+    """P(T > t) dla t >= 0, bez odejmowania od 1 (dokladne w ogonie)."""
+    if t < 1e150:
+        return 0.5 * _beta_i(0.5 * n, 0.5, n / (n + t * t))
+    # x = n/t^2 < 1e-299 (t*t wyszedlby poza zakres): I_x(a, b) = x^a / (a B(a, b)) z dokladnoscia do O(x)
+    a = 0.5 * n
+    ln_x = math.log(n) - 2.0 * math.log(t)
+    return 0.5 * math.exp(a * ln_x + math.lgamma(a + 0.5) - math.lgamma(a) - math.lgamma(0.5) - math.log(a))
+
+
+def _student_ppf_ogon(q, n):
+    """t > 0, dla ktorego P(T > t) = q (q < 0.25).
+
+    Rownanie ln P(T > t) = ln q rozwiazywane jest wzgledem ln t (w ogonie zaleznosc jest
+    prawie liniowa), na przedziale od kwantyla normalnego do t0 z oszacowania
+    P(T > t) <= C t^-n, wiec trafia tez w skrajne ogony (np. q = 1e-100).
+    """
+    ln_c = (math.lgamma(0.5 * (n + 1.0)) - math.lgamma(0.5 * n) - 0.5 * math.log(n * math.pi)
+            + 0.5 * (n - 1.0) * math.log(n))
+    lo = math.log(-_ndtri(q))
+    hi = max(lo, (ln_c - math.log(q)) / n)
+    if hi > 709.0:
+        # dla n < 1 i skrajnych q kwantyl moze przekraczac zakres float
+        hi = 709.0
+        if _student_ogon(math.exp(hi), n) > q:
+            return math.inf
+
+    def ln_ogon(v):
+        return -math.log(max(_student_ogon(math.exp(v), n), 5e-324))
+
+    def pochodna(v):
+        t = math.exp(v)
+        return _student_pdf(t, n) * t / max(_student_ogon(t, n), 5e-324)
+
+    return math.exp(_odwroc(ln_ogon, pochodna, -math.log(q), hi, lo, hi))
+
+
+def _student_ppf(q, n):
+    if q <= 0.0:
+        return -math.inf
+    if q >= 1.0:
+        return math.inf
+    # ogony liczone bezposrednio z P(T > t) (1 - q jest dokladne dla q >= 0.5)
+    if q < 0.25:
+        return -_student_ppf_ogon(q, n)
+    if q > 0.75:
+        return _student_ppf_ogon(1.0 - q, n)
+    if q < 0.5:
+        return -_student_ppf(1.0 - q, n)
+    if q == 0.5:
+        return 0.0
+    return _odwroc(lambda t: _student_cdf(t, n), lambda t: _student_pdf(t, n), q, _ndtri(q), 0.0)
+
+
+def _lognormal_pdf(x, mu, s):
+    if x <= 0.0:
+        return 0.0
+    z = (math.log(x) - mu) / s
+    return math.exp(-0.5 * z * z) / (x * s * _SQRT2PI)
+
+
+def _lognormal_cdf(x, mu, s):
+    return _normal_cdf(math.log(x), mu, s) if x > 0.0 else 0.0
+
+
+def _lognormal_ppf(q, mu, s):
+    return math.exp(mu + s * _ndtri(q)) if q > 0.0 else 0.0
+
+
+def _fdistribution_pdf(x, n, m):
+    if x <= 0.0:
+        return 0.0
+    ln_beta = math.lgamma(0.5 * n) + math.lgamma(0.5 * m) - math.lgamma(0.5 * (n + m))
+    return math.exp(0.5 * n * math.log(n / m) + (0.5 * n - 1.0) * math.log(x)
+                    - 0.5 * (n + m) * math.log1p(n * x / m) - ln_beta)
+
+
+def _fdistribution_cdf(x, n, m):
+    return _beta_i(0.5 * n, 0.5 * m, n * x / (n * x + m)) if x > 0.0 else 0.0
+
+
+def _fdistribution_ppf(q, n, m):
+    if q <= 0.0:
+        return 0.0
+    if q >= 1.0:
+        return math.inf
+    return _odwroc(lambda x: _fdistribution_cdf(x, n, m), lambda x: _fdistribution_pdf(x, n, m), q, 1.0, 0.0)
+
+
+# ======================================================================
+# Rozklady dyskretne (skalarnie); kwantyle z tablicy dystrybuanty
+
+def _poisson_pmf(k, a):
+    if k < 0 or k != int(k):
+        return 0.0
+    return math.exp(k * math.log(a) - a - log_silnia(int(k)))
+
+
+def _poisson_cdf(k, a):
+    return _gamma_pq(math.floor(k) + 1.0, a)[1] if k >= 0 else 0.0
+
+
+def _binomial_pmf(k, p, n):
+    if k < 0 or k > n or k != int(k):
+        return 0.0
+    k = int(k)
+    return math.exp(log_silnia(n) - log_silnia(k) - log_silnia(n - k)
+                    + k * math.log(p) + (n - k) * math.log1p(-p))
+
+
+def _binomial_cdf(k, p, n):
+    if k < 0:
+        return 0.0
+    if k >= n:
+        return 1.0
+    k = math.floor(k)
+    return _beta_i(n - k, k + 1.0, 1.0 - p)
+
+
+def _probability_pmf(k, p):
+    return 1.0 - p if k == 0 else (p if k == 1 else 0.0)
+
+
+def _probability_cdf(k, p):
+    return 0.0 if k < 0 else (1.0 - p if k < 1 else 1.0)
+
+
+def _probability_ppf(q, p):
+    return 0 if q <= 1.0 - p else 1
+
+
+def _discrete_pmf(k, weights):
+    if k < 0 or k >= len(weights) or k != int(k):
+        return 0.0
+    return weights[int(k)] / math.fsum(weights)
+
+
+def _discrete_cdf(k, weights):
+    if k < 0:
+        return 0.0
+    return math.fsum(weights[:math.floor(k) + 1]) / math.fsum(weights)
+
+
+@functools.lru_cache(maxsize=128)
+def _tablica_dystrybuanty(rozklad: str, parametry: tuple) -> tuple[int, list[float]]:
+    """Dystrybuanta rozkladu dyskretnego w wezlach lo..hi (srednia +- (10 odchylen + 10))."""
+    if rozklad == 'discrete':
+        wagi = parametry[0]
+        suma = math.fsum(wagi)
+        skum, wynik = 0.0, []
+        for w in wagi:
+            skum += w
+            wynik.append(skum / suma)
+        wynik[-1] = 1.0
+        return 0, wynik
+    if rozklad == 'poisson':
+        a, = parametry
+        srednia, sd, gorny = a, math.sqrt(a), math.inf
+    else:
+        p, n = parametry
+        srednia, sd, gorny = n * p, math.sqrt(n * p * (1.0 - p)), n
+    lo = max(0, int(srednia - 10.0 * sd - 10.0))
+    hi = int(min(gorny, srednia + 10.0 * sd + 10.0))
+    pmf, cdf = _DYSKRETNE[rozklad][0], _DYSKRETNE[rozklad][1]
+    f = cdf(lo - 1, *parametry)
+    wynik = []
+    for k in range(lo, hi + 1):
+        f += pmf(k, *parametry)
+        wynik.append(f)
+    if hi == gorny:
+        wynik[-1] = 1.0
+    return lo, wynik
+
+
+def _dyskretny_ppf(rozklad: str, q: float, parametry: tuple) -> int:
+    """Najmniejsze k, dla ktorego dystrybuanta F(k) >= q."""
+    lo, tablica = _tablica_dystrybuanty(rozklad, parametry)
+    i = bisect.bisect_left(tablica, q)
+    if i < len(tablica):
+        return lo + i
+    # poza tablica (prawdopodobienstwo rzedu 1e-20): przeszukiwanie sekwencyjne
+    pmf = _DYSKRETNE[rozklad][0]
+    k, f = lo + len(tablica) - 1, tablica[-1]
+    while f < q:
+        k += 1
+        krok = pmf(k, *parametry)
+        if krok == 0.0:
+            break
+        f += krok
+    return k
+
+
+def _poisson_ppf(q, a):
+    return _dyskretny_ppf('poisson', q, (a,))
+
+
+def _binomial_ppf(q, p, n):
+    return _dyskretny_ppf('binomial', q, (p, n))
+
+
+def _discrete_ppf(q, weights):
+    return _dyskretny_ppf('discrete', q, (tuple(weights),))
+
+
+_CIAGLE = {
+    'uniform': (_uniform_pdf, _uniform_cdf, _uniform_ppf),
+    'exponential': (_exponential_pdf, _exponential_cdf, _exponential_ppf),
+    'gamma': (_gamma_pdf, _gamma_cdf, _gamma_ppf),
+    'normal': (_normal_pdf, _normal_cdf, _normal_ppf),
+    'chisquare': (_chisquare_pdf, _chisquare_cdf, _chisquare_ppf),
+    'student': (_student_pdf, _student_cdf, _student_ppf),
+    'lognormal': (_lognormal_pdf, _lognormal_cdf, _lognormal_ppf),
+    'fdistribution': (_fdistribution_pdf, _fdistribution_cdf, _fdistribution_ppf),
+}
+_DYSKRETNE = {
+    'poisson': (_poisson_pmf, _poisson_cdf, _poisson_ppf),
+    'binomial': (_binomial_pmf, _binomial_cdf, _binomial_ppf),
+    'probability': (_probability_pmf, _probability_cdf, _probability_ppf),
+    'discrete': (_discrete_pmf, _discrete_cdf, _discrete_ppf),
+}
+# Nazwy rozkladow (jak metody RNGenerator) obslugiwanych przez pdf/pmf/cdf/ppf
+ROZKLADY = (*_CIAGLE, *_DYSKRETNE)
+_RODZAJE = ('pdf', 'cdf', 'ppf')
+
+
+def funkcja_rozkladu(rozklad: str, rodzaj: str, *parametry) -> Callable[[float], float]:
+    """Skalarna funkcja rodzaj ('pdf', 'pmf', 'cdf' albo 'ppf') rozkladu z ustalonymi parametrami.
+
+    Przeznaczona do petli po wielu wartosciach (np. w generatorach i testach zgodnosci).
+    """
+    funkcje = _CIAGLE.get(rozklad) or _DYSKRETNE.get(rozklad)
+    if funkcje is None:
+        raise ValueError(f"nieznany rozklad '{rozklad}', dostepne: {ROZKLADY}")
+    if rodzaj == 'pmf':
+        rodzaj = 'pdf'
+    if rodzaj not in _RODZAJE:
+        raise ValueError(f"nieznana funkcja '{rodzaj}', dostepne: pdf, pmf, cdf, ppf")
+    if rozklad == 'discrete':
+        parametry = (tuple(parametry[0]),)
+    f = funkcje[_RODZAJE.index(rodzaj)]
+    return lambda x: f(x, *parametry)
+
+
+def _wartosci(rozklad: str, rodzaj: str, x, parametry: tuple):
+    f = funkcja_rozkladu(rozklad, rodzaj, *parametry)
+    if isinstance(x, (int, float)):
+        return f(x)
+    return [f(v) for v in x]
+
+
+def pdf(rozklad: str, x, *parametry):
+    """Gestosc (dla rozkladow dyskretnych: funkcja prawdopodobienstwa) w punkcie x lub punktach ciagu x."""
+    return _wartosci(rozklad, 'pdf', x, parametry)
+
+
+def pmf(rozklad: str, k, *parametry):
+    """Funkcja prawdopodobienstwa rozkladu dyskretnego (to samo co pdf)."""
+    return _wartosci(rozklad, 'pdf', k, parametry)
+
+
+def cdf(rozklad: str, x, *parametry):
+    """Dystrybuanta w punkcie x lub punktach ciagu x."""
+    return _wartosci(rozklad, 'cdf', x, parametry)
+
+
+def ppf(rozklad: str, q, *parametry):
+    """Kwantyl rzedu q (dla rozkladow dyskretnych najmniejsze k, dla ktorego F(k) >= q)."""
+    return _wartosci(rozklad, 'ppf', q, parametry)
@@ -0,0 +1,219 @@
+"""Zapis strumieni wartosci losowych RNGenerator do plikow binarnych i ich odczyt przez mmap.
+
+Plik sklada sie z naglowka stalej dlugosci, metadanych JSON (rozklad, parametry, opcje,
+ziarno, zrodlo bitow), zapisu stanu generatora z chwili rozpoczecia (RNGenerator.stateBytes)
+i surowych wartosci (float64 'd', int64 'q' albo bajty 'B') od przesuniecia wyrownanego
+do 64 bajtow. Zapis odbywa sie paczkami, w stalej pamieci; odczyt odwzorowuje plik w pamieci
+i udostepnia wartosci jako memoryview bez kopiowania (np. numpy.frombuffer(s.wartosci)).
+"""
+from __future__ import annotations
+import argparse
+import json
+import mmap
+import struct
+import sys
+from typing import Iterator
+import rn_rozklady
+from rn_generator_20251120 import RNGenerator, ROZMIAR_PACZKI
+from rn_pliki import zapis_atomowy
+
+STRUMIEN_SYGNATURA = b'RNGSTRM\0'
+STRUMIEN_WERSJA = 1
+# sygnatura, wersja, kod typu array, kolejnosc bajtow, liczba wartosci,
+# przesuniecie wartosci, dlugosc metadanych, dlugosc zapisu stanu
+_NAGLOWEK = struct.Struct('<8sHcc4xQQQQ')
+# wyrownanie poczatku wartosci w pliku
+WYROWNANIE = 64
+
+# Metody RNGenerator z parametrem size=, ktore mozna zapisac do strumienia
+ROZKLADY = ('uniform', 'exponential', 'gamma', 'normal', 'chisquare', 'student', 'lognormal',
+            'fdistribution', 'poisson', 'binomial', 'probability', 'discrete')
+_KOLEJNOSC = {'little': b'<', 'big': b'>'}
+# Klasy rn_rozklady, ktorych konstruktory sprawdzaja parametry rozkladow
+_KLASY = {'uniform': rn_rozklady.Uniform, 'exponential': rn_rozklady.Exponential,
+          'gamma': rn_rozklady.Gamma, 'normal': rn_rozklady.Normal, 'poisson': rn_rozklady.Poisson,
+          'binomial': rn_rozklady.Binomial, 'probability': rn_rozklady.Probability,
+          'discrete': rn_rozklady.Discrete}
+# Warunki dla rozkladow bez klasy w rn_rozklady
+_WARUNKI = {
+    'chisquare': (lambda k: k > 0, 'k > 0'),
+    'student': (lambda n: n > 0, 'n > 0'),
+    'lognormal': (lambda average, std_dev: std_dev > 0.0, 'std_dev > 0'),
+    'fdistribution': (lambda n, m: n > 0 and m > 0, 'n > 0 i m > 0'),
+}
+
+
+def _wyrownaj(n: int, do: int) -> int:
+    return n + (-n % do)
+
+
+def sprawdz_parametry(gen: RNGenerator, rozklad: str, parametry: tuple, opcje: dict) -> None:
+    """Zglos ValueError, gdy parametry sa niepoprawne dla rozkladu.
+
+    RNGenerator zglasza bledne parametry na stderr i zwraca wartosci bledu, wiec bez
+    tego sprawdzenia plik zostalby wypelniony nimi. Obiekt rn_rozklady wiazany jest z gen,
+    ale nic nie losuje, wiec stan gen sie nie zmienia.
+    """
+    if rozklad not in ROZKLADY:
+        raise ValueError(f"nieznany rozklad '{rozklad}', dostepne: {ROZKLADY}")
+    try:
+        if rozklad in _KLASY:
+            _KLASY[rozklad](*parametry, gen=gen, **opcje)
+            return
+        if opcje:
+            raise TypeError(f'nieoczekiwane opcje {opcje}')
+        warunek, opis = _WARUNKI[rozklad]
+        if not warunek(*parametry):
+            raise ValueError(f'{rozklad}: wymagane {opis}')
+    except TypeError as e:
+        raise ValueError(f'{rozklad}: niepoprawne parametry {parametry} lub opcje {opcje} ({e})') from e
+
+
+def zapisz_strumien(gen: RNGenerator, sciezka: str, rozklad: str, n: int, *parametry,
+                    paczka: int = ROZMIAR_PACZKI, **opcje) -> None:
+    """Zapisz n kolejnych wartosci gen.<rozklad>(*parametry, **opcje) do pliku.
+
+    Wartosci generowane sa paczkami po 'paczka', wiec zuzycie pamieci nie zalezy od n.
+    Plik powstaje atomowo (rn_pliki.zapis_atomowy). Niepoprawne parametry zglaszane sa
+    (ValueError) przed utworzeniem pliku.
+    """
+    sprawdz_parametry(gen, rozklad, parametry, opcje)
+    if n < 0 or paczka < 1:
+        raise ValueError('n musi byc nieujemne, a paczka dodatnia')
+    losuj = getattr(gen, rozklad)
+    ziarna = gen.seedSequence
+    metadane = json.dumps({
+        'rozklad': rozklad, 'parametry': list(parametry), 'opcje': opcje,
+        'backend': 'mt' if gen.backend is None else gen.backend.nazwa,
+        'entropia': ziarna.entropia, 'klucz': list(ziarna.klucz)}).encode('utf-8')
+    stan = gen.stateBytes()
+    poczatek_stanu = _wyrownaj(_NAGLOWEK.size + len(metadane), 8)
+    przesuniecie = _wyrownaj(poczatek_stanu + len(stan), WYROWNANIE)
+
+    with zapis_atomowy(sciezka) as plik:
+        plik.seek(przesuniecie)
+        typ = None
+        pozostalo = n
+        while True:
+            m = min(paczka, pozostalo)
+            wartosci = losuj(*parametry, size=m, **opcje)
+            typ = wartosci.typecode
+            plik.write(wartosci)
+            pozostalo -= m
+            if pozostalo == 0:
+                break
+        # rozszerza plik do poczatku wartosci takze dla n == 0
+        plik.truncate(plik.tell())
+        plik.seek(0)
+        plik.write(_NAGLOWEK.pack(STRUMIEN_SYGNATURA, STRUMIEN_WERSJA, typ.encode('ascii'),
+                                  _KOLEJNOSC[sys.byteorder], n, przesuniecie, len(metadane), len(stan)))
+        plik.write(metadane)
+        plik.seek(poczatek_stanu)
+        plik.write(stan)
+
+
+class StrumienZmiennych:
+    """Strumien wartosci zapisany przez zapisz_strumien, odwzorowany w pamieci (tylko odczyt).
+
+    Indeksowanie i wycinki dzialaja jak dla memoryview (wycinki nie kopiuja danych),
+    a strony pliku wczytywane sa przez system dopiero przy dostepie. Przed close()
+    nalezy zwolnic wszystkie pobrane wycinki (inaczej mmap zglosi BufferError).
+    """
+
+    def __init__(self, sciezka: str) -> None:
+        self._plik = open(sciezka, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._plik.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(self._mmap) < _NAGLOWEK.size:
+                raise ValueError('plik jest za krotki na naglowek strumienia')
+            (sygnatura, wersja, typ, kolejnosc, n, przesuniecie,
+             dl_metadanych, dl_stanu) = _NAGLOWEK.unpack_from(self._mmap)
+            if sygnatura != STRUMIEN_SYGNATURA:
+                raise ValueError('to nie jest plik strumienia RNGenerator')
+            if wersja != STRUMIEN_WERSJA:
+                raise ValueError(f'nieobslugiwana wersja strumienia: {wersja}')
+            if kolejnosc != _KOLEJNOSC[sys.byteorder]:
+                raise ValueError('strumien zapisano z inna kolejnoscia bajtow')
+            self.typ = typ.decode('ascii')
+            koniec = przesuniecie + n * struct.calcsize(self.typ)
+            if koniec > len(self._mmap):
+                raise ValueError('plik strumienia jest niekompletny')
+            poczatek_stanu = _wyrownaj(_NAGLOWEK.size + dl_metadanych, 8)
+            self.metadane = json.loads(self._mmap[_NAGLOWEK.size:_NAGLOWEK.size + dl_metadanych])
+            self._stan = self._mmap[poczatek_stanu:poczatek_stanu + dl_stanu]
+            self._bufor = memoryview(self._mmap)
+            self.wartosci = self._bufor[przesuniecie:koniec].cast(self.typ)
+        except BaseException:
+            self.close()
+            raise
+
+    @property
+    def rozklad(self) -> str:
+        return self.metadane['rozklad']
+
+    @property
+    def parametry(self) -> tuple:
+        return tuple(self.metadane['parametry'])
+
+    def __len__(self) -> int:
+        return len(self.wartosci)
+
+    def __getitem__(self, indeks):
+        return self.wartosci[indeks]
+
+    def __iter__(self) -> Iterator:
+        return iter(self.wartosci)
+
+    def paczki(self, rozmiar: int = ROZMIAR_PACZKI) -> Iterator[memoryview]:
+        """Kolejne wycinki strumienia dlugosci 'rozmiar' (bez kopiowania)."""
+        for i in range(0, len(self.wartosci), rozmiar):
+            yield self.wartosci[i:i + rozmiar]
+
+    def generator(self) -> RNGenerator:
+        """Generator w stanie z chwili rozpoczecia zapisu: odtwarza strumien od poczatku
+        i pozwala go przedluzyc (po pominieciu len(self) wartosci)."""
+        gen = RNGenerator(0, backend=self.metadane['backend'])
+        gen.setStateBytes(self._stan)
+        return gen
+
+    def close(self) -> None:
+        """Zwolnij odwzorowanie pliku."""
+        for nazwa in ('wartosci', '_bufor'):
+            widok = self.__dict__.pop(nazwa, None)
+            if widok is not None:
+                widok.release()
+        if getattr(self, '_mmap', None) is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._plik.close()
+
+    def __enter__(self) -> StrumienZmiennych:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description='Zapis strumienia wartosci RNGenerator do pliku binarnego.')
+    parser.add_argument('plik', help='plik wynikowy')
+    parser.add_argument('--rozklad', required=True, choices=ROZKLADY)
+    parser.add_argument('--parametry', nargs='*', type=json.loads, default=[],
+                        help='parametry rozkladu, np. 0.4 200 dla binomial (listy w JSON)')
+    parser.add_argument('--metoda', default=None, help='wariant algorytmu (parametr metoda=)')
+    parser.add_argument('--n', type=int, required=True, help='liczba wartosci')
+    parser.add_argument('--ziarno', type=int, default=None)
+    parser.add_argument('--backend', default=None, help="zrodlo bitow ('mt' albo 'philox')")
+    args = parser.parse_args(argv)
+
+    gen = RNGenerator(args.ziarno, backend=args.backend)
+    opcje = {} if args.metoda is None else {'metoda': args.metoda}
+    try:
+        zapisz_strumien(gen, args.plik, args.rozklad, args.n, *args.parametry, **opcje)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f'Zapisano {args.n} wartosci {args.rozklad}{tuple(args.parametry)} do {args.plik}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""Pamiec podreczna na dysku dla duzych tablic aliasow (krotko zyjace procesy).
+
+Tablice drogie w budowie (tablice aliasow o wielu wartosciach) zapisywane sa w formacie
+marshal przy pierwszym uzyciu i przy kolejnych uruchomieniach wczytywane zamiast liczone
+od nowa; sam import modulu nie dotyka dysku. Katalog wskazuje zmienna RN_KATALOG_TABLIC
+(pusta wartosc wylacza zapis na dysk); domyslnie $XDG_CACHE_HOME/rn_generator lub
+~/.cache/rn_generator. Nazwa pliku zawiera skrot zrodla modulu z funkcja budujaca, wiec
+zmiana kodu uniewaznia stare pliki. Katalog jest ograniczony (MAKS_PLIKOW_TABLIC,
+MAKS_ROZMIAR_TABLIC): po kazdym zapisie usuwane sa najdawniej uzywane pliki (czas
+modyfikacji odswiezany jest przy kazdym odczycie), wiec nieaktualne pliki nie gromadza
+sie bez konca. Bledy odczytu i zapisu nie sa zglaszane, a wczytana
+wartosc, ktora nie przejdzie sprawdzenia, jest odrzucana - tablica jest wtedy po prostu
+wyliczana (i zapisywana ponownie).
+"""
+from __future__ import annotations
+import marshal
+import os
+import sys
+import zlib
+
+# Zmieniana przy kazdej zmianie formatu plikow (uniewaznia stare pliki)
+WERSJA_TABLIC = 2
+# Limity katalogu tablic (liczba plikow i ich laczny rozmiar w bajtach)
+MAKS_PLIKOW_TABLIC = 64
+MAKS_ROZMIAR_TABLIC = 64 * 1024 * 1024
+
+# skroty zrodel modulow z funkcjami budujacymi (sciezka pliku -> skrot)
+_SKROTY: dict[str, str] = {}
+
+
+def katalog_tablic() -> str | None:
+    """Katalog plikow z tablicami albo None, gdy zapis na dysk jest wylaczony."""
+    katalog = os.environ.get('RN_KATALOG_TABLIC')
+    if katalog is None:
+        baza = os.environ.get('XDG_CACHE_HOME')
+        if not baza:
+            dom = os.path.expanduser('~')
+            if dom == '~':
+                # nieznany katalog domowy - bez zapisu na dysk
+                return None
+            baza = os.path.join(dom, '.cache')
+        katalog = os.path.join(baza, 'rn_generator')
+    if not katalog:
+        return None
+    return os.path.join(katalog, f'v{WERSJA_TABLIC}')
+
+
+def _skrot_budowy(buduj) -> str:
+    """Skrot zrodla modulu, w ktorym zdefiniowano buduj (albo samego kodu buduj, gdy zrodla brak)."""
+    plik = getattr(sys.modules.get(buduj.__module__), '__file__', None)
+    if plik in _SKROTY:
+        return _SKROTY[plik]
+    try:
+        with open(plik, 'rb') as zrodlo:
+            dane = zrodlo.read()
+    except (OSError, TypeError):
+        return f'{zlib.crc32(marshal.dumps(buduj.__code__)):08x}'
+    _SKROTY[plik] = skrot = f'{zlib.crc32(dane):08x}'
+    return skrot
+
+
+def _przytnij(katalog: str) -> None:
+    """Usun najdawniej uzywane pliki tablic ponad limity (najnowszy plik zostaje zawsze)."""
+    pliki = []
+    try:
+        with os.scandir(katalog) as wpisy:
+            for wpis in wpisy:
+                if wpis.name.endswith('.marshal') and wpis.is_file():
+                    st = wpis.stat()
+                    pliki.append((st.st_mtime, st.st_size, wpis.path))
+    except OSError:
+        return
+    pliki.sort(reverse=True)
+    razem = 0
+    for i, (_, rozmiar, sciezka) in enumerate(pliki):
+        razem += rozmiar
+        if i > 0 and (i >= MAKS_PLIKOW_TABLIC or razem > MAKS_ROZMIAR_TABLIC):
+            try:
+                os.remove(sciezka)
+            except OSError:
+                pass
+
+
+def tablica(nazwa: str, buduj, poprawna, *args):
+    """Zwroc buduj(*args), wczytane z pliku, jesli bylo juz wyliczone.
+
+    Wynik musi skladac sie z typow obslugiwanych przez marshal (listy, krotki, liczby),
+    a args wyznaczaja nazwe pliku, wiec powinny byc liczbami. Wartosc z pliku jest
+    uzywana tylko, gdy poprawna(wartosc) (np. typy i dlugosci list); inaczej tablica
+    jest budowana od nowa, a plik nadpisywany.
+    """
+    katalog = katalog_tablic()
+    if katalog is None:
+        return buduj(*args)
+    sciezka = os.path.join(katalog, '_'.join([nazwa, *map(repr, args), _skrot_budowy(buduj)]) + '.marshal')
+    try:
+        with open(sciezka, 'rb') as plik:
+            wartosc = marshal.load(plik)
+        if poprawna(wartosc):
+            try:
+                # czas modyfikacji sluzy jako czas ostatniego uzycia (LRU w _przytnij)
+                os.utime(sciezka)
+            except OSError:
+                pass
+            return wartosc
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+    wartosc = buduj(*args)
+    from rn_pliki import zapis_atomowy
+    try:
+        os.makedirs(katalog, exist_ok=True)
+        with zapis_atomowy(sciezka) as plik:
+            marshal.dump(wartosc, plik)
+    except OSError:
+        pass
+    else:
+        _przytnij(katalog)
+    return wartosc
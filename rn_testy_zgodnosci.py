@@ -0,0 +1,279 @@
+"""Testy zgodnosci rozkladow generowanych przez RNGenerator z rozkladami teoretycznymi.
+
+Dla kazdego przypadku (metoda RNGenerator, parametry, wariant algorytmu) probka generowana
+jest paczkami i przetwarzana strumieniowo, w stalej pamieci:
+ - rozklady ciagle: wartosci przeksztalcane sa dystrybuanta (PIT) i zliczane w drobnej
+   siatce przedzialow [0, 1); z histogramu liczone sa statystyki Kolmogorowa-Smirnowa,
+   Andersona-Darlinga (wersje przedzialowe) i chi-kwadrat na przedzialach rownego
+   prawdopodobienstwa,
+ - rozklady dyskretne: test chi-kwadrat na funkcji prawdopodobienstwa (komorki laczone
+   do oczekiwanej licznosci >= 5),
+ - wszystkie: zgodnosc sredniej i wariancji z wartosciami teoretycznymi (test z).
+Przypadki liczone sa rownolegle, kazdy z wlasnego strumienia RNGSeedSequence.spawn,
+wiec wyniki dla danego ziarna nie zaleza od liczby procesow.
+"""
+from __future__ import annotations
+import argparse
+import json
+import math
+import sys
+from collections import Counter
+from typing import Callable, Iterator
+from obliczenia_rownolegle import wykonaj_strumieniowo
+from rn_generator_20251120 import RNGenerator, RNGSeedSequence, ROZMIAR_PACZKI
+from rn_przypadki import PRZYPADKI, Przypadek
+from rn_specjalne import funkcja_rozkladu, gamma_q
+from statystyki_strumieniowe import AkumulatorWelforda
+
+
+# Liczba przedzialow siatki PIT (rozdzielczosc statystyk KS i AD to 1/PRZEDZIALY_PIT)
+PRZEDZIALY_PIT = 1 << 16
+# Minimalna oczekiwana licznosc komorki testu chi-kwadrat
+MIN_OCZEKIWANA = 5.0
+
+
+# ======================================================================
+# Rozklady statystyk testowych
+
+def p_kolmogorowa(d: float, n: int) -> float:
+    """Asymptotyczna p-wartosc statystyki KS z poprawka Stephensa."""
+    pierw = math.sqrt(n)
+    lam = (pierw + 0.12 + 0.11 / pierw) * d
+    if lam < 0.3:
+        return 1.0
+    suma = math.fsum([2.0 * (-1) ** (j - 1) * math.exp(-2.0 * j * j * lam * lam) for j in range(1, 101)])
+    return min(1.0, max(0.0, suma))
+
+
+def p_andersona_darlinga(a2: float) -> float:
+    """Asymptotyczna p-wartosc statystyki A^2 (aproksymacja Marsaglii i Marsaglii, 2004)."""
+    if a2 <= 0.0:
+        return 1.0
+    if a2 < 2.0:
+        f = (math.exp(-1.2337141 / a2) / math.sqrt(a2)
+             * (2.00012 + (0.247105 - (0.0649821 - (0.0347962 - (0.011672 - 0.00168691 * a2)
+                                                    * a2) * a2) * a2) * a2))
+    else:
+        f = math.exp(-math.exp(1.0776 - (2.30695 - (0.43424 - (0.082433 - (0.008056 - 0.0003146 * a2)
+                                                               * a2) * a2) * a2) * a2))
+    return min(1.0, max(0.0, 1.0 - f))
+
+
+def p_chi2(statystyka: float, df: int) -> float:
+    """P-wartosc testu chi-kwadrat o df stopniach swobody."""
+    return gamma_q(statystyka * 0.5, 0.5 * df) if df > 0 else 1.0
+
+
+def _p_z(z: float) -> float:
+    """Dwustronna p-wartosc statystyki o rozkladzie N(0, 1)."""
+    return math.erfc(abs(z) / math.sqrt(2.0))
+
+
+# ======================================================================
+# Statystyki na histogramie PIT
+
+def statystyka_ks(histogram: list[int]) -> float:
+    """Statystyka KS w wezlach siatki PIT (dokladna z dokladnoscia do 1/len(histogram))."""
+    n = sum(histogram)
+    k = len(histogram)
+    d = 0.0
+    skum = 0
+    for j, c in enumerate(histogram, 1):
+        skum += c
+        # na przedziale [(j-1)/k, j/k) dystrybuanta empiryczna rosnie od poprzedniej wartosci do skum/n
+        d = max(d, abs(skum / n - j / k), abs((skum - c) / n - (j - 1) / k))
+    return d
+
+
+def statystyka_ad(histogram: list[int]) -> float:
+    """Statystyka A^2 = n * calka (Fn(u) - u)^2 / (u (1 - u)) du, z Fn liniowa wewnatrz przedzialow siatki.
+
+    Calka na kazdym przedziale liczona jest dwupunktowa kwadratura Gaussa-Legendre'a
+    (bez wartosci na krancach, gdzie waga jest osobliwa).
+    """
+    n = sum(histogram)
+    k = len(histogram)
+    h = 1.0 / k
+    g1, g2 = 0.5 - 0.5 / math.sqrt(3.0), 0.5 + 0.5 / math.sqrt(3.0)
+    skladniki = []
+    skum = 0
+    for j, c in enumerate(histogram):
+        f0 = skum / n
+        skum += c
+        nachylenie = c / n
+        for t in (g1, g2):
+            u = (j + t) * h
+            r = f0 + t * nachylenie - u
+            skladniki.append(r * r / (u * (1.0 - u)))
+    return n * 0.5 * h * math.fsum(skladniki)
+
+
+def _rowne_przedzialy(n: int, przedzialy: int) -> int:
+    """Liczba przedzialow testu chi-kwadrat: potega dwojki bliska 2 n^(2/5) (regula Manna-Walda)."""
+    k = 8
+    while 2 * k <= min(przedzialy, 2.0 * n ** 0.4):
+        k *= 2
+    return k
+
+
+def chi2_histogramu(histogram: list[int]) -> tuple[float, int]:
+    """Test chi-kwadrat na przedzialach rownego prawdopodobienstwa utworzonych z siatki PIT."""
+    n = sum(histogram)
+    k = _rowne_przedzialy(n, len(histogram))
+    krok = len(histogram) // k
+    oczekiwana = n / k
+    licznosci = [sum(histogram[i:i + krok]) for i in range(0, len(histogram), krok)]
+    return math.fsum([(c - oczekiwana) ** 2 / oczekiwana for c in licznosci]), k - 1
+
+
+def chi2_dyskretny(licznosci: Counter, pmf: Callable[[int], float], lo: int, hi: int) -> tuple[float, int]:
+    """Test chi-kwadrat dla rozkladu dyskretnego.
+
+    Wartosci spoza [lo, hi] trafiaja do komorek skrajnych, a sasiednie komorki laczone sa
+    tak, by oczekiwana licznosc kazdej wynosila co najmniej MIN_OCZEKIWANA.
+    """
+    n = sum(licznosci.values())
+    p = [pmf(k) for k in range(lo, hi + 1)]
+    p_ponizej = math.fsum([pmf(k) for k in range(lo)])
+    p[-1] += max(0.0, 1.0 - p_ponizej - math.fsum(p))
+    komorki_p = [p_ponizej, *p]
+    komorki_c = [sum(c for v, c in licznosci.items() if v < lo),
+                 *(licznosci.get(k, 0) for k in range(lo, hi + 1))]
+    komorki_c[-1] += sum(c for v, c in licznosci.items() if v > hi)
+    # polaczenie komorek o zbyt malej licznosci oczekiwanej
+    laczone = []
+    e_akt, c_akt = 0.0, 0
+    for e, c in zip(komorki_p, komorki_c):
+        e_akt += e * n
+        c_akt += c
+        if e_akt >= MIN_OCZEKIWANA:
+            laczone.append([e_akt, c_akt])
+            e_akt, c_akt = 0.0, 0
+    if laczone:
+        laczone[-1][0] += e_akt
+        laczone[-1][1] += c_akt
+    else:
+        laczone.append([e_akt, c_akt])
+    stat = math.fsum([(c - e) ** 2 / e for e, c in laczone if e > 0.0])
+    return stat, len(laczone) - 1
+
+
+# ======================================================================
+# Uruchamianie testow
+
+POLA_ZGODNOSCI = ('przypadek', 'n', 'srednia', 'srednia_teor', 'p_srednia',
+                  'wariancja', 'wariancja_teor', 'p_wariancja',
+                  'ks', 'p_ks', 'ad', 'p_ad', 'chi2', 'df', 'p_chi2', 'p_min')
+
+
+def _paczki(gen: RNGenerator, przypadek: Przypadek, n: int, paczka: int) -> Iterator:
+    losuj = getattr(gen, przypadek.metoda)
+    while n > 0:
+        m = min(paczka, n)
+        yield losuj(*przypadek.parametry, size=m, **przypadek.opcje)
+        n -= m
+
+
+def testuj_przypadek(przypadek: Przypadek, gen: RNGenerator, n: int, paczka: int = ROZMIAR_PACZKI) -> dict:
+    """Wygeneruj strumieniowo probke n wartosci i policz wszystkie testy zgodnosci dla przypadku."""
+    akum = AkumulatorWelforda()
+    histogram = [0] * PRZEDZIALY_PIT if przypadek.nosnik is None else None
+    licznosci = Counter()
+    for wartosci in _paczki(gen, przypadek, n, paczka):
+        akum.dodaj_paczke(wartosci)
+        if histogram is None:
+            licznosci.update(wartosci)
+            continue
+        cdf = funkcja_rozkladu(przypadek.metoda, 'cdf', *przypadek.parametry)
+        ostatni = PRZEDZIALY_PIT - 1
+        for x in wartosci:
+            histogram[min(int(cdf(x) * PRZEDZIALY_PIT), ostatni)] += 1
+
+    wynik = dict.fromkeys(POLA_ZGODNOSCI)
+    wynik.update(przypadek=przypadek.nazwa, n=n, srednia=akum.srednia, wariancja=akum.wariancja,
+                 srednia_teor=przypadek.srednia, wariancja_teor=przypadek.wariancja)
+    if przypadek.srednia is not None and przypadek.wariancja is not None:
+        wynik['p_srednia'] = _p_z((akum.srednia - przypadek.srednia) / math.sqrt(przypadek.wariancja / n))
+    if przypadek.wariancja is not None and przypadek.kurtoza_skonczona:
+        # Var(s^2) ~ (mu4 - sigma^4) / n, z mu4 szacowanym z probki
+        wariancja_s2 = (akum.m4 / n - przypadek.wariancja ** 2) / n
+        if wariancja_s2 > 0.0:
+            wynik['p_wariancja'] = _p_z((akum.wariancja - przypadek.wariancja) / math.sqrt(wariancja_s2))
+    if histogram is not None:
+        wynik['ks'] = statystyka_ks(histogram)
+        wynik['p_ks'] = p_kolmogorowa(wynik['ks'], n)
+        wynik['ad'] = statystyka_ad(histogram)
+        wynik['p_ad'] = p_andersona_darlinga(wynik['ad'])
+        wynik['chi2'], wynik['df'] = chi2_histogramu(histogram)
+    else:
+        wynik['chi2'], wynik['df'] = chi2_dyskretny(licznosci, funkcja_rozkladu(przypadek.metoda, 'pmf', *przypadek.parametry),
+                                                    *przypadek.nosnik)
+    wynik['p_chi2'] = p_chi2(wynik['chi2'], wynik['df'])
+    wynik['p_min'] = min(wynik[k] for k in ('p_srednia', 'p_wariancja', 'p_ks', 'p_ad', 'p_chi2')
+                         if wynik[k] is not None)
+    return wynik
+
+
+def _zadanie_zgodnosci(zadanie: tuple) -> dict:
+    """Zadanie robocze: przypadek z katalogu PRZYPADKI na wlasnym strumieniu losowym."""
+    indeks, entropia, klucz, n, paczka, backend = zadanie
+    gen = RNGenerator(RNGSeedSequence(entropia, klucz), backend=backend)
+    return testuj_przypadek(PRZYPADKI[indeks], gen, n, paczka)
+
+
+def testuj_rozklady(n: int = 200_000, ziarno: int | None = None, metody: list[str] | None = None,
+                    procesy: int | None = None, paczka: int = ROZMIAR_PACZKI,
+                    backend: str | None = None) -> Iterator[dict]:
+    """Uruchom testy zgodnosci dla przypadkow z PRZYPADKI (opcjonalnie tylko wybranych metod).
+
+    Kazdy przypadek ma wlasny strumien wyznaczony przez swoj indeks w katalogu, wiec wybor
+    podzbioru metod ani liczba procesow nie zmieniaja wynikow. Wyniki zwracane sa na biezaco.
+    """
+    if metody is not None:
+        znane = {p.metoda for p in PRZYPADKI}
+        for metoda in metody:
+            if metoda not in znane:
+                raise ValueError(f"nieznana metoda '{metoda}', dostepne: {', '.join(sorted(znane))}")
+    ziarna = RNGSeedSequence(ziarno).spawn(len(PRZYPADKI))
+    zadania = [(i, z.entropia, z.klucz, n, paczka, backend) for i, (p, z) in enumerate(zip(PRZYPADKI, ziarna))
+               if metody is None or p.metoda in metody]
+    yield from wykonaj_strumieniowo(_zadanie_zgodnosci, zadania, procesy)
+
+
+def _argumenty(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Testy zgodnosci rozkladow RNGenerator (KS, AD, chi-kwadrat, momenty).')
+    parser.add_argument('--n', type=int, default=200_000, help='licznosc probki na przypadek')
+    parser.add_argument('--ziarno', type=int, default=0, help='ziarno glownej sekwencji ziaren')
+    parser.add_argument('--metody', nargs='+', default=None, help='tylko wybrane metody RNGenerator')
+    parser.add_argument('--procesy', type=int, default=None, help='liczba procesow (domyslnie liczba rdzeni)')
+    parser.add_argument('--backend', default=None, help="zrodlo bitow ('mt' albo 'philox')")
+    parser.add_argument('--alfa', type=float, default=0.01,
+                        help='laczny poziom istotnosci (poprawka Bonferroniego na wszystkie testy)')
+    parser.add_argument('--format', choices=('tekst', 'jsonl'), default='tekst')
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Uruchom testy z konsoli. Zwraca 1, jesli ktorykolwiek przypadek nie przeszedl testow."""
+    args = _argumenty(argv)
+    wyniki = list(testuj_rozklady(args.n, args.ziarno, args.metody, args.procesy, backend=args.backend))
+    liczba_testow = sum(sum(w[k] is not None for k in ('p_srednia', 'p_wariancja', 'p_ks', 'p_ad', 'p_chi2'))
+                        for w in wyniki)
+    prog = args.alfa / max(1, liczba_testow)
+    niezaliczone = 0
+    for w in wyniki:
+        w['zaliczony'] = w['p_min'] >= prog
+        niezaliczone += not w['zaliczony']
+        if args.format == 'jsonl':
+            print(json.dumps(w))
+            continue
+        p = ' '.join(f'{k}={w[k]:.4f}' for k in ('p_srednia', 'p_wariancja', 'p_ks', 'p_ad', 'p_chi2')
+                     if w[k] is not None)
+        print(f"{'OK  ' if w['zaliczony'] else 'BLAD'} {w['przypadek']:<42} {p}")
+    print(f'\n{len(wyniki) - niezaliczone}/{len(wyniki)} przypadkow zgodnych '
+          f'(n={args.n}, {liczba_testow} testow, prog p={prog:.2e})', file=sys.stderr)
+    return 1 if niezaliczone else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,114 @@
+from __future__ import annotations
+import math
+from typing import Iterable
+
+
+class AkumulatorWelforda:
+    """Srednia, wariancja, skosnosc i kurtoza liczone strumieniowo (Welford) w stalej pamieci.
+
+    Paczki wartosci sa najpierw sumowane osobno (math.fsum, dokladniej niz sumowanie Kahana),
+    a potem laczone z dotychczasowym stanem: srednia i M2 wzorem Chana, M3 i M4 wzorami Pebaya.
+    Akumulatory z roznych paczek lub procesow mozna wiec laczyc metoda polacz().
+    Przy momenty=2 liczone sa tylko srednia i wariancja (okolo dwa razy szybciej).
+    """
+
+    __slots__ = ('n', 'srednia', 'm2', 'm3', 'm4', 'momenty')
+
+    def __init__(self, momenty: int = 4) -> None:
+        if momenty not in (2, 4):
+            raise ValueError('momenty musi byc rowne 2 albo 4')
+        self.n = 0
+        self.srednia = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+        self.momenty = momenty
+
+    def dodaj(self, x: float) -> None:
+        """Dodaj pojedyncza wartosc."""
+        if self.momenty == 2:
+            self.n += 1
+            delta = x - self.srednia
+            self.srednia += delta / self.n
+            self.m2 += delta * (x - self.srednia)
+            return
+        n1 = self.n
+        self.n = n = n1 + 1
+        delta = x - self.srednia
+        delta_n = delta / n
+        delta_n2 = delta_n * delta_n
+        wyraz = delta * delta_n * n1
+        self.srednia += delta_n
+        self.m4 += wyraz * delta_n2 * (n * n - 3 * n + 3) + 6 * delta_n2 * self.m2 - 4 * delta_n * self.m3
+        self.m3 += wyraz * delta_n * (n - 2) - 3 * delta_n * self.m2
+        self.m2 += wyraz
+
+    def dodaj_paczke(self, xs: Iterable[float]) -> None:
+        """Dodaj paczke wartosci: momenty paczki liczone sa osobno i dolaczane do stanu."""
+        xs = list(xs)
+        if not xs:
+            return
+        inny = AkumulatorWelforda(self.momenty)
+        inny.n = len(xs)
+        inny.srednia = s = math.fsum(xs) / inny.n
+        d2 = [(x - s) ** 2 for x in xs]
+        inny.m2 = math.fsum(d2)
+        if self.momenty == 4:
+            inny.m3 = math.fsum([d * (x - s) for d, x in zip(d2, xs)])
+            inny.m4 = math.fsum([d * d for d in d2])
+        self.polacz(inny)
+
+    def polacz(self, inny: AkumulatorWelforda) -> AkumulatorWelforda:
+        """Dolacz stan innego akumulatora (np. z innej paczki lub procesu).
+
+        Wynik ma tylko te momenty, ktore licza oba akumulatory.
+        """
+        self.momenty = min(self.momenty, inny.momenty)
+        if inny.n == 0:
+            return self
+        if self.n == 0:
+            self.n, self.srednia, self.m2, self.m3, self.m4 = inny.n, inny.srednia, inny.m2, inny.m3, inny.m4
+            return self
+        na, nb = self.n, inny.n
+        n = na + nb
+        d = inny.srednia - self.srednia
+        d2 = d * d
+        m2a, m2b = self.m2, inny.m2
+        m3a, m3b = self.m3, inny.m3
+        self.srednia += d * nb / n
+        self.m2 = m2a + m2b + d2 * na * nb / n
+        self.n = n
+        if self.momenty == 2:
+            return self
+        self.m3 = (m3a + m3b + d2 * d * na * nb * (na - nb) / (n * n)
+                   + 3.0 * d * (na * m2b - nb * m2a) / n)
+        self.m4 = (self.m4 + inny.m4 + d2 * d2 * na * nb * (na * na - na * nb + nb * nb) / (n * n * n)
+                   + 6.0 * d2 * (na * na * m2b + nb * nb * m2a) / (n * n)
+                   + 4.0 * d * (na * m3b - nb * m3a) / n)
+        return self
+
+    @property
+    def wariancja(self) -> float:
+        """Nieobciazony estymator wariancji (0.0 dla mniej niz dwoch wartosci)."""
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def blad_standardowy(self) -> float:
+        """Blad standardowy sredniej."""
+        return math.sqrt(self.wariancja / self.n) if self.n > 1 else math.inf
+
+    @property
+    def skosnosc(self) -> float:
+        """Wspolczynnik skosnosci g1 = sqrt(n) M3 / M2^(3/2)."""
+        self._sprawdz_momenty()
+        return math.sqrt(self.n) * self.m3 / self.m2 ** 1.5 if self.m2 > 0.0 else 0.0
+
+    @property
+    def kurtoza(self) -> float:
+        """Kurtoza nadwyzkowa g2 = n M4 / M2^2 - 3 (0 dla rozkladu normalnego)."""
+        self._sprawdz_momenty()
+        return self.n * self.m4 / (self.m2 * self.m2) - 3.0 if self.m2 > 0.0 else 0.0
+
+    def _sprawdz_momenty(self) -> None:
+        if self.momenty < 4:
+            raise ValueError('akumulator liczy tylko srednia i wariancje (momenty=2)')
@@ -1,42 +1,218 @@
 from __future__ import annotations
+import argparse
+import ast
+import copy
+import functools
+import heapq
 import math
 import random
 import sys
 import time
-from typing import Callable
+from typing import Callable, Iterable, Iterator, NamedTuple
+
+from obliczenia_rownolegle import wykonaj, wykonaj_strumieniowo
+from rn_generator_20251120 import RNGenerator, RNGSeedSequence
+from statystyki_strumieniowe import AkumulatorWelforda
 
 # Stale przedzialu calkowania
 PREDZIAL_A = 1.0
 PREDZIAL_B = math.e
 
+# Liczba punktow przekazywanych naraz do funkcji wektorowej
+PACZKA_PUNKTOW = 65536
 
-def konstrukcja_f_expr(wyrazenie: str) -> Callable[[float], float]:
-    # Jesli wyrazenie jest niepoprawne, wyjatek przejdzie na zewnatrz i program sie zakonczy.
-    globalns = {name: getattr(math, name) for name in dir(math) if not name.startswith('_')}
+# Nazwy z modulu math dostepne w wyrazeniach uzytkownika
+_NAZWY_MATH = {name: getattr(math, name) for name in dir(math) if not name.startswith('_')}
+
+
+def _lambda_z_wyrazenia(cialo: ast.expr, wektorowo: bool) -> ast.Expression:
+    """Zbuduj drzewo 'lambda x: float(cialo)' albo 'lambda xs: [float(cialo) for x in xs]'."""
+    cialo = ast.Call(ast.Name('float', ast.Load()), [copy.deepcopy(cialo)], [])
+    if wektorowo:
+        cialo = ast.ListComp(cialo, [ast.comprehension(ast.Name('x', ast.Store()),
+                                                       ast.Name('xs', ast.Load()), [], 0)])
+    argumenty = ast.arguments(posonlyargs=[], args=[ast.arg('xs' if wektorowo else 'x')],
+                              kwonlyargs=[], kw_defaults=[], defaults=[])
+    return ast.fix_missing_locations(ast.Expression(ast.Lambda(argumenty, cialo)))
+
+
+# Funkcje math z odpowiednikiem w NumPy o tym samym znaczeniu: nazwa -> (nazwa w NumPy, liczba argumentow).
+# log ma tu jeden argument: w np.log drugi argument pozycyjny to bufor wynikowy (out), nie podstawa.
+_MATH_NUMPY = {
+    'sin': ('sin', 1), 'cos': ('cos', 1), 'tan': ('tan', 1),
+    'asin': ('arcsin', 1), 'acos': ('arccos', 1), 'atan': ('arctan', 1), 'atan2': ('arctan2', 2),
+    'sinh': ('sinh', 1), 'cosh': ('cosh', 1), 'tanh': ('tanh', 1),
+    'asinh': ('arcsinh', 1), 'acosh': ('arccosh', 1), 'atanh': ('arctanh', 1),
+    'exp': ('exp', 1), 'exp2': ('exp2', 1), 'expm1': ('expm1', 1),
+    'log': ('log', 1), 'log2': ('log2', 1), 'log10': ('log10', 1), 'log1p': ('log1p', 1),
+    'sqrt': ('sqrt', 1), 'cbrt': ('cbrt', 1), 'pow': ('power', 2), 'hypot': ('hypot', 2),
+    'fabs': ('fabs', 1), 'floor': ('floor', 1), 'ceil': ('ceil', 1), 'trunc': ('trunc', 1),
+    'copysign': ('copysign', 2), 'fmod': ('fmod', 2), 'degrees': ('degrees', 1), 'radians': ('radians', 1),
+}
+# Wezly drzewa, ktore dzialaja na tablicach tak samo jak na liczbach (bez porownan, and/or, if-else)
+_WEZLY_NUMPY = (ast.BinOp, ast.UnaryOp, ast.Constant, ast.Name, ast.Call, ast.Load,
+                ast.operator, ast.UAdd, ast.USub)
+
+
+def _wyrazalne_w_numpy(cialo: ast.expr) -> bool:
+    """Czy wyrazenie mozna policzyc na tablicy NumPy z tym samym wynikiem co punkt po punkcie."""
+    wywolywane = {id(w.func) for w in ast.walk(cialo) if isinstance(w, ast.Call)}
+    for wezel in ast.walk(cialo):
+        if not isinstance(wezel, _WEZLY_NUMPY):
+            return False
+        if isinstance(wezel, ast.Call):
+            if not isinstance(wezel.func, ast.Name) or wezel.keywords:
+                return False
+            nazwa = wezel.func.id
+            if nazwa == 'abs':
+                liczba = 1
+            elif nazwa in _NAZWY_MATH and nazwa in _MATH_NUMPY:
+                liczba = _MATH_NUMPY[nazwa][1]
+            else:
+                return False
+            if len(wezel.args) != liczba:
+                return False
+        elif isinstance(wezel, ast.Name) and wezel.id != 'x' and id(wezel) not in wywolywane:
+            # poza wywolaniami dozwolone sa tylko stale (pi, e, inf, ...)
+            if not isinstance(_NAZWY_MATH.get(wezel.id), float):
+                return False
+    return True
+
+
+def _funkcja_numpy(cialo: ast.expr, wektor: Callable) -> Callable:
+    """Zbuduj wersje wyrazenia dzialajaca na tablicach NumPy (nazwy math -> ufunc NumPy).
+
+    Jesli wyrazenie zawiera wywolanie bez odpowiednika w NumPy (np. gamma, lgamma, log(x, podstawa))
+    albo konstrukcje niedzialajaca na tablicach, wartosci liczone sa skalarna funkcja 'wektor'.
+    """
+    import numpy as np
+    if not _wyrazalne_w_numpy(cialo):
+        return lambda x: np.asarray(wektor(np.ravel(x).tolist()), dtype=float).reshape(np.shape(x))
+    globalns = dict(_NAZWY_MATH)
+    globalns.update({name: getattr(np, nazwa_np) for name, (nazwa_np, _) in _MATH_NUMPY.items()})
+    globalns['__builtins__'] = __builtins__
+    argumenty = ast.arguments(posonlyargs=[], args=[ast.arg('x')],
+                              kwonlyargs=[], kw_defaults=[], defaults=[])
+    drzewo = ast.fix_missing_locations(ast.Expression(ast.Lambda(argumenty, copy.deepcopy(cialo))))
+    g = eval(compile(drzewo, '<wyrazenie>', 'eval'), globalns)
+    return lambda x: np.broadcast_to(np.asarray(g(x), dtype=float), np.shape(x))
+
+
+@functools.lru_cache(maxsize=256)
+def _skompiluj(wyrazenie: str) -> Callable[[float], float]:
+    """Skompiluj wyrazenie do funkcji przyjmujacej liczbe, sekwencje liczb lub tablice NumPy."""
+    cialo = ast.parse(wyrazenie, '<wyrazenie>', 'eval').body
     # Pozwalamy uzytkownikowi uzywac stalych typu 'e' czy 'pi' oraz funkcji math
+    globalns = dict(_NAZWY_MATH)
     globalns['__builtins__'] = __builtins__
-    kod = compile(wyrazenie, '<wyrazenie>', 'eval')
+    skalar = eval(compile(_lambda_z_wyrazenia(cialo, False), '<wyrazenie>', 'eval'), globalns)
+    wektor = eval(compile(_lambda_z_wyrazenia(cialo, True), '<wyrazenie>', 'eval'), globalns)
+    wersja_numpy = []
 
-    def f(x: float) -> float:
-        lokalne = {'x': x}
-        wynik = eval(kod, globalns, lokalne)
-        return float(wynik)
+    def f(x):
+        if isinstance(x, (float, int)):
+            return skalar(x)
+        if type(x).__module__ == 'numpy':
+            if not wersja_numpy:
+                wersja_numpy.append(_funkcja_numpy(cialo, wektor))
+            return wersja_numpy[0](x)
+        return wektor(x)
 
+    f.wektorowa = True
+    f.wyrazenie = wyrazenie
     return f
 
 
+def konstrukcja_f_expr(wyrazenie: str, cache: bool = True) -> Callable[[float], float]:
+    """Zbuduj funkcje f(x) z wyrazenia uzytkownika.
+
+    Wyrazenie kompilowane jest raz (przez ast) do funkcji, ktora przyjmuje pojedyncza
+    liczbe, sekwencje liczb (zwraca liste) albo tablice NumPy (zwraca tablice).
+    Przy cache=True skompilowane wyrazenia sa zapamietywane wedlug tekstu wyrazenia.
+    """
+    # Jesli wyrazenie jest niepoprawne, wyjatek przejdzie na zewnatrz i program sie zakonczy.
+    if cache:
+        return _skompiluj(wyrazenie)
+    return _skompiluj.__wrapped__(wyrazenie)
+
+
+def _wartosci(f: Callable[[float], float], xs: list[float]) -> list[float]:
+    """Oblicz f we wszystkich punktach xs jednym wywolaniem, jesli f to umozliwia."""
+    if getattr(f, 'wektorowa', False):
+        return f(xs)
+    return [f(x) for x in xs]
+
+
 def calka_numeryczna(f: Callable[[float], float], a: float = PREDZIAL_A, b: float = PREDZIAL_B, kroki: int = 200000) -> float:
     """Przyblizona calka numeryczna metoda prostokatow (srodek) dla odniesienia. """
     if kroki <= 0:
         raise ValueError('kroki musi byc wieksze od 0')
     dx = (b - a) / kroki
     suma = 0.0
-    for i in range(kroki):
-        xi = a + (i + 0.5) * dx
-        suma += f(xi) * dx
+    for start in range(0, kroki, PACZKA_PUNKTOW):
+        srodki = [a + (i + 0.5) * dx for i in range(start, min(start + PACZKA_PUNKTOW, kroki))]
+        for y in _wartosci(f, srodki):
+            suma += y * dx
     return suma
 
 
+# Wezly i wagi kwadratury Gaussa-Kronroda 7-15 (jak w QUADPACK), wezly od brzegu do srodka
+_GK_WEZLY = (0.991455371120812639206854697526329, 0.949107912342758524526189684047851,
+             0.864864423359769072789712788640926, 0.741531185599394439863864773280788,
+             0.586087235467691130294144845693013, 0.405845151377397166906606412076961,
+             0.207784955007898467600689403773245, 0.0)
+_GK_WAGI_K = (0.022935322010529224963732008058970, 0.063092092629978553290700663189204,
+              0.104790010322250183839876322541518, 0.140653259715525918745189590510238,
+              0.169004726639267902826583426598550, 0.190350578064785409913256402421014,
+              0.204432940075298892414161999234649, 0.209482141084727828012999174891714)
+# wagi Gaussa dla wezlow _GK_WEZLY[1], [3], [5], [7]
+_GK_WAGI_G = (0.129484966168869693270611432679082, 0.279705391489276667901467771423780,
+              0.381830050505118944950369775488975, 0.417959183673469387755102040816327)
+
+
+def _gauss_kronrod(f: Callable[[float], float], a: float, b: float) -> tuple[float, float]:
+    """Calka na [a, b] kwadratura Kronroda (15 wezlow) i oszacowanie bledu |K15 - G7|."""
+    c = (a + b) / 2.0
+    h = (b - a) / 2.0
+    xs = [c - h * t for t in _GK_WEZLY[:7]] + [c + h * t for t in _GK_WEZLY]
+    ys = _wartosci(f, xs)
+    pary = [ys[i] + ys[7 + i] for i in range(7)] + [ys[14]]
+    k = h * math.fsum([w * y for w, y in zip(_GK_WAGI_K, pary)])
+    g = h * math.fsum([w * pary[j] for w, j in zip(_GK_WAGI_G, (1, 3, 5, 7))])
+    return k, abs(k - g)
+
+
+def calka_adaptacyjna(f: Callable[[float], float], a: float = PREDZIAL_A, b: float = PREDZIAL_B,
+                      tol: float = 1e-12, max_podzialow: int = 2000) -> tuple[float, float]:
+    """Adaptacyjna kwadratura Gaussa-Kronroda 7-15.
+
+    Zawsze dzielony jest na pol podprzedzial o najwiekszym oszacowaniu bledu, az suma
+    bledow spadnie ponizej tol * max(1, |calka|) albo wyczerpie sie limit podzialow.
+    Zwraca (wartosc, oszacowanie_bledu).
+    """
+    if tol <= 0:
+        raise ValueError('tol musi byc dodatnie')
+    wartosc, blad = _gauss_kronrod(f, a, b)
+    kopiec = [(-blad, a, b, wartosc)]
+    for _ in range(max_podzialow):
+        suma_bledow = math.fsum([-e for e, *_ in kopiec])
+        calka = math.fsum([v for *_, v in kopiec])
+        if suma_bledow <= tol * max(1.0, abs(calka)):
+            break
+        _, lo, hi, _ = heapq.heappop(kopiec)
+        srodek = (lo + hi) / 2.0
+        for x0, x1 in ((lo, srodek), (srodek, hi)):
+            v, e = _gauss_kronrod(f, x0, x1)
+            heapq.heappush(kopiec, (-e, x0, x1, v))
+    return math.fsum([v for *_, v in kopiec]), math.fsum([-e for e, *_ in kopiec])
+
+
+@functools.lru_cache(maxsize=256)
+def calka_referencyjna(wyrazenie: str, a: float = PREDZIAL_A, b: float = PREDZIAL_B, tol: float = 1e-12) -> tuple[float, float]:
+    """Calka referencyjna dla wyrazenia, zapamietywana wedlug (wyrazenie, a, b, tol)."""
+    return calka_adaptacyjna(konstrukcja_f_expr(wyrazenie), a, b, tol)
+
+
 def szacuj_mc_prostokaty(n: int, f: Callable[[float], float], a: float = PREDZIAL_A, b: float = PREDZIAL_B, ziarenko: int | None = None) -> float:
     """Oszacuj calke metoda Monte Carlo oparta na losowym podziale przedzialu i prostokatach."""
     if n < 0:
@@ -45,17 +221,276 @@ def szacuj_mc_prostokaty(n: int, f: Callable[[float], float], a: float = PREDZIA
     punkty = [rng.uniform(a, b) for _ in range(n)]
     punkty.sort()
     krawez = [a] + punkty + [b]
+    srodki = [(left + right) / 2.0 for left, right in zip(krawez, krawez[1:])]
     wynik = 0.0
-    for i in range(len(krawez) - 1):
-        left = krawez[i]
-        right = krawez[i + 1]
-        szerokosc = right - left
-        srodek = (left + right) / 2.0
-        wysokosc = f(srodek)
-        wynik += szerokosc * wysokosc
+    for left, right, wysokosc in zip(krawez, krawez[1:], _wartosci(f, srodki)):
+        wynik += (right - left) * wysokosc
     return wynik
 
 
+def _halton(n: int, baza: int = 2) -> list[float]:
+    """Pierwsze n punktow ciagu Haltona (odwrotnosc pierwiastkowa, punkty 1..n)."""
+    punkty = []
+    for i in range(1, n + 1):
+        x = 0.0
+        f = 1.0 / baza
+        while i > 0:
+            i, cyfra = divmod(i, baza)
+            x += cyfra * f
+            f /= baza
+        punkty.append(x)
+    return punkty
+
+
+def _sobol(n: int, przesuniecie: int = 0) -> list[float]:
+    """Pierwsze n punktow jednowymiarowego ciagu Sobola (kolejnosc Graya), z cyfrowym przesunieciem XOR."""
+    punkty = []
+    x = 0
+    for i in range(n):
+        punkty.append((x ^ przesuniecie) * (1.0 / 4294967296.0))
+        j = i + 1
+        x ^= 1 << (32 - (j & -j).bit_length())
+    return punkty
+
+
+def szacuj_qmc_halton(n: int, f: Callable[[float], float], a: float = PREDZIAL_A, b: float = PREDZIAL_B, ziarenko: int | None = None) -> float:
+    """Quasi-Monte Carlo: ciag Haltona (baza 2) z losowym przesunieciem Cranleya-Pattersona."""
+    if n <= 0:
+        raise ValueError('n musi byc dodatnie')
+    s = RNGenerator(ziarenko).random()
+    xs = [a + (b - a) * ((u + s) % 1.0) for u in _halton(n)]
+    return (b - a) * math.fsum(_wartosci(f, xs)) / n
+
+
+def szacuj_qmc_sobol(n: int, f: Callable[[float], float], a: float = PREDZIAL_A, b: float = PREDZIAL_B, ziarenko: int | None = None) -> float:
+    """Quasi-Monte Carlo: ciag Sobola z losowym cyfrowym przesunieciem (XOR)."""
+    if n <= 0:
+        raise ValueError('n musi byc dodatnie')
+    xs = [a + (b - a) * u for u in _sobol(n, RNGenerator(ziarenko).getrandbits(32))]
+    return (b - a) * math.fsum(_wartosci(f, xs)) / n
+
+
+def szacuj_warstwowo(n: int, f: Callable[[float], float], a: float = PREDZIAL_A, b: float = PREDZIAL_B, ziarenko: int | None = None) -> float:
+    """Losowanie warstwowe: po jednym losowym punkcie w kazdym z n rownych podprzedzialow."""
+    if n <= 0:
+        raise ValueError('n musi byc dodatnie')
+    h = (b - a) / n
+    xs = [a + (j + u) * h for j, u in enumerate(RNGenerator(ziarenko).uniform(0.0, 1.0, size=n))]
+    return (b - a) * math.fsum(_wartosci(f, xs)) / n
+
+
+def szacuj_antytetycznie(n: int, f: Callable[[float], float], a: float = PREDZIAL_A, b: float = PREDZIAL_B, ziarenko: int | None = None) -> float:
+    """Zmienne antytetyczne: n/2 par punktow x oraz a + b - x (dla nieparzystego n jeden punkt bez pary)."""
+    if n <= 0:
+        raise ValueError('n musi byc dodatnie')
+    us = RNGenerator(ziarenko).uniform(a, b, size=(n + 1) // 2).tolist()
+    xs = us + [a + b - x for x in us[:n // 2]]
+    return (b - a) * math.fsum(_wartosci(f, xs)) / n
+
+
+def szacuj_zmienna_kontrolna(n: int, f: Callable[[float], float], a: float = PREDZIAL_A, b: float = PREDZIAL_B, ziarenko: int | None = None) -> float:
+    """Zmienna kontrolna g(x) = x o znanej calce (b^2 - a^2) / 2, wspolczynnik z kowariancji proby."""
+    if n <= 1:
+        raise ValueError('n musi byc wieksze od 1')
+    xs = RNGenerator(ziarenko).uniform(a, b, size=n).tolist()
+    ys = _wartosci(f, xs)
+    sx = math.fsum(xs) / n
+    sy = math.fsum(ys) / n
+    kow = math.fsum([(x - sx) * (y - sy) for x, y in zip(xs, ys)])
+    war = math.fsum([(x - sx) ** 2 for x in xs])
+    c = kow / war if war > 0.0 else 0.0
+    return (b - a) * (sy - c * (sx - (a + b) / 2.0))
+
+
+def szacuj_waznosciowo(n: int, f: Callable[[float], float], a: float = PREDZIAL_A, b: float = PREDZIAL_B, ziarenko: int | None = None) -> float:
+    """Losowanie wedlug waznosci z gestoscia p(x) = 1 / (x ln(b/a)) na [a, b] (wymaga 0 < a < b).
+
+    Dla [1, e] gestosc to po prostu 1/x, a punkty losowane sa jako a * (b/a)^U.
+    """
+    if n <= 0:
+        raise ValueError('n musi byc dodatnie')
+    if a <= 0.0:
+        raise ValueError('losowanie wedlug waznosci wymaga a > 0')
+    ln = math.log(b / a)
+    xs = [a * math.exp(ln * u) for u in RNGenerator(ziarenko).uniform(0.0, 1.0, size=n)]
+    return ln * math.fsum([x * y for x, y in zip(xs, _wartosci(f, xs))]) / n
+
+
+# Dostepne estymatory calki: nazwa -> funkcja(n, f, a, b, ziarenko)
+METODY_MC: dict[str, Callable[..., float]] = {
+    'prostokaty': szacuj_mc_prostokaty,
+    'halton': szacuj_qmc_halton,
+    'sobol': szacuj_qmc_sobol,
+    'warstwowa': szacuj_warstwowo,
+    'antytetyczna': szacuj_antytetycznie,
+    'kontrolna': szacuj_zmienna_kontrolna,
+    'waznosciowa': szacuj_waznosciowo,
+}
+
+# Opisy metod w raporcie
+OPISY_METOD = {
+    'prostokaty': 'metoda prostokatow, losowy podzial',
+    'halton': 'quasi-Monte Carlo, ciag Haltona',
+    'sobol': 'quasi-Monte Carlo, ciag Sobola',
+    'warstwowa': 'losowanie warstwowe',
+    'antytetyczna': 'zmienne antytetyczne',
+    'kontrolna': 'zmienna kontrolna g(x) = x',
+    'waznosciowa': 'losowanie wedlug waznosci, p(x) ~ 1/x',
+}
+
+
+# Domyslna liczba punktow (lub krokow) obslugiwanych przez jedno zadanie rownolegle
+PUNKTY_NA_ZADANIE = 1_000_000
+
+
+def _podziel(n: int, czesci: int) -> list[int]:
+    """Podziel n na 'czesci' liczb calkowitych rozniacych sie co najwyzej o 1."""
+    q, r = divmod(n, czesci)
+    return [q + 1 if i < r else q for i in range(czesci)]
+
+
+def _zadanie_mc(zadanie: tuple) -> float:
+    """Zadanie robocze: metoda prostokatow z losowym podzialem na podprzedziale [lo, hi]."""
+    wyrazenie, lo, hi, m, entropia, klucz, backend = zadanie
+    f = konstrukcja_f_expr(wyrazenie)
+    gen = RNGenerator(RNGSeedSequence(entropia, klucz), backend=backend)
+    punkty = sorted(gen.uniform(lo, hi, size=m))
+    krawez = [lo] + punkty + [hi]
+    srodki = [(left + right) / 2.0 for left, right in zip(krawez, krawez[1:])]
+    return math.fsum([(right - left) * y for left, right, y in zip(krawez, krawez[1:], f(srodki))])
+
+
+def szacuj_mc_rownolegle(n: int, wyrazenie: str, a: float = PREDZIAL_A, b: float = PREDZIAL_B,
+                         ziarenko: int | None = None, procesy: int | None = None,
+                         punkty_na_zadanie: int = PUNKTY_NA_ZADANIE, backend: str | None = None) -> float:
+    """Wieloprocesowa wersja szacuj_mc_prostokaty.
+
+    Przedzial [a, b] dzielony jest na ceil(n / punkty_na_zadanie) rownych podprzedzialow,
+    a kazdy z nich dostaje swoja czesc punktow i wlasny, niezalezny strumien losowy
+    (RNGenerator.spawn). Podzial zalezy tylko od n i punkty_na_zadanie, a sumy czesciowe
+    sa laczone przez math.fsum w stalej kolejnosci, wiec wynik jest identyczny
+    dla danego ziarna niezaleznie od liczby procesow.
+    """
+    if n < 0:
+        raise ValueError('n musi byc nieujemne')
+    konstrukcja_f_expr(wyrazenie)  # bledne wyrazenie zglaszamy przed uruchomieniem puli
+    czesci = max(1, -(-n // punkty_na_zadanie))
+    ziarna = RNGSeedSequence(ziarenko).spawn(czesci)
+    dx = (b - a) / czesci
+    zadania = [(wyrazenie, a + i * dx, a + (i + 1) * dx if i + 1 < czesci else b, m,
+                ziarna[i].entropia, ziarna[i].klucz, backend)
+               for i, m in enumerate(_podziel(n, czesci))]
+    return math.fsum(wykonaj(_zadanie_mc, zadania, procesy))
+
+
+def _zadanie_numeryczne(zadanie: tuple) -> float:
+    """Zadanie robocze: suma f(x_i) * dx dla krokow i z zakresu [start, stop)."""
+    wyrazenie, a, dx, start, stop = zadanie
+    f = konstrukcja_f_expr(wyrazenie)
+    suma = []
+    for poczatek in range(start, stop, PACZKA_PUNKTOW):
+        srodki = [a + (i + 0.5) * dx for i in range(poczatek, min(poczatek + PACZKA_PUNKTOW, stop))]
+        suma.extend(y * dx for y in f(srodki))
+    return math.fsum(suma)
+
+
+def calka_numeryczna_rownolegla(wyrazenie: str, a: float = PREDZIAL_A, b: float = PREDZIAL_B,
+                                kroki: int = 200000, procesy: int | None = None,
+                                kroki_na_zadanie: int = PUNKTY_NA_ZADANIE) -> float:
+    """Wieloprocesowa wersja calka_numeryczna (metoda prostokatow, srodek)."""
+    if kroki <= 0:
+        raise ValueError('kroki musi byc wieksze od 0')
+    konstrukcja_f_expr(wyrazenie)
+    dx = (b - a) / kroki
+    zadania = [(wyrazenie, a, dx, start, min(start + kroki_na_zadanie, kroki))
+               for start in range(0, kroki, kroki_na_zadanie)]
+    return math.fsum(wykonaj(_zadanie_numeryczne, zadania, procesy))
+
+
+# Najmniejsza liczba paczek, po ktorej tryb 'warstwowa' moze zakonczyc obliczenia wczesniej
+MIN_PACZEK_WARSTWOWYCH = 10
+
+
+class WynikStrumieniowy(NamedTuple):
+    """Wynik estymatora strumieniowego."""
+    estymacja: float
+    blad_standardowy: float
+    przedzial_ufnosci: tuple[float, float]
+    n: int
+    zatrzymano_wczesnie: bool
+
+
+def szacuj_mc_strumieniowo(f: Callable[[float], float], a: float = PREDZIAL_A, b: float = PREDZIAL_B,
+                           ziarenko: int | None = None, max_n: int = 10_000_000,
+                           paczka: int = PACZKA_PUNKTOW, blad_wzgledny: float | None = None,
+                           poziom_ufnosci: float = 0.95, tryb: str = 'zwykla') -> WynikStrumieniowy:
+    """Oszacuj calke Monte Carlo w stalej pamieci, przetwarzajac punkty paczkami.
+
+    tryb='zwykla': kazdy punkt daje probke (b - a) * f(U), srednia i wariancja liczone
+    sa algorytmem Welforda. tryb='warstwowa': paczka m punktow to jeden punkt w kazdym
+    z m rownych kubelkow [a, b]; probka jest oszacowanie calki z calej paczki, a wariancja
+    liczona jest miedzy paczkami (bez globalnego sortowania).
+    Jesli podano blad_wzgledny, obliczenia koncza sie, gdy polowa przedzialu ufnosci
+    spadnie ponizej blad_wzgledny * |estymacja| (w trybie 'warstwowa' najwczesniej
+    po MIN_PACZEK_WARSTWOWYCH paczkach, zeby kwantyl normalny dawal wlasciwe pokrycie).
+    Oszacowanie bledu wymaga co najmniej dwoch probek: max_n >= 2, a w trybie
+    'warstwowa' max_n >= 2 * paczka (inaczej ValueError).
+    """
+    if max_n < 2 or paczka <= 0:
+        raise ValueError('max_n musi byc co najmniej 2, a paczka dodatnia')
+    if tryb not in ('zwykla', 'warstwowa'):
+        raise ValueError(f"nieznany tryb '{tryb}'")
+    if tryb == 'warstwowa' and max_n < 2 * paczka:
+        raise ValueError("tryb 'warstwowa' wymaga max_n >= 2 * paczka (blad liczony jest miedzy paczkami)")
+    from statistics import NormalDist
+    gen = RNGenerator(ziarenko)
+    z = NormalDist().inv_cdf(0.5 + poziom_ufnosci / 2.0)
+    szerokosc = b - a
+    akum = AkumulatorWelforda(momenty=2)
+    min_probek = MIN_PACZEK_WARSTWOWYCH if tryb == 'warstwowa' else 2
+    punkty = 0
+    wczesnie = False
+    while punkty < max_n:
+        m = min(paczka, max_n - punkty)
+        if tryb == 'zwykla':
+            xs = gen.uniform(a, b, size=m)
+            akum.dodaj_paczke([szerokosc * y for y in _wartosci(f, xs)])
+        else:
+            h = szerokosc / m
+            xs = [a + (j + u) * h for j, u in enumerate(gen.uniform(0.0, 1.0, size=m))]
+            akum.dodaj(szerokosc * math.fsum(_wartosci(f, xs)) / m)
+        punkty += m
+        if blad_wzgledny is not None and akum.n >= min_probek \
+                and z * akum.blad_standardowy <= blad_wzgledny * abs(akum.srednia):
+            wczesnie = punkty < max_n
+            break
+    polowa = z * akum.blad_standardowy
+    return WynikStrumieniowy(akum.srednia, akum.blad_standardowy,
+                             (akum.srednia - polowa, akum.srednia + polowa), punkty, wczesnie)
+
+
+def szacuj_strumieniowo(n: int, f: Callable[[float], float], a: float = PREDZIAL_A, b: float = PREDZIAL_B, ziarenko: int | None = None) -> float:
+    """szacuj_mc_strumieniowo z max_n=n, z interfejsem pozostalych estymatorow METODY_MC."""
+    return szacuj_mc_strumieniowo(f, a, b, ziarenko, max_n=n).estymacja
+
+
+METODY_MC['strumieniowa'] = szacuj_strumieniowo
+OPISY_METOD['strumieniowa'] = 'strumieniowo, paczki punktow i srednia Welforda'
+
+
+def _oszacuj(metoda: str, n: int, f: Callable[[float], float], ziarno: int | None,
+             blad_wzgledny: float | None = None) -> tuple[float, int]:
+    """Estymacja metoda z METODY_MC oraz liczba uzytych punktow.
+
+    Dla metody 'strumieniowa' podanie blad_wzgledny pozwala zakonczyc obliczenia
+    przed n punktami (szacuj_mc_strumieniowo).
+    """
+    if metoda == 'strumieniowa':
+        wynik = szacuj_mc_strumieniowo(f, PREDZIAL_A, PREDZIAL_B, ziarno, max_n=n, blad_wzgledny=blad_wzgledny)
+        return wynik.estymacja, wynik.n
+    return METODY_MC[metoda](n, f, PREDZIAL_A, PREDZIAL_B, ziarno), n
+
+
 def wczytaj_wyrazenie_od_uzytkownika() -> tuple[str, Callable[[float], float]]:
     """Pytaj uzytkownika o wyrazenie f(x) az do momentu poprawnego wprowadzenia.
 
@@ -74,36 +509,163 @@ def wczytaj_wyrazenie_od_uzytkownika() -> tuple[str, Callable[[float], float]]:
             print(f'Blad w wyrazeniu: {e}. Sprobuj ponownie.')
 
 
-def ladny_raport(funkcja_nazwa: str, wyrazenie: str, f: Callable[[float], float], ziarno: int | None, ns_list: list[int], kroki_ref: int):
-    """Wykonaj obliczenia i wypisz czytelny raport po polsku."""
+def ladny_raport(funkcja_nazwa: str, wyrazenie: str, f: Callable[[float], float], ziarno: int | None, ns_list: list[int],
+                 kroki_ref: int | None = None, metody: tuple[str, ...] = ('prostokaty',), tol_ref: float = 1e-12,
+                 blad_wzgledny: float | None = None):
+    """Wykonaj obliczenia i wypisz czytelny raport po polsku (osobna tabela dla kazdej metody).
+
+    Wartosc referencyjna liczona jest adaptacyjna kwadratura Gaussa-Kronroda z tolerancja
+    tol_ref (i zapamietywana dla wyrazenia); podanie kroki_ref wymusza dawna metode prostokatow.
+    blad_wzgledny to docelowy blad wzgledny metody 'strumieniowa' (wczesne zatrzymanie).
+    Liczby punktow niepoprawne dla metody (np. n=1) zglaszane sa w wierszu tabeli.
+    """
     print('\n--- Wyniki:')
     print(f'Funkcja ({funkcja_nazwa}): {wyrazenie}')
     print(f'Przedzial calkowania: [{PREDZIAL_A}, {PREDZIAL_B}]')
-    print('\nLicze wartosc referencyjna (calka numeryczna, metoda prostokatow)...')
-    calka_ref = calka_numeryczna(f, PREDZIAL_A, PREDZIAL_B, kroki=kroki_ref)
-    print(f'Wartosc referencyjna (numeryczna, kroki={kroki_ref}): {calka_ref:.12f}')
-
-    print('\nEstymacje Monte Carlo (metoda prostokatow, losowy podzial):')
-    print(' n    estymacja          blad_abs          blad_wzgledny [%]')
-    for n in ns_list:
-        est = szacuj_mc_prostokaty(n, f, PREDZIAL_A, PREDZIAL_B, ziarno)
-        blad_abs = abs(calka_ref - est)
-        blad_wzg = (blad_abs / abs(calka_ref) * 100.0) if calka_ref != 0 else float('inf')
-        print(f'{n:3d}  {est:18.12f}  {blad_abs:13.12f}  {blad_wzg:15.6f}')
-
-
-def main():
-    """Glowna funkcja uruchamiana z konsoli. Prowadzi dialog z uzytkownikiem."""
-    print('Program: Oszacowanie calki metoda Monte Carlo (metoda prostokatow)')
-    print('Przedzial calkowania: a=1, b=e')
+    if kroki_ref is not None:
+        print('\nLicze wartosc referencyjna (calka numeryczna, metoda prostokatow)...')
+        calka_ref = calka_numeryczna(f, PREDZIAL_A, PREDZIAL_B, kroki=kroki_ref)
+        print(f'Wartosc referencyjna (numeryczna, kroki={kroki_ref}): {calka_ref:.12f}')
+    else:
+        print('\nLicze wartosc referencyjna (adaptacyjna kwadratura Gaussa-Kronroda)...')
+        if getattr(f, 'wyrazenie', None) == wyrazenie:
+            calka_ref, blad_ref = calka_referencyjna(wyrazenie, PREDZIAL_A, PREDZIAL_B, tol_ref)
+        else:
+            calka_ref, blad_ref = calka_adaptacyjna(f, PREDZIAL_A, PREDZIAL_B, tol_ref)
+        print(f'Wartosc referencyjna (Gauss-Kronrod, szacowany blad={blad_ref:.1e}): {calka_ref:.12f}')
+
+    for metoda in metody:
+        print(f'\nEstymacje Monte Carlo ({OPISY_METOD[metoda]}):')
+        print(' n    estymacja          blad_abs          blad_wzgledny [%]')
+        for n in ns_list:
+            try:
+                est, n_uzyte = _oszacuj(metoda, n, f, ziarno, blad_wzgledny)
+            except ValueError as e:
+                print(f'{n:3d}  blad: {e}')
+                continue
+            blad_abs = abs(calka_ref - est)
+            blad_wzg = (blad_abs / abs(calka_ref) * 100.0) if calka_ref != 0 else float('inf')
+            uwaga = f'  (zatrzymano po {n_uzyte} punktach)' if n_uzyte < n else ''
+            print(f'{n:3d}  {est:18.12f}  {blad_abs:13.12f}  {blad_wzg:15.6f}{uwaga}')
+
+
+# Kolumny wynikow trybu wsadowego (n_uzyte < n po wczesnym zatrzymaniu, blad - opis bledu
+# komorki siatki, ktorej nie dalo sie policzyc)
+POLA_WSADOWE = ('wyrazenie', 'metoda', 'n', 'ziarno', 'estymacja', 'wartosc_ref',
+                'blad_abs', 'blad_wzgledny_proc', 'n_uzyte', 'czas_s', 'blad')
+
+
+def wczytaj_wyrazenia(zrodlo: Iterable[str]) -> list[str]:
+    """Wczytaj wyrazenia (po jednym w linii), pomijajac puste linie i komentarze '#'."""
+    wyrazenia = []
+    for linia in zrodlo:
+        linia = linia.strip()
+        if linia and not linia.startswith('#'):
+            wyrazenia.append(linia)
+    return wyrazenia
+
+
+def _zadanie_siatki(zadanie: tuple) -> dict:
+    """Zadanie robocze trybu wsadowego: jedna estymacja dla (wyrazenie, metoda, n, ziarno).
+
+    Blad estymatora (np. n za male dla metody) nie przerywa siatki - wiersz ma wtedy
+    puste wartosci liczbowe i opis bledu w kolumnie 'blad'. Blad wzgledny dla zerowej
+    wartosci referencyjnej jest pusty (None).
+    """
+    wyrazenie, metoda, n, ziarno, calka_ref, blad_wzgledny = zadanie
+    f = konstrukcja_f_expr(wyrazenie)
+    start = time.perf_counter()
+    try:
+        est, n_uzyte = _oszacuj(metoda, n, f, ziarno, blad_wzgledny)
+    except Exception as e:
+        return dict(zip(POLA_WSADOWE, (wyrazenie, metoda, n, ziarno, None, calka_ref, None, None, None,
+                                       time.perf_counter() - start, f'{type(e).__name__}: {e}')))
+    czas = time.perf_counter() - start
+    blad_abs = abs(calka_ref - est)
+    blad_wzg = (blad_abs / abs(calka_ref) * 100.0) if calka_ref != 0 else None
+    return dict(zip(POLA_WSADOWE, (wyrazenie, metoda, n, ziarno, est, calka_ref, blad_abs, blad_wzg, n_uzyte, czas, None)))
+
+
+def uruchom_wsadowo(wyrazenia: list[str], ns_list: list[int], ziarna: list[int], metody: list[str],
+                    procesy: int | None = None, tol_ref: float = 1e-12,
+                    blad_wzgledny: float | None = None) -> Iterator[dict]:
+    """Policz siatke (wyrazenie x metoda x n x ziarno), zwracajac wyniki na biezaco.
+
+    Calki referencyjne liczone sa raz na wyrazenie (calka_referencyjna), a wyrazenia
+    kompilowane sa raz na proces roboczy. Bledne wyrazenia sa zglaszane na stderr i pomijane,
+    a bledy pojedynczych komorek siatki trafiaja do kolumny 'blad' (_zadanie_siatki).
+    """
+    for metoda in metody:
+        if metoda not in METODY_MC:
+            raise ValueError(f"nieznana metoda '{metoda}', dostepne: {', '.join(METODY_MC)}")
+    referencje = {}
+    for wyrazenie in wyrazenia:
+        try:
+            referencje[wyrazenie] = calka_referencyjna(wyrazenie, PREDZIAL_A, PREDZIAL_B, tol_ref)[0]
+        except Exception as e:
+            print(f'Blad w wyrazeniu {wyrazenie!r}: {e}', file=sys.stderr)
+    zadania = [(w, m, n, z, ref, blad_wzgledny) for w, ref in referencje.items()
+               for m in metody for n in ns_list for z in ziarna]
+    return wykonaj_strumieniowo(_zadanie_siatki, zadania, procesy)
 
-    ns_list = [10, 50, 100]      # liczby punktow do zbadania
-    kroki_ref = 200_000         # liczba podprzedzialow do calki referencyjnej
+
+def _argumenty(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Oszacowanie calki na [1, e] metodami Monte Carlo.')
+    parser.add_argument('--wsadowo', action='store_true',
+                        help='tryb nieinteraktywny: siatka wyrazen, n, ziaren i metod')
+    parser.add_argument('--wyrazenia', default='-',
+                        help="plik z wyrazeniami (po jednym w linii), '-' oznacza stdin")
+    parser.add_argument('--n', type=int, nargs='+', default=[10, 50, 100], help='liczby punktow')
+    parser.add_argument('--ziarna', type=int, nargs='+', default=[0], help='ziarna generatora')
+    parser.add_argument('--metody', nargs='+', default=list(METODY_MC), choices=list(METODY_MC))
+    parser.add_argument('--blad-wzgledny', type=float, default=None,
+                        help="docelowy blad wzgledny metody 'strumieniowa' (wczesne zatrzymanie)")
+    parser.add_argument('--format', choices=('csv', 'jsonl'), default='csv')
+    parser.add_argument('--procesy', type=int, default=None, help='liczba procesow (domyslnie liczba rdzeni)')
+    parser.add_argument('--tol', type=float, default=1e-12, help='tolerancja calki referencyjnej')
+    return parser.parse_args(argv)
+
+
+def main_wsadowo(args: argparse.Namespace) -> None:
+    """Tryb wsadowy: wyniki wypisywane na stdout jako CSV albo linie JSON."""
+    if args.wyrazenia == '-':
+        wyrazenia = wczytaj_wyrazenia(sys.stdin)
+    else:
+        with open(args.wyrazenia, encoding='utf-8') as plik:
+            wyrazenia = wczytaj_wyrazenia(plik)
+    wyniki = uruchom_wsadowo(wyrazenia, args.n, args.ziarna, args.metody, args.procesy, args.tol,
+                             args.blad_wzgledny)
+    if args.format == 'csv':
+        import csv
+        pisz = csv.DictWriter(sys.stdout, fieldnames=POLA_WSADOWE)
+        pisz.writeheader()
+        zapisz = pisz.writerow
+    else:
+        import json
+        zapisz = lambda wiersz: print(json.dumps(wiersz))
+    for wiersz in wyniki:
+        if wiersz['blad'] is not None:
+            print(f"Blad dla {wiersz['wyrazenie']!r}, metoda {wiersz['metoda']}, n={wiersz['n']}: {wiersz['blad']}",
+                  file=sys.stderr)
+        zapisz(wiersz)
+        sys.stdout.flush()
+
+
+def main(argv: list[str] | None = None):
+    """Glowna funkcja uruchamiana z konsoli. Bez --wsadowo prowadzi dialog z uzytkownikiem."""
+    args = _argumenty(argv)
+    if args.wsadowo:
+        main_wsadowo(args)
+        return
+
+    print('Program: Oszacowanie calki metodami Monte Carlo')
+    print('Przedzial calkowania: a=1, b=e')
 
     wyraz, f = wczytaj_wyrazenie_od_uzytkownika()
     ziarno = time.time_ns()
     print(f'Uzyte ziarno (time.time_ns): {ziarno}')
-    ladny_raport('uzytkownika', wyraz, f, ziarno, ns_list, kroki_ref)
+    ladny_raport('uzytkownika', wyraz, f, ziarno, args.n, metody=tuple(args.metody), tol_ref=args.tol,
+                 blad_wzgledny=args.blad_wzgledny)
 
 
 if __name__ == '__main__':
@@ -1,60 +1,104 @@
 from __future__ import annotations
-import math
-import statistics
+import argparse
 import time
-from rn_generator_20251120 import RNGenerator
+from typing import Iterable, Iterator
+from obliczenia_rownolegle import polacz_wyniki
+from rn_generator_20251120 import RNGenerator, RNGSeedSequence, ROZMIAR_PACZKI
+from statystyki_strumieniowe import AkumulatorWelforda
 
 
 def normal_probe_generator(gen: RNGenerator, mu: float, sigma: float) -> float:
     """Wygeneruj pojedyncza wartosc z rozkladu normalnego N(mu, sigma^2)."""
-    # zabezpieczenie: u1 nie moze byc 0
-    u1 = 0.0
-    while u1 <= 0.0:
-        u1 = gen.random()
-    u2 = gen.random()
-    r = math.sqrt(-2.0 * math.log(u1))
-    theta = 2.0 * math.pi * u2
-    z = r * math.cos(theta)
-    return mu + sigma * z
+    # ziggurat w RNGenerator.normal: jedna liczba jednostajna na wartosc w typowym przypadku
+    return gen.normal(mu, sigma)
 
 
 def generuj_probe_normalna(gen: RNGenerator, mu: float, sigma: float, n: int) -> list[float]:
     """Generuj probe 'n' wartosci z rozkladu normalnego."""
-    return [normal_probe_generator(gen, mu, sigma) for _ in range(n)]
+    return gen.normal(mu, sigma, size=n).tolist()
 
 
-def analizuj_probe(probka: list[float]) -> tuple[float, float]:
+def generuj_paczki_normalne(gen: RNGenerator, mu: float, sigma: float, n: int,
+                            paczka: int = ROZMIAR_PACZKI) -> Iterator:
+    """Generuj probe 'n' wartosci z rozkladu normalnego paczkami (bez trzymania calej probki w pamieci)."""
+    while n > 0:
+        m = min(paczka, n)
+        yield gen.normal(mu, sigma, size=m)
+        n -= m
+
+
+def analizuj_strumien(paczki: Iterable[Iterable[float]]) -> AkumulatorWelforda:
+    """Policz momenty probki podawanej paczkami, w stalej pamieci."""
+    akum = AkumulatorWelforda()
+    for paczka in paczki:
+        akum.dodaj_paczke(paczka)
+    return akum
+
+
+def analizuj_probe(probka: Iterable[float]) -> tuple[float, float]:
     """Oblicz statystyki empiryczne: srednia i wariancja (estymator nieobciazony)."""
-    if len(probka) < 2:
-        return (statistics.mean(probka) if probka else 0.0, 0.0)
-    srednia_emp = statistics.mean(probka)
-    wariancja_emp = statistics.variance(probka)
-    return srednia_emp, wariancja_emp
+    akum = AkumulatorWelforda()
+    akum.dodaj_paczke(probka)
+    return akum.srednia, akum.wariancja
+
+
+def _zadanie_momentow(zadanie: tuple) -> AkumulatorWelforda:
+    """Zadanie robocze: momenty czesci probki z wlasnego strumienia losowego."""
+    entropia, klucz, mu, sigma, n = zadanie
+    gen = RNGenerator(RNGSeedSequence(entropia, klucz))
+    return analizuj_strumien(generuj_paczki_normalne(gen, mu, sigma, n))
 
 
-def main() -> None:
+def analizuj_rownolegle(ziarno: int | None, mu: float, sigma: float, n: int,
+                        procesy: int | None = None, czesci: int = 64) -> AkumulatorWelforda:
+    """Wygeneruj i przeanalizuj probke N(mu, sigma^2) w 'czesci' niezaleznych strumieniach.
+
+    Czesci liczone sa w puli procesow, a akumulatory laczone w stalej kolejnosci,
+    wiec wynik dla danego ziarna nie zalezy od liczby procesow.
+    """
+    czesci = max(1, min(czesci, n))
+    ziarna = RNGSeedSequence(ziarno).spawn(czesci)
+    q, r = divmod(n, czesci)
+    zadania = [(z.entropia, z.klucz, mu, sigma, q + 1 if i < r else q) for i, z in enumerate(ziarna)]
+    return polacz_wyniki(_zadanie_momentow, zadania, AkumulatorWelforda(), procesy)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description='Test generatora - rozklad normalny')
+    parser.add_argument('--n', type=int, default=1000, help='licznosc probki')
+    parser.add_argument('--ziarno', type=int, default=None, help='ziarno (domyslnie time.time_ns)')
+    parser.add_argument('--procesy', type=int, default=1, help='liczba procesow (dla duzych probek)')
+    args = parser.parse_args(argv)
+
     print('Test generatora - rozklad normalny')
     # Ustawienia testu
     srodkowa_teoretyczna = 2.5
     odchylenie_teoretyczne = 1.7
-    N = 1000
+    N = args.n
 
-    ziarno = time.time_ns()
-    print(f'Uzyte ziarno (time.time_ns): {ziarno}')
-    gen = RNGenerator(ziarno)
+    if args.ziarno is None:
+        ziarno = time.time_ns()
+        print(f'Uzyte ziarno (time.time_ns): {ziarno}')
+    else:
+        ziarno = args.ziarno
+        print(f'Uzyte ziarno (--ziarno): {ziarno}')
 
-    # Generuj probe
+    # Generuj i analizuj probe paczkami, bez trzymania jej w pamieci
     print(f'Generuje probe N={N} z N({srodkowa_teoretyczna}, {odchylenie_teoretyczne}^2) ...')
-    probka = generuj_probe_normalna(gen, srodkowa_teoretyczna, odchylenie_teoretyczne, N)
-
-    # Analiza
-    srednia_emp, wariancja_emp = analizuj_probe(probka)
+    if args.procesy == 1:
+        gen = RNGenerator(ziarno)
+        akum = analizuj_strumien(generuj_paczki_normalne(gen, srodkowa_teoretyczna, odchylenie_teoretyczne, N))
+    else:
+        akum = analizuj_rownolegle(ziarno, srodkowa_teoretyczna, odchylenie_teoretyczne, N, args.procesy)
+    srednia_emp, wariancja_emp = akum.srednia, akum.wariancja
 
     print('\nWyniki:')
     print(f' Srednia teoretyczna  = {srodkowa_teoretyczna:.6f}')
     print(f' Srednia empiryczna  = {srednia_emp:.6f}')
     print(f' Wariancja teoretyczna = {odchylenie_teoretyczne**2:.6f}')
     print(f' Wariancja empiryczna  = {wariancja_emp:.6f}')
+    print(f' Skosnosc empiryczna  = {akum.skosnosc:.6f} (teoretyczna 0)')
+    print(f' Kurtoza empiryczna   = {akum.kurtoza:.6f} (nadwyzkowa, teoretyczna 0)')
 
     # raport bledu
     blad_sredniej = abs(srednia_emp - srodkowa_teoretyczna)